@@ -0,0 +1,397 @@
+"""作者身份解析模块
+
+读取仓库生效的 user.name / user.email，并结合 .mailmap 中的别名，
+确定“本人”在提交历史中可能使用的所有作者名和邮箱。
+
+解析结果按仓库持久化在 ~/.weekly-reports/identity.json 中，以相关配置文件
+（全局/本地 git 配置、通过 include.path / includeIf 引入的文件、.mailmap）
+的修改时间为键：文件未变化时直接复用，不再为每个仓库启动 git config 子进程。
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+IDENTITY_CACHE_VERSION = 2
+
+# 一次读取身份解析所需的全部配置项，以及引入其他配置文件的 include 项
+IDENTITY_CONFIG_PATTERN = (
+    r"^(user\.name|user\.email|mailmap\.file|include\.path|includeif\..*\.path)$"
+)
+
+# 读取上述配置项及其来源文件（输出为 "来源\0键\n值\0" 的序列）
+IDENTITY_CONFIG_COMMAND = [
+    "git", "config", "--show-origin", "-z", "--get-regexp", IDENTITY_CONFIG_PATTERN,
+]
+
+# .mailmap 行：[名称] <邮箱> [[名称] <邮箱>]
+_MAILMAP_LINE = re.compile(r"^([^<]*)<([^>]*)>\s*(?:([^<]*)<([^>]*)>)?")
+
+
+class AuthorIdentity(NamedTuple):
+    """仓库中“本人”的作者身份"""
+
+    name: Optional[str]
+    email: Optional[str]
+    # .mailmap 中映射到本人的其他作者名/邮箱
+    aliases: Tuple[str, ...] = ()
+
+
+class MailmapEntry(NamedTuple):
+    """.mailmap 中的一条映射：提交中的 (commit_name, commit_email) 显示为 (proper_name, proper_email)"""
+
+    proper_name: Optional[str]
+    proper_email: Optional[str]
+    commit_name: Optional[str]
+    commit_email: str
+
+
+def parse_mailmap(text: str) -> List[MailmapEntry]:
+    """解析 .mailmap 内容
+
+    支持 git 的四种写法：
+    ``Proper Name <commit@email>``、``<proper@email> <commit@email>``、
+    ``Proper Name <proper@email> <commit@email>``、
+    ``Proper Name <proper@email> Commit Name <commit@email>``
+
+    Args:
+        text: .mailmap 文件内容
+
+    Returns:
+        映射条目列表（忽略注释与无法识别的行）
+    """
+    entries: List[MailmapEntry] = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        match = _MAILMAP_LINE.match(line)
+        if not match:
+            continue
+
+        first_name, first_email, second_name, second_email = match.groups()
+        first_name = first_name.strip() or None
+        if second_email is None:
+            entries.append(MailmapEntry(first_name, None, None, first_email.strip()))
+        else:
+            entries.append(MailmapEntry(
+                first_name,
+                first_email.strip() or None,
+                (second_name or "").strip() or None,
+                second_email.strip(),
+            ))
+    return entries
+
+
+def resolve_mailmap_aliases(
+    name: Optional[str],
+    email: Optional[str],
+    entries: List[MailmapEntry],
+) -> Tuple[str, ...]:
+    """计算本人在 .mailmap 中的别名
+
+    先按 git 的映射规则把配置中的身份映射到规范身份，再收集所有映射到
+    该规范身份的提交作者名和邮箱（例如更换过的旧邮箱）。
+
+    Args:
+        name: 配置中的用户名
+        email: 配置中的邮箱
+        entries: .mailmap 映射条目
+
+    Returns:
+        别名元组（不含 name/email 本身，保持出现顺序）
+    """
+    email_key = email.lower() if email else None
+
+    # 配置中的身份本身可能是旧身份，先映射到规范身份
+    canonical_name, canonical_email = name, email_key
+    for entry in entries:
+        if email_key and entry.commit_email.lower() == email_key and (
+            entry.commit_name is None or entry.commit_name == name
+        ):
+            canonical_name = entry.proper_name or canonical_name
+            canonical_email = (entry.proper_email or email_key).lower()
+
+    aliases: List[str] = []
+
+    def add(value: Optional[str]) -> None:
+        if value and value not in aliases and value != name and value != email:
+            aliases.append(value)
+
+    add(canonical_name)
+    if canonical_email != email_key:
+        add(canonical_email)
+
+    for entry in entries:
+        if entry.proper_email:
+            matched = canonical_email is not None and entry.proper_email.lower() == canonical_email
+        else:
+            # 只有名称的条目：提交邮箱被显示为该名称
+            matched = entry.proper_name is not None and entry.proper_name == canonical_name
+        if matched:
+            add(entry.commit_email)
+            add(entry.commit_name)
+
+    return tuple(aliases)
+
+
+def _global_config_files() -> List[Path]:
+    """git 会读取的系统级与全局配置文件（与 git config 的查找顺序一致）"""
+    files: List[Path] = []
+
+    if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        files.append(Path(os.environ.get("GIT_CONFIG_SYSTEM", "/etc/gitconfig")))
+
+    if "GIT_CONFIG_GLOBAL" in os.environ:
+        files.append(Path(os.environ["GIT_CONFIG_GLOBAL"]).expanduser())
+    else:
+        xdg_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+        files.append(Path(xdg_home) / "git" / "config")
+        files.append(Path.home() / ".gitconfig")
+
+    return files
+
+
+def _file_signature(paths: List[Path]) -> List[List[Any]]:
+    """文件签名：[路径, 修改时间(ns), 大小]，不存在的文件记为 None"""
+    signature: List[List[Any]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append([str(path), None, None])
+        else:
+            signature.append([str(path), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _read_config(repo_path: Path) -> Optional[bytes]:
+    """一次 git config 调用读取身份相关的全部配置项"""
+    try:
+        result = subprocess.run(
+            IDENTITY_CONFIG_COMMAND,
+            cwd=repo_path,
+            capture_output=True,
+        )
+    except OSError:
+        return None
+    # 返回码 1 表示没有任何匹配项
+    if result.returncode not in (0, 1):
+        return None
+    return result.stdout
+
+
+def _parse_config_entries(output: bytes) -> List[Tuple[str, str, str]]:
+    """解析 git config --show-origin -z --get-regexp 的输出为 (来源, 键, 值) 列表"""
+    items = output.decode("utf-8", errors="replace").split("\0")
+    entries: List[Tuple[str, str, str]] = []
+    for origin, item in zip(items[0::2], items[1::2]):
+        key, _, value = item.partition("\n")
+        entries.append((origin, key.lower(), value.strip()))
+    return entries
+
+
+def parse_config_output(output: bytes) -> Dict[str, str]:
+    """解析 IDENTITY_CONFIG_COMMAND 的输出（多值项以最后一个为准）"""
+    return {key: value for _, key, value in _parse_config_entries(output)}
+
+
+def parse_config_origins(output: bytes, repo_path: Path) -> List[Path]:
+    """提取 IDENTITY_CONFIG_COMMAND 输出涉及的配置文件
+
+    包括每个配置项的来源文件，以及 include.path / includeIf.*.path 引入的文件
+    （目标文件当前不存在或未生效也会包含，之后新建、修改时同样能检测到）。
+
+    Args:
+        output: git config 输出
+        repo_path: 仓库路径（git 输出的相对路径以此为基准）
+
+    Returns:
+        配置文件路径列表（去重，保持出现顺序）
+    """
+    files: Dict[Path, None] = {}
+    for origin, key, value in _parse_config_entries(output):
+        if not origin.startswith("file:"):
+            # command line / blob 等来源没有对应的文件
+            continue
+        origin_path = repo_path / Path(origin[len("file:"):]).expanduser()
+        files[origin_path] = None
+
+        if key == "include.path" or (key.startswith("includeif.") and key.endswith(".path")):
+            # 相对路径以引入它的配置文件所在目录为基准
+            target = Path(value).expanduser()
+            files[origin_path.parent / target] = None
+    return list(files)
+
+
+class AuthorIdentityResolver:
+    """带持久化缓存的作者身份解析器（线程安全）"""
+
+    def __init__(self, cache_path: Optional[Path] = None) -> None:
+        """
+        Args:
+            cache_path: 缓存文件路径，默认为 ~/.weekly-reports/identity.json
+        """
+        if cache_path is None:
+            cache_path = Path.home() / ".weekly-reports" / "identity.json"
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == IDENTITY_CACHE_VERSION:
+                    entries = data.get("repos", {})
+            except (json.JSONDecodeError, OSError, AttributeError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": IDENTITY_CACHE_VERSION, "repos": self._entries},
+                    f,
+                    ensure_ascii=False,
+                )
+            tmp_path.replace(self.cache_path)
+        except OSError:
+            # 缓存写入失败不影响解析结果
+            pass
+
+    @staticmethod
+    def _watched_files(
+        repo_path: Path,
+        mailmap_file: Optional[str],
+        config_files: List[str],
+    ) -> List[Path]:
+        # 延迟导入：git_analyzer 依赖本模块
+        from src.git_analyzer import get_git_dir, resolve_common_git_dir
+
+        # worktree 的本地配置位于公共 Git 目录，config.worktree 位于各自的 Git 目录
+        git_dir = get_git_dir(repo_path) or repo_path / ".git"
+        common_dir = resolve_common_git_dir(repo_path) or git_dir
+        files = _global_config_files()
+        files += [common_dir / "config", git_dir / "config.worktree", repo_path / ".mailmap"]
+        if mailmap_file:
+            files.append(Path(mailmap_file))
+        # 配置项实际来源的文件及 include 引入的文件
+        files += [Path(path) for path in config_files]
+        return list(dict.fromkeys(files))
+
+    def get_cached(self, repo_path: Path) -> Optional[AuthorIdentity]:
+        """获取仍然有效的缓存结果（不启动任何子进程）
+
+        Args:
+            repo_path: 仓库路径
+
+        Returns:
+            身份信息，没有缓存或相关文件已变化时返回 None
+        """
+        key = str(repo_path.resolve())
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+
+        files = self._watched_files(
+            repo_path, entry.get("mailmap_file"), entry.get("config_files", [])
+        )
+        if _file_signature(files) != entry["signature"]:
+            return None
+        return AuthorIdentity(entry["name"], entry["email"], tuple(entry["aliases"]))
+
+    def update(self, repo_path: Path, config_output: Optional[bytes]) -> AuthorIdentity:
+        """由 git config 输出解析身份，并写入缓存
+
+        Args:
+            repo_path: 仓库路径
+            config_output: _read_config 的输出，None 表示读取失败（不缓存）
+
+        Returns:
+            身份信息
+        """
+        values = parse_config_output(config_output or b"")
+        name = values.get("user.name") or None
+        email = values.get("user.email") or None
+
+        mailmap_file = values.get("mailmap.file")
+        if mailmap_file:
+            mailmap_path = Path(mailmap_file).expanduser()
+            if not mailmap_path.is_absolute():
+                mailmap_path = repo_path / mailmap_path
+            mailmap_file = str(mailmap_path)
+
+        config_files = [
+            str(path) for path in parse_config_origins(config_output or b"", repo_path)
+        ]
+
+        # 签名在读取文件之前计算，读取期间发生的修改会在下次解析时重新检测
+        files = self._watched_files(repo_path, mailmap_file, config_files)
+        signature = _file_signature(files)
+
+        entries: List[MailmapEntry] = []
+        for path in (repo_path / ".mailmap", Path(mailmap_file) if mailmap_file else None):
+            if path is None:
+                continue
+            try:
+                entries.extend(parse_mailmap(path.read_text(encoding="utf-8", errors="replace")))
+            except OSError:
+                continue
+
+        identity = AuthorIdentity(name, email, resolve_mailmap_aliases(name, email, entries))
+        if config_output is None:
+            return identity
+
+        with self._lock:
+            self._load()[str(repo_path.resolve())] = {
+                "signature": signature,
+                "mailmap_file": mailmap_file,
+                "config_files": config_files,
+                "name": identity.name,
+                "email": identity.email,
+                "aliases": list(identity.aliases),
+            }
+            self._save()
+        return identity
+
+    def resolve(self, repo_path: Path) -> AuthorIdentity:
+        """解析仓库中的本人身份，配置未变化时直接使用缓存
+
+        Args:
+            repo_path: 仓库路径
+
+        Returns:
+            身份信息
+        """
+        identity = self.get_cached(repo_path)
+        if identity is not None:
+            return identity
+        return self.update(repo_path, _read_config(repo_path))
+
+
+_default_resolver: Optional[AuthorIdentityResolver] = None
+_default_resolver_lock = threading.Lock()
+
+
+def get_identity_resolver() -> AuthorIdentityResolver:
+    """获取默认的身份解析器（缓存位于 ~/.weekly-reports/identity.json）
+
+    多仓库并发采集时会在线程池中调用，初始化需加锁，保证只创建一个实例。
+    """
+    global _default_resolver
+    if _default_resolver is None:
+        with _default_resolver_lock:
+            if _default_resolver is None:
+                _default_resolver = AuthorIdentityResolver()
+    return _default_resolver
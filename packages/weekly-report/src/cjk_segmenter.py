@@ -0,0 +1,214 @@
+"""中文分词模块
+
+内置轻量词典，基于字典树做正向最大匹配，切分连续的中文文本；
+词典未收录的片段按二元组（bigram）切分。
+
+词典源文件 cjk_dict.txt 随代码发布，首次使用时编译为字典树，以 marshal 格式
+缓存在 ~/.weekly-reports/cjk_dict.bin；源文件未变化时直接反序列化，
+不再逐行解析、构建字典树。
+"""
+
+import marshal
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DICT_FORMAT_VERSION = 1
+
+# 内置词典源文件：词语以空白分隔，# 之后为注释
+DEFAULT_DICT_PATH = Path(__file__).with_name("cjk_dict.txt")
+
+# 字典树中标记“到此为一个完整词语”的键（不会与单个汉字冲突）
+_WORD_END = ""
+
+# 未收录片段中视为分隔符的虚词，不参与二元组切分
+_SEPARATOR_CHARS = frozenset("的了和与及或在对将把被从向给等也并而且就都又")
+
+Trie = Dict[str, Any]
+
+
+def get_dictionary_cache_path(base_dir: Optional[Path] = None) -> Path:
+    """获取编译后词典的缓存路径
+
+    Args:
+        base_dir: 基础目录，默认为 ~/.weekly-reports
+
+    Returns:
+        缓存文件路径
+    """
+    if base_dir is None:
+        base_dir = Path.home() / ".weekly-reports"
+
+    return base_dir / "cjk_dict.bin"
+
+
+def read_dictionary_words(source: Path) -> List[str]:
+    """读取词典源文件（忽略空行、注释和单字词）"""
+    words = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        words.extend(word for word in line.split("#", 1)[0].split() if len(word) >= 2)
+    return words
+
+
+def build_trie(words: Iterable[str]) -> Trie:
+    """由词语列表构建字典树（嵌套字典，_WORD_END 键标记词尾）"""
+    root: Trie = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_WORD_END] = True
+    return root
+
+
+def _source_signature(source: Path) -> Tuple[str, int, int]:
+    stat = source.stat()
+    return (str(source.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def compile_dictionary(source: Path, target: Path) -> Trie:
+    """将词典源文件编译为字典树并写入缓存（写入失败不影响返回结果）
+
+    Args:
+        source: 词典源文件
+        target: 编译结果路径
+
+    Returns:
+        字典树
+    """
+    signature = _source_signature(source)
+    trie = build_trie(read_dictionary_words(source))
+
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            marshal.dump((DICT_FORMAT_VERSION, signature, trie), f)
+        tmp_path.replace(target)
+    except OSError:
+        pass
+
+    return trie
+
+
+def load_dictionary(source: Path, cache_path: Path) -> Trie:
+    """加载字典树：缓存与源文件一致时直接反序列化，否则重新编译
+
+    Args:
+        source: 词典源文件
+        cache_path: 编译结果路径
+
+    Returns:
+        字典树
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            version, signature, trie = marshal.load(f)
+        if version == DICT_FORMAT_VERSION and tuple(signature) == _source_signature(source):
+            return trie
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    return compile_dictionary(source, cache_path)
+
+
+class CJKSegmenter:
+    """基于字典树的中文分词器（词典在首次分词时才加载，线程安全）"""
+
+    def __init__(
+        self,
+        dict_path: Optional[Path] = None,
+        cache_path: Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+            dict_path: 词典源文件，默认为内置的 cjk_dict.txt
+            cache_path: 编译结果路径，默认为 ~/.weekly-reports/cjk_dict.bin
+        """
+        self.dict_path = dict_path or DEFAULT_DICT_PATH
+        self.cache_path = cache_path or get_dictionary_cache_path()
+        self._lock = threading.Lock()
+        self._trie: Optional[Trie] = None
+
+    @property
+    def trie(self) -> Trie:
+        if self._trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self._trie = load_dictionary(self.dict_path, self.cache_path)
+        return self._trie
+
+    def _match(self, text: str, start: int) -> int:
+        """从 start 开始在词典中的最长匹配长度（没有匹配时为 0）"""
+        node = self.trie
+        longest = 0
+        for index in range(start, len(text)):
+            node = node.get(text[index])
+            if node is None:
+                break
+            if _WORD_END in node:
+                longest = index - start + 1
+        return longest
+
+    def segment(self, text: str) -> List[str]:
+        """切分一段连续的中文文本
+
+        正向最大匹配：每个位置取词典中最长的词；词典未收录的片段先按虚词断开，
+        长度 2~3 的片段整体保留，更长的片段按二元组切分（奇数个字时末尾 3 个字
+        作为一组），单个汉字丢弃。
+
+        Args:
+            text: 中文文本（不含空格和标点）
+
+        Returns:
+            词语列表，保持在原文中的顺序
+        """
+        words: List[str] = []
+        pending: List[str] = []
+        position = 0
+
+        while position < len(text):
+            length = self._match(text, position)
+            if length:
+                _split_unknown("".join(pending), words)
+                pending = []
+                words.append(text[position:position + length])
+                position += length
+            else:
+                pending.append(text[position])
+                position += 1
+
+        _split_unknown("".join(pending), words)
+        return words
+
+
+def _split_unknown(span: str, words: List[str]) -> None:
+    """二元组切分词典未收录的片段，结果追加到 words"""
+    run: List[str] = []
+    for char in span + " ":
+        if char != " " and char not in _SEPARATOR_CHARS:
+            run.append(char)
+            continue
+
+        if len(run) <= 3:
+            if len(run) >= 2:
+                words.append("".join(run))
+        else:
+            # 偶数个字全部切为二元组，奇数个字时末尾 3 个字作为一组
+            end = len(run) - 3 if len(run) % 2 else len(run)
+            words.extend("".join(run[i:i + 2]) for i in range(0, end, 2))
+            if end < len(run):
+                words.append("".join(run[end:]))
+        run = []
+
+
+_default_segmenter: Optional[CJKSegmenter] = None
+
+
+def get_segmenter() -> CJKSegmenter:
+    """获取默认分词器（内置词典，缓存位于 ~/.weekly-reports/cjk_dict.bin）"""
+    global _default_segmenter
+    if _default_segmenter is None:
+        _default_segmenter = CJKSegmenter()
+    return _default_segmenter
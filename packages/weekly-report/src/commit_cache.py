@@ -0,0 +1,406 @@
+"""提交缓存模块
+
+在 ~/.weekly-reports/cache/ 下按仓库持久化提交记录，增量同步 Git 历史。
+"""
+
+import hashlib
+import json
+import re
+import subprocess
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.git_analyzer import (
+    CommitFields,
+    build_commits_from_fields,
+    day_start_timestamp,
+    get_date_range_bounds,
+    get_default_classifier,
+    get_repo_name,
+    is_git_repo,
+    parse_log_records,
+    resolve_common_git_dir,
+)
+
+
+# 缓存格式版本；版本 3 起首次同步从起始日 00:00 读取，旧版本缓存可能缺少当天较早的提交
+CACHE_VERSION = 3
+
+# 缓存记录格式：hash, 标题, 作者名, 作者时间戳, 作者邮箱, 提交时间戳
+CACHE_PRETTY_FORMAT = "--pretty=format:%H%x00%s%x00%an%x00%at%x00%ae%x00%ct%x1e"
+CACHE_FIELD_COUNT = 6
+
+
+def get_cache_dir(base_dir: Optional[Path] = None) -> Path:
+    """获取缓存目录
+
+    Args:
+        base_dir: 基础目录，默认为 ~/.weekly-reports
+
+    Returns:
+        缓存目录路径
+    """
+    if base_dir is None:
+        base_dir = Path.home() / ".weekly-reports"
+
+    return base_dir / "cache"
+
+
+def resolve_git_dir(repo_path: Path) -> Path:
+    """获取仓库的公共 Git 目录（缓存键，同一仓库的多个 worktree 共享缓存）
+
+    Args:
+        repo_path: 仓库路径
+
+    Returns:
+        Git 目录的绝对路径
+    """
+    common_dir = resolve_common_git_dir(repo_path)
+    if common_dir is None:
+        return (repo_path / ".git").resolve()
+    return common_dir
+
+
+def get_cache_path(repo_path: Path, base_dir: Optional[Path] = None) -> Path:
+    """获取仓库缓存文件路径
+
+    Args:
+        repo_path: 仓库路径
+        base_dir: 基础目录
+
+    Returns:
+        缓存文件路径，文件名为 Git 目录路径的哈希
+    """
+    git_dir = str(resolve_git_dir(repo_path))
+    key = hashlib.sha1(git_dir.encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir(base_dir) / f"{key}.json"
+
+
+def _empty_cache(repo_path: Path) -> Dict[str, Any]:
+    return {
+        "version": CACHE_VERSION,
+        "git_dir": str(resolve_git_dir(repo_path)),
+        "since": None,
+        "tips": [],
+        "commits": {},
+    }
+
+
+def load_repo_cache(repo_path: Path, base_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """加载仓库缓存
+
+    Args:
+        repo_path: 仓库路径
+        base_dir: 基础目录
+
+    Returns:
+        缓存字典，不存在或已损坏时返回空缓存
+    """
+    path = get_cache_path(repo_path, base_dir)
+    if not path.exists():
+        return _empty_cache(repo_path)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return _empty_cache(repo_path)
+
+    if cache.get("version") != CACHE_VERSION:
+        return _empty_cache(repo_path)
+    return cache
+
+
+def save_repo_cache(
+    repo_path: Path,
+    cache: Dict[str, Any],
+    base_dir: Optional[Path] = None,
+) -> None:
+    """保存仓库缓存（先写临时文件再替换，避免中断导致缓存损坏）
+
+    Args:
+        repo_path: 仓库路径
+        cache: 缓存字典
+        base_dir: 基础目录
+    """
+    path = get_cache_path(repo_path, base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def _run_git(
+    repo_path: Path,
+    args: List[str],
+    stdin: Optional[str] = None,
+) -> Optional[bytes]:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=repo_path,
+            input=stdin.encode("utf-8") if stdin is not None else None,
+            capture_output=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def list_ref_tips(repo_path: Path) -> Optional[Set[str]]:
+    """获取 HEAD 和所有引用指向的对象（与 git log --all 的起点一致）
+
+    Args:
+        repo_path: 仓库路径
+
+    Returns:
+        对象 hash 集合，不是 Git 仓库时返回 None
+    """
+    output = _run_git(repo_path, ["show-ref", "--head", "--hash"])
+    if output is None:
+        # 空仓库没有任何引用时 show-ref 返回非 0
+        return set() if _run_git(repo_path, ["rev-parse", "--git-dir"]) else None
+    return set(output.decode("ascii", errors="replace").split())
+
+
+def _revision_input(include: Set[str], exclude: Set[str]) -> str:
+    # 旧版本 git 的 --stdin 模式不支持 --not，使用 ^<rev> 表示排除
+    lines = sorted(include) + [f"^{rev}" for rev in sorted(exclude)]
+    return "\n".join(lines) + "\n"
+
+
+def fetch_commits(
+    repo_path: Path,
+    include: Set[str],
+    exclude: Set[str],
+    since: Optional[date] = None,
+) -> Optional[Dict[str, List[Any]]]:
+    """获取从 include 可达、但从 exclude 不可达的提交
+
+    Args:
+        repo_path: 仓库路径
+        include: 起点对象集合
+        exclude: 排除的对象集合
+        since: 最早提交日期（可选，从本地时区当天 00:00 起）
+
+    Returns:
+        {hash: [标题, 作者名, 作者时间戳, 作者邮箱, 提交时间戳]}，git 调用失败时返回 None
+    """
+    if not include:
+        return {}
+
+    args = ["log", "--stdin", CACHE_PRETTY_FORMAT]
+    if since is not None:
+        # 裸日期会被 git 解析为该日期的当前时刻，显式传入 00:00 的时间戳
+        args.append(f"--since=@{day_start_timestamp(since)}")
+
+    # 通过 stdin 传入引用，避免引用过多时超出命令行长度限制
+    output = _run_git(repo_path, args, stdin=_revision_input(include, exclude))
+    if output is None:
+        return None
+
+    records, _ = parse_log_records(output, CACHE_FIELD_COUNT)
+    return {
+        commit_hash: [message, author, int(author_time), email, int(timestamp)]
+        for commit_hash, message, author, author_time, email, timestamp in records
+    }
+
+
+def fetch_unreachable(
+    repo_path: Path,
+    removed: Set[str],
+    current: Set[str],
+) -> Optional[Set[str]]:
+    """获取仅从已删除/已移动引用可达的提交（例如 rebase、删除分支后）
+
+    Args:
+        repo_path: 仓库路径
+        removed: 已失效的引用对象集合
+        current: 当前引用对象集合
+
+    Returns:
+        不再可达的提交 hash 集合，git 调用失败时返回 None
+    """
+    if not removed:
+        return set()
+
+    output = _run_git(repo_path, ["rev-list", "--stdin"], stdin=_revision_input(removed, current))
+    if output is None:
+        return None
+    return set(output.decode("ascii", errors="replace").split())
+
+
+def sync_repo_cache(
+    repo_path: Path,
+    since: date,
+    base_dir: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """增量同步仓库缓存
+
+    只向 git 查询从新增引用可达、且从上次记录的引用不可达的提交；
+    引用被删除或改写时，移除不再可达的提交。
+    缓存覆盖范围早于 since 时才会重新遍历历史。
+
+    Args:
+        repo_path: 仓库路径
+        since: 需要覆盖的最早日期
+        base_dir: 基础目录
+
+    Returns:
+        同步后的缓存字典，git 调用失败时返回 None
+    """
+    tips = list_ref_tips(repo_path)
+    if tips is None:
+        return None
+
+    cache = load_repo_cache(repo_path, base_dir)
+    cached_since = cache["since"]
+    if cached_since is not None and since < date.fromisoformat(cached_since):
+        cache = _empty_cache(repo_path)
+
+    old_tips = set(cache["tips"])
+    if not old_tips:
+        # 首次同步：只遍历所需时间窗口
+        commits = fetch_commits(repo_path, tips, set(), since)
+        if commits is None:
+            return None
+        cache["commits"] = commits
+        cache["since"] = since.isoformat()
+    elif tips != old_tips:
+        new_commits = fetch_commits(repo_path, tips - old_tips, old_tips)
+        unreachable = fetch_unreachable(repo_path, old_tips - tips, tips)
+        if new_commits is None or unreachable is None:
+            return None
+        for commit_hash in unreachable:
+            cache["commits"].pop(commit_hash, None)
+        cache["commits"].update(new_commits)
+    else:
+        return cache
+
+    cache["tips"] = sorted(tips)
+    save_repo_cache(repo_path, cache, base_dir)
+    return cache
+
+
+def _compile_author_pattern(author: str) -> "re.Pattern[str]":
+    try:
+        return re.compile(author)
+    except re.error:
+        return re.compile(re.escape(author))
+
+
+def read_cached_commit_fields(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    base_dir: Optional[Path] = None,
+) -> Optional[Tuple[Dict[str, Any], List[CommitFields]]]:
+    """增量同步缓存，并在本地按提交时间和作者过滤出提交字段（不分类、不构建记录）
+
+    参数含义见 get_cached_commits；可在线程池中执行，
+    再由 build_cached_commits 统一构建记录。
+
+    Returns:
+        (缓存内容, 提交字段列表)，按作者时间倒序；非 Git 仓库或同步失败时返回 None
+    """
+    if not is_git_repo(repo_path):
+        return None
+
+    cache = sync_repo_cache(repo_path, start_date, base_dir)
+    if cache is None:
+        return None
+
+    # 与 git log 路径使用同一区间（见 git_analyzer.get_date_range_bounds）
+    since_ts, until_ts = get_date_range_bounds(start_date, end_date)
+    pattern = _compile_author_pattern(author) if author else None
+
+    project = get_repo_name(repo_path)
+    fields = []
+    for commit_hash, (message, name, author_time, email, timestamp) in cache["commits"].items():
+        if not since_ts <= timestamp < until_ts:
+            continue
+        if pattern is not None and not pattern.search(f"{name} <{email}>"):
+            continue
+        fields.append((commit_hash, message, name, author_time, project, None))
+
+    fields.sort(key=lambda record: int(record[3]), reverse=True)
+    return cache, fields
+
+
+def build_cached_commits(
+    repo_path: Path,
+    cache: Dict[str, Any],
+    fields: List[CommitFields],
+    base_dir: Optional[Path] = None,
+    seen: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
+    """由缓存中过滤出的提交字段构建记录，并随缓存保存分类备忘表
+
+    Args:
+        repo_path: 仓库路径
+        cache: 缓存内容（read_cached_commit_fields 的结果）
+        fields: 提交字段列表（read_cached_commit_fields 的结果）
+        base_dir: 基础目录
+        seen: 已采集的提交 hash 集合（可选），用于跨仓库去重，
+            已存在的提交在构建记录前即被跳过，新提交的 hash 会被加入集合
+
+    Returns:
+        提交记录列表
+    """
+    # 载入持久化的分类备忘表，分类规则变化时（指纹不同）忽略
+    classifier = get_default_classifier()
+    memo = cache.get("memo") or {}
+    entries = memo.get("entries", {}) if memo.get("fingerprint") == classifier.fingerprint else {}
+    classifier.import_memo(entries)
+    misses_before = classifier.cache_info()["misses"]
+
+    commits = list(build_commits_from_fields(fields, seen))
+
+    # 有新分类结果时，将本仓库的备忘条目随缓存一起保存；
+    # 只保留缓存中仍存在的提交标题，避免备忘表随历史查询无限增长
+    if classifier.cache_info()["misses"] != misses_before:
+        entries = {**entries, **classifier.export_memo(c["message"] for c in commits)}
+        subjects = {message for message, *_ in cache["commits"].values()}
+        entries = {message: result for message, result in entries.items() if message in subjects}
+        cache["memo"] = {"fingerprint": classifier.fingerprint, "entries": entries}
+        save_repo_cache(repo_path, cache, base_dir)
+
+    return commits
+
+
+def get_cached_commits(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    base_dir: Optional[Path] = None,
+    seen: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
+    """通过缓存获取指定日期范围内的提交记录
+
+    先增量同步缓存，再在本地按提交时间和作者过滤，
+    最后统一通过 parse_commit_message 分类。
+
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者匹配模式（可选，按正则匹配 "name <email>"）
+        base_dir: 基础目录
+        seen: 已采集的提交 hash 集合（可选），用于跨仓库去重，
+            已存在的提交在构建记录前即被跳过，新提交的 hash 会被加入集合
+
+    Returns:
+        提交记录列表（结构与 git_analyzer.get_commits 一致，按作者时间倒序）
+    """
+    result = read_cached_commit_fields(repo_path, start_date, end_date, author, base_dir)
+    if result is None:
+        return []
+    cache, fields = result
+    return build_cached_commits(repo_path, cache, fields, base_dir, seen)
@@ -0,0 +1,336 @@
+"""提交索引模块
+
+基于 SQLite 为已配置的所有仓库建立提交索引，任意日期范围只需一次索引查询，
+无需逐个仓库调用 git。索引通过 sync_index 显式刷新。
+
+提交的 type / is_trivial 在写入时分类，并记录分类规则指纹；
+规则变化后（指纹不同）首次打开索引时按新规则重新分类。
+"""
+
+import re
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from src.author_identity import get_identity_resolver
+from src.commit_cache import fetch_commits, fetch_unreachable, list_ref_tips
+from src.git_analyzer import (
+    COMMIT_TYPE_CONFIG,
+    Commit,
+    format_china_date,
+    get_date_range_bounds,
+    get_default_classifier,
+    get_repo_name,
+    is_git_repo,
+    parse_commit_message,
+)
+
+
+# 表结构版本，变化时重建索引（索引可随时从 git 重新同步）
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS repos (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    tips TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    message TEXT NOT NULL,
+    author TEXT NOT NULL,
+    email TEXT NOT NULL,
+    author_time INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    is_trivial INTEGER NOT NULL,
+    PRIMARY KEY (repo, hash)
+);
+CREATE INDEX IF NOT EXISTS idx_commits_repo_timestamp ON commits (repo, timestamp);
+CREATE INDEX IF NOT EXISTS idx_commits_timestamp ON commits (timestamp);
+CREATE INDEX IF NOT EXISTS idx_commits_author ON commits (author, repo, timestamp);
+CREATE INDEX IF NOT EXISTS idx_commits_email ON commits (email, repo, timestamp);
+CREATE INDEX IF NOT EXISTS idx_commits_type ON commits (type, is_trivial);
+"""
+
+
+def get_index_path(base_dir: Optional[Path] = None) -> Path:
+    """获取索引数据库路径
+
+    Args:
+        base_dir: 基础目录，默认为 ~/.weekly-reports
+
+    Returns:
+        索引数据库路径
+    """
+    if base_dir is None:
+        base_dir = Path.home() / ".weekly-reports"
+
+    return base_dir / "index.sqlite3"
+
+
+def _compile_author_pattern(author: str) -> "re.Pattern[str]":
+    try:
+        return re.compile(author)
+    except re.error:
+        return re.compile(re.escape(author))
+
+
+def _identity_values(path: Path) -> Tuple[str, ...]:
+    """按仓库 git 配置自动解析的本人身份（用户名、邮箱及 .mailmap 别名）的字面值"""
+    identity = get_identity_resolver().resolve(path)
+    values: List[str] = []
+    for value in (identity.name, identity.email, *identity.aliases):
+        value = (value or "").strip()
+        if value and value not in values:
+            values.append(value)
+    return tuple(values)
+
+
+def _sync_classification(conn: sqlite3.Connection) -> None:
+    """分类规则指纹与索引记录的不一致时，按当前规则重新分类所有提交"""
+    classifier = get_default_classifier()
+    row = conn.execute("SELECT value FROM meta WHERE key = 'classifier'").fetchone()
+    if row is not None and row[0] == classifier.fingerprint:
+        return
+
+    updates = []
+    for rowid, message in conn.execute("SELECT rowid, message FROM commits"):
+        parsed = classifier.classify(message)
+        updates.append((parsed["type"], int(parsed["is_trivial"]), rowid))
+
+    with conn:
+        conn.executemany("UPDATE commits SET type = ?, is_trivial = ? WHERE rowid = ?", updates)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('classifier', ?)",
+            (classifier.fingerprint,),
+        )
+
+
+def connect_index(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """打开索引数据库（不存在时自动创建表结构）
+
+    Args:
+        db_path: 数据库路径，默认为 ~/.weekly-reports/index.sqlite3
+
+    Returns:
+        数据库连接
+    """
+    if db_path is None:
+        db_path = get_index_path()
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS commits; DROP TABLE IF EXISTS repos;"
+            f" PRAGMA user_version = {SCHEMA_VERSION};"
+        )
+    conn.executescript(_SCHEMA)
+    _sync_classification(conn)
+    return conn
+
+
+def _repo_key(path: Path) -> str:
+    return str(path.resolve())
+
+
+def _sync_repo(conn: sqlite3.Connection, path: Path) -> Optional[int]:
+    """同步单个仓库，返回新增提交数，git 调用失败时返回 None"""
+    tips = list_ref_tips(path)
+    if tips is None:
+        return None
+
+    key = _repo_key(path)
+    row = conn.execute("SELECT tips FROM repos WHERE path = ?", (key,)).fetchone()
+    old_tips = set(row[0].split()) if row else set()
+
+    if tips == old_tips:
+        return 0
+
+    new_commits = fetch_commits(path, tips - old_tips, old_tips)
+    unreachable = fetch_unreachable(path, old_tips - tips, tips)
+    if new_commits is None or unreachable is None:
+        return None
+
+    rows = []
+    for commit_hash, (message, author, author_time, email, timestamp) in new_commits.items():
+        parsed = parse_commit_message(message)
+        rows.append((
+            key, commit_hash, message, author, email, author_time, timestamp,
+            parsed["type"], int(parsed["is_trivial"]),
+        ))
+
+    with conn:
+        conn.executemany(
+            "DELETE FROM commits WHERE repo = ? AND hash = ?",
+            [(key, commit_hash) for commit_hash in unreachable],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO repos (path, project, tips) VALUES (?, ?, ?)",
+            (key, get_repo_name(path), " ".join(sorted(tips))),
+        )
+
+    return len(rows)
+
+
+def sync_index(
+    repo_paths: List[Path],
+    db_path: Optional[Path] = None,
+) -> Dict[str, int]:
+    """从 git 刷新索引
+
+    首次同步会索引仓库的完整历史，之后只写入新增引用带来的提交，
+    并删除因 rebase、删除分支而不再可达的提交。
+
+    Args:
+        repo_paths: 仓库路径列表（通常为 config_manager.get_repo_paths 的结果）
+        db_path: 数据库路径
+
+    Returns:
+        {仓库名称: 新增提交数}，同步失败的仓库不包含在内
+    """
+    stats: Dict[str, int] = {}
+
+    with closing(connect_index(db_path)) as conn:
+        for path in repo_paths:
+            if isinstance(path, str):
+                path = Path(path)
+
+            if not is_git_repo(path):
+                continue
+
+            added = _sync_repo(conn, path)
+            if added is not None:
+                stats[get_repo_name(path)] = added
+
+    return stats
+
+
+def get_unindexed_repos(
+    repo_paths: List[Path],
+    db_path: Optional[Path] = None,
+) -> List[Path]:
+    """筛选尚未同步进索引的仓库（repos 表中没有记录）
+
+    Args:
+        repo_paths: 仓库路径列表
+        db_path: 数据库路径
+
+    Returns:
+        未索引的仓库路径，顺序与 repo_paths 一致
+    """
+    with closing(connect_index(db_path)) as conn:
+        indexed = {row[0] for row in conn.execute("SELECT path FROM repos")}
+    return [path for path in repo_paths if _repo_key(path) not in indexed]
+
+
+def _row_to_commit(row: sqlite3.Row, project: str) -> Commit:
+    commit_type = row["type"]
+    author_time = row["author_time"]
+    type_config = COMMIT_TYPE_CONFIG.get(commit_type, COMMIT_TYPE_CONFIG["other"])
+    return Commit(
+        hash=row["hash"],
+        message=row["message"],
+        author=row["author"],
+        date=format_china_date(author_time),
+        type=commit_type,
+        is_trivial=bool(row["is_trivial"]),
+        is_highlight=type_config["is_highlight"],
+        is_challenge=type_config["is_challenge"],
+        priority=type_config["priority"],
+        project=project,
+        timestamp=author_time,
+    )
+
+
+def query_commits(
+    repo_paths: List[Path],
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    db_path: Optional[Path] = None,
+    seen: Optional[Set[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """从索引中查询多个仓库的提交记录
+
+    Args:
+        repo_paths: 仓库路径列表
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者匹配模式（可选，按正则匹配 "name <email>"）；None 表示按各仓库的
+            git 配置自动获取本人身份，按作者名/邮箱的字面值走索引精确匹配
+            （git log --author 为子串匹配，"test" 也会匹配 "testing"）
+        db_path: 数据库路径
+        seen: 已采集的提交 hash 集合（可选），按仓库顺序跨仓库去重，
+            重复的行在构建记录前即被跳过，首次出现的仓库保留该提交
+
+    Returns:
+        按仓库分组的提交记录（结构与 git_analyzer.get_all_commits_from_repos 一致）
+    """
+    paths = [Path(p) if isinstance(p, str) else p for p in repo_paths]
+    paths = [p for p in paths if is_git_repo(p)]
+
+    # 按作者条件分组，同一条件的仓库合并为一次查询：
+    # 显式传入的模式（str）按正则匹配，自动解析的身份（字面值元组）按作者/邮箱匹配
+    repos_by_author: Dict[Union[str, Tuple[str, ...]], List[str]] = {}
+    for path in paths:
+        current_author: Union[str, Tuple[str, ...]] = author or _identity_values(path)
+        repos_by_author.setdefault(current_author, []).append(_repo_key(path))
+
+    # 与 git log 路径使用同一区间（见 git_analyzer.get_date_range_bounds）
+    since_ts, until_ts = get_date_range_bounds(start_date, end_date)
+
+    rows_by_repo: Dict[str, List[sqlite3.Row]] = {}
+    with closing(connect_index(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        for current_author, repo_keys in repos_by_author.items():
+            placeholders = ", ".join("?" for _ in repo_keys)
+            range_filter = f"repo IN ({placeholders}) AND timestamp >= ? AND timestamp < ?"
+            range_params: List[Any] = [*repo_keys, since_ts, until_ts]
+            pattern = None
+
+            if isinstance(current_author, tuple) and current_author:
+                # 身份为字面值：作者名、邮箱分别走 idx_commits_author / idx_commits_email，
+                # 两个子查询的并集即为本人的提交（OR 条件会让 SQLite 退回按日期范围扫描）
+                values = ", ".join("?" for _ in current_author)
+                sql = (
+                    "SELECT * FROM commits WHERE rowid IN ("
+                    f"SELECT rowid FROM commits WHERE author IN ({values}) AND {range_filter}"
+                    f" UNION SELECT rowid FROM commits WHERE email IN ({values}) AND {range_filter})"
+                )
+                params = [*current_author, *range_params, *current_author, *range_params]
+            else:
+                sql = f"SELECT * FROM commits WHERE {range_filter}"
+                params = range_params
+                if current_author:
+                    # 正则无法使用索引：按日期范围取行后逐行匹配，代价随范围内所有作者的提交数增长
+                    pattern = _compile_author_pattern(current_author)
+
+            for row in conn.execute(sql + " ORDER BY author_time DESC", params):
+                if pattern is not None and not pattern.search(f"{row['author']} <{row['email']}>"):
+                    continue
+                rows_by_repo.setdefault(row["repo"], []).append(row)
+
+    commits_by_repo: Dict[str, List[Dict[str, Any]]] = {}
+    for path in paths:
+        rows = rows_by_repo.get(_repo_key(path))
+        if rows and seen is not None:
+            rows = [row for row in rows if row["hash"] not in seen]
+            seen.update(row["hash"] for row in rows)
+        if rows:
+            project = get_repo_name(path)
+            commits_by_repo[project] = [_row_to_commit(row, project) for row in rows]
+
+    return commits_by_repo
@@ -7,12 +7,36 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from src.commit_index import get_index_path
+from src.git_analyzer import is_git_repo
+from src.report_generator import MERGE_MODES
+
 
 # 默认配置
 DEFAULT_CONFIG: Dict[str, Any] = {
     "repos": [],
     "default_author": "auto",
     "output_format": "markdown",
+    # 多仓库并发采集的线程数，1 表示串行
+    "max_workers": 8,
+    # 是否使用 ~/.weekly-reports/cache/ 下的增量提交缓存
+    "use_cache": False,
+    # 是否从 ~/.weekly-reports/index.sqlite3 提交索引查询（需先执行同步）
+    "use_index": False,
+    # 采集前跳过指定时间范围内没有任何提交的仓库
+    "skip_idle_repos": False,
+    # 按 patch-id 折叠 rebase、cherry-pick 产生的重复提交
+    "dedupe_patches": False,
+    # 采集提交时附带 --numstat 改动统计，供重点/难点判断参考改动规模
+    "with_stats": False,
+    # 递归采集仓库中已检出的子模块
+    "include_submodules": False,
+    # 相关提交的合并方式：keywords（关键词完全相同）或 minhash（近似重复聚类）
+    "merge_mode": "keywords",
+    # 将多个项目中的同一功能合并为“跨项目功能”条目
+    "link_features": False,
+    # 团队模式成员：{成员名称: [作者名或邮箱, ...]}
+    "team_members": {},
 }
 
 
@@ -79,6 +103,8 @@ def add_repo(
     config: Dict[str, Any],
     name: str,
     path: str,
+    projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """添加仓库到配置
 
@@ -86,6 +112,8 @@ def add_repo(
         config: 配置字典
         name: 仓库名称
         path: 仓库路径
+        projects: monorepo 子项目（可选），{路径前缀: 项目名称}
+        pathspecs: 只采集这些子目录的提交（可选）
 
     Returns:
         更新后的配置
@@ -97,15 +125,29 @@ def add_repo(
         if repo["name"] == name:
             # 更新路径
             repo["path"] = path
+            _set_repo_layout(repo, projects, pathspecs)
             return config
 
     # 添加新仓库
-    repos.append({"name": name, "path": path})
+    repo = {"name": name, "path": path}
+    _set_repo_layout(repo, projects, pathspecs)
+    repos.append(repo)
     config["repos"] = repos
 
     return config
 
 
+def _set_repo_layout(
+    repo: Dict[str, Any],
+    projects: Optional[Dict[str, str]],
+    pathspecs: Optional[List[str]],
+) -> None:
+    if projects is not None:
+        repo["projects"] = dict(projects)
+    if pathspecs is not None:
+        repo["pathspecs"] = list(pathspecs)
+
+
 def remove_repo(config: Dict[str, Any], name: str) -> Dict[str, Any]:
     """从配置中移除仓库
 
@@ -151,13 +193,86 @@ def validate_repo(path: Path) -> Tuple[bool, Optional[str]]:
     if not path.is_dir():
         return False, f"路径不是目录: {path}"
 
-    git_dir = path / ".git"
-    if not git_dir.exists():
+    # .git 为文件的 worktree 和子模块同样有效
+    if not is_git_repo(path):
         return False, f"不是有效的 Git 仓库: {path}"
 
     return True, None
 
 
+def get_max_workers(config: Dict[str, Any]) -> int:
+    """获取多仓库并发采集的线程数
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        线程数（非法值回退为默认值，最小为 1）
+    """
+    value = config.get("max_workers", DEFAULT_CONFIG["max_workers"])
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_CONFIG["max_workers"]
+    return max(1, workers)
+
+
+def get_default_author(config: Dict[str, Any]) -> Optional[str]:
+    """获取作者匹配模式
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        default_author 的值，"auto" 或未配置时返回 None（按各仓库的 git 配置自动获取）
+    """
+    author = config.get("default_author")
+    if not author or author == "auto":
+        return None
+    return author
+
+
+def get_collection_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """将配置映射为 git_analyzer.get_all_commits_from_repos 的参数
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        关键字参数字典（max_workers、use_cache、index_path、skip_idle、
+        dedupe_patches、with_stats、include_submodules、repo_layouts）
+    """
+    return {
+        "max_workers": get_max_workers(config),
+        "use_cache": bool(config.get("use_cache")),
+        "index_path": get_index_path() if config.get("use_index") else None,
+        "skip_idle": bool(config.get("skip_idle_repos")),
+        "dedupe_patches": bool(config.get("dedupe_patches")),
+        "with_stats": bool(config.get("with_stats")),
+        "include_submodules": bool(config.get("include_submodules")),
+        # 没有仓库配置 monorepo 布局时为 None，不影响缓存与索引的使用
+        "repo_layouts": get_repo_layouts(config) or None,
+    }
+
+
+def get_report_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """将配置映射为 report_generator.generate_full_report 的参数
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        {"merge_mode": ..., "link_features": ...}，不支持的合并方式回退为默认值
+    """
+    merge_mode = config.get("merge_mode")
+    if merge_mode not in MERGE_MODES:
+        merge_mode = DEFAULT_CONFIG["merge_mode"]
+    return {
+        "merge_mode": merge_mode,
+        "link_features": bool(config.get("link_features")),
+    }
+
+
 def get_repo_paths(config: Dict[str, Any]) -> List[Path]:
     """获取所有仓库路径
 
@@ -169,3 +284,44 @@ def get_repo_paths(config: Dict[str, Any]) -> List[Path]:
     """
     repos = get_repos(config)
     return [Path(r["path"]) for r in repos]
+
+
+def get_team_members(config: Dict[str, Any]) -> Dict[str, List[str]]:
+    """获取团队模式的成员身份配置
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        {成员名称: [作者名或邮箱, ...]}，单个字符串会被视为只有一个身份
+    """
+    members = config.get("team_members") or {}
+    return {
+        name: [identities] if isinstance(identities, str) else list(identities)
+        for name, identities in members.items()
+    }
+
+
+def get_repo_layouts(config: Dict[str, Any]) -> Dict[Path, Dict[str, Any]]:
+    """获取各仓库的 monorepo 布局配置
+
+    仓库配置中的 projects 将路径前缀映射到子项目名称，pathspecs 限定采集的子目录：
+    {"name": "mono", "path": "...", "projects": {"packages/web": "web"}, "pathspecs": ["packages"]}
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        {仓库路径: {"projects": {...}, "pathspecs": [...]}}，
+        路径与 get_repo_paths 一致，未配置布局的仓库不包含在内
+    """
+    layouts: Dict[Path, Dict[str, Any]] = {}
+    for repo in get_repos(config):
+        projects = repo.get("projects") or {}
+        pathspecs = repo.get("pathspecs") or []
+        if projects or pathspecs:
+            layouts[Path(repo["path"])] = {
+                "projects": dict(projects),
+                "pathspecs": list(pathspecs),
+            }
+    return layouts
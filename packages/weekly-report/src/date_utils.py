@@ -4,7 +4,7 @@
 """
 
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from dateutil.relativedelta import relativedelta
 
@@ -176,6 +176,33 @@ def get_half_year_range() -> Tuple[date, date]:
     return start_date, today
 
 
+def split_date_range(
+    start: date,
+    end: date,
+    months: int = 1,
+) -> List[Tuple[date, date]]:
+    """将日期范围切分为按月的连续窗口
+
+    每个窗口首尾均包含（与 get_commits 的 start_date/end_date 语义一致），
+    相邻窗口首尾相接、互不重叠。
+
+    Args:
+        start: 开始日期
+        end: 结束日期
+        months: 每个窗口的月数
+
+    Returns:
+        [(window_start, window_end), ...]，按时间正序排列
+    """
+    windows: List[Tuple[date, date]] = []
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + relativedelta(months=months) - timedelta(days=1), end)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
 def validate_custom_date_range(start: date, end: date) -> Tuple[bool, Optional[str]]:
     """验证自定义日期范围（无周一限制）
 
@@ -3,11 +3,41 @@
 提供 Git 仓库提交记录分析功能。
 """
 
+import asyncio
+import hashlib
+import heapq
+import json
 import re
 import subprocess
-from datetime import date, timedelta
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from src.author_identity import IDENTITY_CONFIG_COMMAND, get_identity_resolver
+from src.date_utils import CHINA_TZ, split_date_range
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：未安装时 CommitTable 退回标准库 array
+    np = None
 
 
 # 提交类型配置（无标签风格，直接描述工作内容）
@@ -26,6 +56,31 @@ COMMIT_TYPE_CONFIG = {
 }
 
 
+# git log 记录格式：字段以 NUL 分隔、记录以 RS (0x1e) 结尾，
+# 提交标题中出现 "|" 等字符也不会被截断；时间使用作者时间戳 (%at)，
+# 统一按中国时区换算日期，不受作者本地时区影响
+LOG_FIELD_SEP = b"\x00"
+LOG_RECORD_SEP = b"\x1e"
+LOG_PRETTY_FORMAT = "--pretty=format:%H%x00%s%x00%an%x00%at%x1e"
+
+# 团队模式的记录格式：追加作者邮箱，用于在一次遍历中按成员分桶；
+# 作者名和邮箱使用 %aN/%aE（经 .mailmap 映射），旧邮箱的提交归入同一成员
+TEAM_LOG_PRETTY_FORMAT = "--pretty=format:%H%x00%s%x00%aN%x00%at%x00%aE%x1e"
+TEAM_LOG_FIELD_COUNT = 5
+
+# 附带 --numstat 时的记录格式：分隔符放在记录开头，每条记录的最后一个字段
+# 即为 git 紧随其后输出的文件改动统计
+STAT_LOG_PRETTY_FORMAT = "--pretty=format:%x1e%H%x00%s%x00%an%x00%at%x00"
+STAT_LOG_FIELD_COUNT = 5
+LOG_FIELD_COUNT = 4
+
+# 流式读取 git log 输出时每次读取的字节数
+_READ_CHUNK_SIZE = 64 * 1024
+
+# 解析后尚未分类的提交字段：hash, 标题, 作者名, 作者时间戳, 项目名称, 改动统计（可选）
+CommitFields = Tuple[str, str, str, str, str, Optional[Dict[str, int]]]
+
+
 # 琐碎提交的关键词（强制过滤）
 TRIVIAL_PATTERNS = [
     # typo 修复
@@ -117,13 +172,18 @@ def _escape_git_author_pattern(value: str) -> str:
 def build_author_pattern(
     user_name: Optional[str],
     user_email: Optional[str],
+    aliases: Iterable[str] = (),
 ) -> Optional[str]:
-    """构建 git log --author 的匹配模式（name/email 任一匹配即视为本人）"""
+    """构建 git log --author 的匹配模式（name/email/别名任一匹配即视为本人）
+
+    模式为扩展正则（ERE），_build_log_command 会为 git log 加上 --extended-regexp。
+    """
     parts: List[str] = []
-    if user_name and user_name.strip():
-        parts.append(_escape_git_author_pattern(user_name.strip()))
-    if user_email and user_email.strip():
-        parts.append(_escape_git_author_pattern(user_email.strip()))
+    for value in (user_name, user_email, *aliases):
+        if value and value.strip():
+            part = _escape_git_author_pattern(value.strip())
+            if part not in parts:
+                parts.append(part)
 
     if not parts:
         return None
@@ -132,89 +192,683 @@ def build_author_pattern(
     return "(" + "|".join(parts) + ")"
 
 
-def get_commits(
-    repo_path: Path,
-    start_date: date,
-    end_date: date,
-    author: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """获取指定日期范围内的提交记录
+def resolve_author_pattern(repo_path: Path) -> Optional[str]:
+    """按仓库生效的 git 配置及 .mailmap 别名构建本人的作者匹配模式
+
+    结果由 author_identity 模块按配置文件修改时间缓存，配置未变化时不启动子进程。
 
     Args:
         repo_path: 仓库路径
+
+    Returns:
+        作者匹配模式，未配置用户信息时返回 None
+    """
+    identity = get_identity_resolver().resolve(repo_path)
+    return build_author_pattern(identity.name, identity.email, identity.aliases)
+
+
+def day_start_timestamp(day: date) -> int:
+    """本地时区当天 00:00 的时间戳"""
+    return int(datetime.combine(day, time()).timestamp())
+
+
+def get_date_range_bounds(start_date: date, end_date: date) -> Tuple[int, int]:
+    """日期范围对应的提交时间区间 [开始日 00:00, 结束日次日 00:00)
+
+    git log、提交缓存（commit_cache）和提交索引（commit_index）都按该区间
+    过滤提交时间（%ct），同一日期范围在三条路径上得到相同的提交；
+    分片窗口首尾相接，各窗口的区间也恰好拼成整个范围。
+
+    Args:
         start_date: 开始日期
-        end_date: 结束日期
-        author: 作者名（可选）
+        end_date: 结束日期（包含当天）
 
     Returns:
-        提交记录列表
+        (起始时间戳, 截止时间戳)，左闭右开
     """
-    # git log 的 --until=YYYY-MM-DD 会被解析为当天 00:00:00，
-    # 可能导致“结束日当天”的提交被排除；这里将截止时间调整到下一天 00:00。
-    end_date_exclusive = end_date + timedelta(days=1)
+    return day_start_timestamp(start_date), day_start_timestamp(end_date + timedelta(days=1))
+
+
+def _build_log_command(
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    pretty_format: str = LOG_PRETTY_FORMAT,
+    numstat: bool = False,
+    name_only: bool = False,
+    pathspecs: Optional[List[str]] = None,
+) -> List[str]:
+    """构建 git log 命令"""
+    # git 将裸日期 YYYY-MM-DD 解析为该日期的“当前时刻”而非 00:00，
+    # 因此显式传入 @时间戳；--since/--until 都包含边界，截止时间取区间终点的前一秒
+    since_ts, until_ts = get_date_range_bounds(start_date, end_date)
 
-    # 构建 git log 命令
     cmd = [
         "git",
         "log",
         "--all",
-        f"--since={start_date.isoformat()}",
-        f"--until={end_date_exclusive.isoformat()}",
-        "--pretty=format:%H|%s|%an|%ad",
-        "--date=short",
+        f"--since=@{since_ts}",
+        f"--until=@{until_ts - 1}",
+        pretty_format,
+        # 按作者时间倒序输出，供 merge_commits_from_repos 做多路归并
+        "--author-date-order",
     ]
 
+    if numstat:
+        # 与提交信息在同一次遍历中输出，不再逐个提交调用 git show
+        cmd.append("--numstat")
+    elif name_only:
+        cmd.append("--name-only")
+    if name_only:
+        # 重命名按删除 + 新增列出，路径中不会出现 "old => new" 形式
+        cmd.append("--no-renames")
+
     if author:
-        cmd.append(f"--author={author}")
+        # 作者模式使用扩展正则，否则默认的基础正则中 (a|b) 会被当作字面量
+        cmd.extend(["--extended-regexp", f"--author={author}"])
+
+    if pathspecs:
+        # 只遍历相关子目录的历史
+        cmd.append("--")
+        cmd.extend(pathspecs)
+
+    return cmd
+
+
+def parse_log_records(
+    buffer: Union[bytes, bytearray],
+    field_count: int,
+    final: bool = False,
+) -> Tuple[List[List[str]], int]:
+    """解析缓冲区中所有完整的 git log 记录
+
+    直接在字节层面定位分隔符，仅对记录中的各字段切片解码，不整体解码/拆分文本。
+
+    Args:
+        buffer: git log 原始输出（可能以不完整的记录结尾）
+        field_count: 每条记录的字段数，字段数不符的记录会被跳过
+        final: 缓冲区是否为输出的结尾，为 True 时末尾没有分隔符的部分也作为
+            一条记录解析（分隔符位于记录开头的格式，如 STAT_LOG_PRETTY_FORMAT）
+
+    Returns:
+        (字段列表的列表, 已消费的字节数)
+    """
+    records: List[List[str]] = []
+    start = 0
+
+    with memoryview(buffer) as view:
+        while True:
+            end = buffer.find(LOG_RECORD_SEP, start)
+            if end < 0:
+                break
+
+            # format: 模式下 git 会在记录之间插入换行
+            record_start = start
+            if record_start < end and buffer[record_start] == 0x0A:
+                record_start += 1
+
+            fields = _split_log_record(buffer, view, record_start, end, field_count)
+            if fields is not None:
+                records.append(fields)
+            start = end + 1
+
+        if final and start < len(buffer):
+            fields = _split_log_record(buffer, view, start, len(buffer), field_count)
+            if fields is not None:
+                records.append(fields)
+            start = len(buffer)
+
+    return records, start
+
+
+def _split_log_record(
+    buffer: Union[bytes, bytearray],
+    view: memoryview,
+    start: int,
+    end: int,
+    field_count: int,
+) -> Optional[List[str]]:
+    """拆分 buffer[start:end] 中的单条记录，字段数不符时返回 None"""
+    fields: List[str] = []
+    field_start = start
+    for _ in range(field_count - 1):
+        pos = buffer.find(LOG_FIELD_SEP, field_start, end)
+        if pos < 0:
+            return None
+        fields.append(str(view[field_start:pos], "utf-8", "replace"))
+        field_start = pos + 1
+
+    if buffer.find(LOG_FIELD_SEP, field_start, end) >= 0:
+        return None
+    fields.append(str(view[field_start:end], "utf-8", "replace"))
+    return fields
+
+
+def iter_log_stream(stream: BinaryIO, field_count: int) -> Iterator[List[str]]:
+    """从字节流中增量解析 git log 记录，内存占用以读取块大小为界"""
+    buffer = bytearray()
+    while True:
+        chunk = stream.read1(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        records, consumed = parse_log_records(buffer, field_count)
+        del buffer[:consumed]
+        yield from records
+
+    # 兼容缺少结尾分隔符的最后一条记录（分隔符位于记录开头的格式总是如此）
+    if buffer.strip():
+        records, _ = parse_log_records(buffer, field_count, final=True)
+        yield from records
+
+
+class Commit(MutableMapping):
+    """紧凑的提交记录
+
+    使用 __slots__ 存储固定字段，作者/项目/类型/日期等高重复字符串经过 intern，
+    多仓库、长时间范围的采集可显著降低内存占用。
+    同时实现字典接口（commit["message"]、commit.get("type") 等），
+    report_generator 等按字典使用提交记录的代码无需修改；
+    固定字段之外的键（如 details、commit_count）存放在按需创建的附加字典中。
+    """
+
+    FIELDS = (
+        "hash",
+        "message",
+        "author",
+        "date",
+        "type",
+        "is_trivial",
+        "is_highlight",
+        "is_challenge",
+        "priority",
+        "project",
+        "timestamp",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(
+        self,
+        hash: str,
+        message: str,
+        author: str,
+        date: str,
+        type: str,
+        is_trivial: bool,
+        is_highlight: bool,
+        is_challenge: bool,
+        priority: int,
+        project: str,
+        timestamp: int = 0,
+    ) -> None:
+        self.hash = hash
+        self.message = message
+        self.author = sys.intern(author)
+        self.date = sys.intern(date)
+        self.type = sys.intern(type)
+        self.is_trivial = is_trivial
+        self.is_highlight = is_highlight
+        self.is_challenge = is_challenge
+        self.priority = priority
+        self.project = sys.intern(project)
+        self.timestamp = timestamp
+        self._extra: Optional[Dict[str, Any]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._FIELD_SET or self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Commit({dict(self)!r})"
+
+    def copy(self) -> "Commit":
+        """浅拷贝（与 dict.copy 行为一致）"""
+        clone = Commit(*(getattr(self, field) for field in self.FIELDS))
+        if self._extra:
+            clone._extra = dict(self._extra)
+        return clone
+
+
+def format_china_date(timestamp: int) -> str:
+    """将时间戳换算为中国时区的日期字符串（YYYY-MM-DD）"""
+    return datetime.fromtimestamp(timestamp, CHINA_TZ).date().isoformat()
+
+
+def build_commit_record(
+    commit_hash: str,
+    message: str,
+    author: str,
+    author_time: Union[int, str],
+    project: str,
+) -> Commit:
+    """由 git log 字段构建已分类的提交记录
+
+    Args:
+        commit_hash: 提交 hash
+        message: 提交标题
+        author: 作者名
+        author_time: 作者时间戳（%at）
+        project: 项目名称
+
+    Returns:
+        Commit 记录，date 为中国时区的作者日期
+    """
+    timestamp = int(author_time)
+    parsed = parse_commit_message(message)
+    return Commit(
+        hash=commit_hash,
+        message=message,
+        author=author,
+        date=format_china_date(timestamp),
+        type=parsed["type"],
+        is_trivial=parsed["is_trivial"],
+        is_highlight=parsed["is_highlight"],
+        is_challenge=parsed["is_challenge"],
+        priority=parsed["priority"],
+        project=project,
+        timestamp=timestamp,
+    )
+
+
+def parse_numstat(text: str) -> Dict[str, int]:
+    """解析单个提交的 --numstat 输出
+
+    Args:
+        text: numstat 行（"新增\t删除\t路径"），二进制文件的行数为 "-"
+
+    Returns:
+        {"files": 文件数, "insertions": 新增行数, "deletions": 删除行数}
+    """
+    files = insertions = deletions = 0
+    for line in text.splitlines():
+        parts = line.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        files += 1
+        if parts[0].isdigit():
+            insertions += int(parts[0])
+        if parts[1].isdigit():
+            deletions += int(parts[1])
+    return {"files": files, "insertions": insertions, "deletions": deletions}
+
+
+def _changed_paths(text: str, numstat: bool) -> List[str]:
+    """提取 --name-only / --numstat 输出中的文件路径"""
+    paths = []
+    for line in text.splitlines():
+        if numstat:
+            parts = line.split("\t", 2)
+            if len(parts) == 3:
+                paths.append(parts[2])
+        elif line:
+            paths.append(line)
+    return paths
+
+
+def _split_path(path: str) -> List[str]:
+    return [part for part in path.strip().split("/") if part and part != "."]
+
+
+class PathPrefixTrie:
+    """按路径分段的前缀树，将文件路径映射到最长匹配前缀对应的项目
+
+    用于 monorepo：{"packages/web": "web", "packages/api": "api"}，
+    空前缀 "" 可作为仓库内其余路径的兜底项目。
+    """
+
+    def __init__(self, prefixes: Dict[str, str]) -> None:
+        """
+        Args:
+            prefixes: {路径前缀: 项目名称}
+        """
+        self._root: Dict[Optional[str], Any] = {}
+        for prefix, project in prefixes.items():
+            node = self._root
+            for part in _split_path(prefix):
+                node = node.setdefault(part, {})
+            node[None] = sys.intern(project)
+
+    def lookup(self, path: str) -> Optional[str]:
+        """查找文件路径所属的项目
+
+        Args:
+            path: 仓库内的相对路径
+
+        Returns:
+            最长匹配前缀的项目名称，没有匹配时返回 None
+        """
+        node = self._root
+        project = node.get(None)
+        for part in _split_path(path):
+            node = node.get(part)
+            if node is None:
+                break
+            project = node.get(None, project)
+        return project
+
+    def attribute(self, paths: Iterable[str], default: str) -> str:
+        """按改动文件归属提交：取涉及文件最多的项目，数量相同时取先出现的
+
+        Args:
+            paths: 提交改动的文件路径
+            default: 没有任何文件命中前缀时使用的项目（通常为仓库名称）
+
+        Returns:
+            项目名称
+        """
+        counts: Dict[str, int] = {}
+        for path in paths:
+            project = self.lookup(path)
+            if project is not None:
+                counts[project] = counts.get(project, 0) + 1
+        if not counts:
+            return default
+        return max(counts, key=counts.__getitem__)
+
+
+def _parse_log_output(output: bytes, repo_path: Path) -> List[Dict[str, Any]]:
+    """解析完整的 git log 输出为提交记录列表"""
+    project = get_repo_name(repo_path)
+    records, _ = parse_log_records(output, LOG_FIELD_COUNT)
+    return [build_commit_record(*fields, project) for fields in records]
+
+
+def iter_commit_fields(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    with_stats: bool = False,
+    path_projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
+) -> Iterator[CommitFields]:
+    """逐条产出 git log 解析后的提交字段（只做解析，不分类、不构建记录）
+
+    参数含义见 iter_commits；字段可在线程池中读取，再由调用方统一构建记录。
+
+    Yields:
+        (hash, 标题, 作者名, 作者时间戳, 项目名称, 改动统计)，未开启 with_stats 时
+        改动统计为 None
+    """
+    repo_name = get_repo_name(repo_path)
+    trie = PathPrefixTrie(path_projects) if path_projects else None
+    with_files = with_stats or trie is not None
+
+    if with_files:
+        cmd = _build_log_command(
+            start_date, end_date, author, STAT_LOG_PRETTY_FORMAT,
+            numstat=with_stats, name_only=trie is not None, pathspecs=pathspecs,
+        )
+        field_count = STAT_LOG_FIELD_COUNT
+    else:
+        cmd = _build_log_command(start_date, end_date, author, pathspecs=pathspecs)
+        field_count = LOG_FIELD_COUNT
+
+    for fields in _stream_log_records(cmd, repo_path, field_count):
+        if not with_files:
+            yield (*fields, repo_name, None)
+            continue
+
+        project = repo_name
+        if trie is not None:
+            project = trie.attribute(_changed_paths(fields[4], with_stats), repo_name)
+        stats = parse_numstat(fields[4]) if with_stats else None
+        yield (*fields[:4], project, stats)
+
+
+def build_commits_from_fields(
+    records: Iterable[CommitFields],
+    seen: Optional[Set[str]] = None,
+) -> Iterator[Commit]:
+    """由提交字段构建已分类的提交记录
+
+    Args:
+        records: 提交字段（iter_commit_fields 的结果）
+        seen: 已采集的提交 hash 集合（可选），命中的提交直接跳过、不构建记录，
+            新产出的提交会加入该集合
+
+    Yields:
+        提交记录
+    """
+    for commit_hash, message, author, author_time, project, stats in records:
+        if seen is not None:
+            if commit_hash in seen:
+                continue
+            seen.add(commit_hash)
+        commit = build_commit_record(commit_hash, message, author, author_time, project)
+        if stats is not None:
+            commit["stats"] = stats
+        yield commit
+
+
+def iter_commits(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    seen: Optional[Set[str]] = None,
+    with_stats: bool = False,
+    path_projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """逐条产出指定日期范围内的提交记录（流式读取）
+
+    从管道增量读取 git log 输出，每解析一行即产出一条已分类的提交，
+    内存占用与提交总量无关；调用方提前结束迭代时会终止 git 进程。
+
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者名（可选）
+        seen: 已采集的提交 hash 集合（可选），命中的提交直接跳过、不构建记录，
+            新产出的提交会加入该集合
+        with_stats: 是否在同一次 git log 中附带 --numstat，为每条提交写入
+            stats 键（{"files", "insertions", "deletions"}）
+        path_projects: monorepo 子项目配置（{路径前缀: 项目名称}，可选），
+            在同一次 git log 中附带改动文件列表，按 PathPrefixTrie 归属 project 字段
+        pathspecs: 传给 git log 的路径过滤（可选），只遍历这些子目录的历史
+
+    Yields:
+        提交记录（结构与 get_commits 返回的元素一致）
+    """
+    yield from build_commits_from_fields(
+        iter_commit_fields(
+            repo_path, start_date, end_date, author, with_stats, path_projects, pathspecs,
+        ),
+        seen,
+    )
 
+
+def _stream_log_records(
+    cmd: List[str],
+    repo_path: Path,
+    field_count: int,
+) -> Iterator[List[str]]:
+    """执行 git log 并逐条产出记录字段，提前结束迭代时终止 git 进程"""
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd,
             cwd=repo_path,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
+    except OSError:
+        return
 
-        if result.returncode != 0 or not result.stdout.strip():
-            return []
+    finished = False
+    try:
+        yield from iter_log_stream(process.stdout, field_count)
+        finished = True
+    finally:
+        if not finished and process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
 
-        commits = []
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
 
-            parts = line.split("|")
-            if len(parts) >= 4:
-                parsed = parse_commit_message(parts[1])
-                commits.append({
-                    "hash": parts[0],
-                    "message": parts[1],
-                    "author": parts[2],
-                    "date": parts[3],
-                    "type": parsed["type"],
-                    "is_trivial": parsed["is_trivial"],
-                    "is_highlight": parsed["is_highlight"],
-                    "is_challenge": parsed["is_challenge"],
-                    "priority": parsed["priority"],
-                    "project": get_repo_name(repo_path),
-                })
+def get_commits(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    seen: Optional[Set[str]] = None,
+    shard_months: int = 0,
+    max_workers: Optional[int] = None,
+    with_stats: bool = False,
+    path_projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """获取指定日期范围内的提交记录
 
-        return commits
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者名（可选）
+        seen: 已采集的提交 hash 集合（可选，见 iter_commits）
+        shard_months: 大于 0 时将日期范围按该月数切分为多个窗口，
+            各窗口并发执行 git log 后按时间顺序拼接（适合单个超大仓库的长时间范围）
+        max_workers: 分片模式下并发执行的窗口数上限，
+            None 表示使用 config.json 中的 max_workers（见 config_manager.get_max_workers）
+        with_stats: 是否附带文件改动统计（见 iter_commits），仍只执行一次 git log
+        path_projects: monorepo 子项目配置（见 iter_commits）
+        pathspecs: 传给 git log 的路径过滤（可选）
+
+    Returns:
+        提交记录列表
+    """
+    if shard_months > 0:
+        records = get_commit_fields(
+            repo_path, start_date, end_date, author, shard_months, max_workers,
+            with_stats, path_projects, pathspecs,
+        )
+        return list(build_commits_from_fields(records, seen))
+
+    try:
+        return list(
+            iter_commits(
+                repo_path, start_date, end_date, author, seen, with_stats,
+                path_projects, pathspecs,
+            )
+        )
+    except Exception:
+        return []
+
+
+def get_commit_fields(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    shard_months: int = 0,
+    max_workers: Optional[int] = None,
+    with_stats: bool = False,
+    path_projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
+) -> List[CommitFields]:
+    """读取指定日期范围内的提交字段（参数含义见 get_commits，不分类、不构建记录）
+
+    Returns:
+        提交字段列表（见 iter_commit_fields），git 调用失败时返回空列表
+    """
+    if shard_months > 0:
+        if max_workers is None:
+            max_workers = _default_max_workers()
+        return _get_commit_fields_sharded(
+            repo_path, start_date, end_date, author, shard_months, max_workers,
+            with_stats, path_projects, pathspecs,
+        )
+
+    try:
+        return list(
+            iter_commit_fields(
+                repo_path, start_date, end_date, author, with_stats, path_projects, pathspecs,
+            )
+        )
     except Exception:
         return []
 
 
+def _get_commit_fields_sharded(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str],
+    shard_months: int,
+    max_workers: int,
+    with_stats: bool = False,
+    path_projects: Optional[Dict[str, str]] = None,
+    pathspecs: Optional[List[str]] = None,
+) -> List[CommitFields]:
+    """按时间窗口分片并发读取提交字段
+
+    每个窗口的提交时间区间由 get_date_range_bounds 计算，窗口之间首尾相接，
+    因此每条提交恰好落在一个窗口内；按从新到旧的窗口顺序拼接，
+    与不分片时 git log 的输出顺序一致。
+    """
+    windows = split_date_range(start_date, end_date, shard_months)
+    windows.reverse()
+
+    def fetch(window: Tuple[date, date]) -> List[CommitFields]:
+        return get_commit_fields(
+            repo_path, window[0], window[1], author, with_stats=with_stats,
+            path_projects=path_projects, pathspecs=pathspecs,
+        )
+
+    if max_workers > 1 and len(windows) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor:
+            shards = list(executor.map(fetch, windows))
+    else:
+        shards = [fetch(window) for window in windows]
+
+    return [record for shard in shards for record in shard]
+
+
 def group_commits_by_project(
-    commits: List[Dict[str, Any]]
+    commits: Iterable[Dict[str, Any]]
 ) -> Dict[str, List[Dict[str, Any]]]:
     """按项目分组提交记录
 
     Args:
-        commits: 提交记录列表
+        commits: 提交记录列表或迭代器（如 iter_commits 的结果，逐条消费），
+            也可以是 CommitTable（按列批量分组）
 
     Returns:
         按项目分组的提交记录字典
     """
+    if isinstance(commits, CommitTable):
+        return {
+            project: table.to_list()
+            for project, table in commits.group_by_project().items()
+        }
+
     grouped: Dict[str, List[Dict[str, Any]]] = {}
 
     for commit in commits:
@@ -226,6 +880,357 @@ def group_commits_by_project(
     return grouped
 
 
+def _column(typecode: str, values: List[Any]) -> Any:
+    """构建列：有 NumPy 时为 ndarray，否则为 array.array"""
+    if np is not None:
+        return np.array(values, dtype=_NUMPY_DTYPES[typecode])
+    return array(typecode, values)
+
+
+_NUMPY_DTYPES = {"i": "int32", "H": "uint16", "b": "int8", "B": "bool", "I": "uint32"}
+
+
+def _date_ordinal(value: str) -> int:
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommitTable:
+    """列式提交表
+
+    将提交的日期、类型、优先级、琐碎标记、项目等字段存为平行数组，
+    过滤、分组、排序均按列批量计算（安装了 NumPy 时使用 ndarray，
+    否则使用标准库 array），适合跨数月、全团队的大批量提交。
+    原始提交记录保存在 records 中，按需取出。
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        dates: Any,
+        type_codes: Any,
+        priorities: Any,
+        trivial: Any,
+        project_ids: Any,
+        types: List[str],
+        projects: List[str],
+    ) -> None:
+        self.records = records
+        self.dates = dates
+        self.type_codes = type_codes
+        self.priorities = priorities
+        self.trivial = trivial
+        self.project_ids = project_ids
+        self.types = types
+        self.projects = projects
+
+    @classmethod
+    def from_commits(cls, commits: Iterable[Dict[str, Any]]) -> "CommitTable":
+        """由提交记录构建列式表
+
+        Args:
+            commits: 提交记录列表或迭代器
+
+        Returns:
+            CommitTable 实例
+        """
+        records = list(commits)
+        type_index: Dict[str, int] = {}
+        project_index: Dict[str, int] = {}
+        dates: List[int] = []
+        type_codes: List[int] = []
+        priorities: List[int] = []
+        trivial: List[bool] = []
+        project_ids: List[int] = []
+
+        for commit in records:
+            commit_type = commit.get("type", "other")
+            project = commit.get("project", "unknown")
+            dates.append(_date_ordinal(commit.get("date", "")))
+            type_codes.append(type_index.setdefault(commit_type, len(type_index)))
+            priorities.append(commit.get("priority", 7))
+            trivial.append(bool(commit.get("is_trivial", False)))
+            project_ids.append(project_index.setdefault(project, len(project_index)))
+
+        return cls(
+            records,
+            _column("i", dates),
+            _column("H", type_codes),
+            _column("b", priorities),
+            _column("B", trivial),
+            _column("I", project_ids),
+            list(type_index),
+            list(project_index),
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """取出提交记录列表"""
+        return list(self.records)
+
+    def _take(self, indices: Any) -> "CommitTable":
+        """按行号选取子表"""
+        if np is not None:
+            columns = [
+                column[indices]
+                for column in (self.dates, self.type_codes, self.priorities,
+                               self.trivial, self.project_ids)
+            ]
+        else:
+            columns = [
+                array(column.typecode, [column[i] for i in indices])
+                for column in (self.dates, self.type_codes, self.priorities,
+                               self.trivial, self.project_ids)
+            ]
+        records = self.records
+        return CommitTable(
+            [records[i] for i in indices],
+            *columns,
+            self.types,
+            self.projects,
+        )
+
+    def filter_trivial(self) -> "CommitTable":
+        """过滤琐碎提交
+
+        Returns:
+            不含琐碎提交的子表
+        """
+        if np is not None:
+            return self._take(np.flatnonzero(~self.trivial))
+        return self._take([i for i, flag in enumerate(self.trivial) if not flag])
+
+    def filter_date_range(self, start_date: date, end_date: date) -> "CommitTable":
+        """按日期范围过滤（包含首尾两天）
+
+        Returns:
+            日期范围内的子表
+        """
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if np is not None:
+            return self._take(np.flatnonzero((self.dates >= start) & (self.dates <= end)))
+        return self._take([i for i, day in enumerate(self.dates) if start <= day <= end])
+
+    def sort_by_priority(self) -> "CommitTable":
+        """按类型优先级稳定排序（优先级数字越小越靠前）
+
+        Returns:
+            排序后的表
+        """
+        if np is not None:
+            return self._take(np.argsort(self.priorities, kind="stable"))
+        return self._take(sorted(range(len(self.records)), key=self.priorities.__getitem__))
+
+    def _group_by(self, ids: Any, labels: List[str]) -> Dict[str, "CommitTable"]:
+        """按编码列分组，组按首行出现的顺序排列，组内保持原顺序"""
+        if np is not None:
+            order = np.argsort(ids, kind="stable")
+            counts = np.bincount(ids, minlength=len(labels))
+            groups = np.split(order, np.cumsum(counts)[:-1])
+            # 编码按首次出现分配，子表中首行的编码不一定递增
+            firsts = sorted(
+                (int(indices[0]), label_id)
+                for label_id, indices in enumerate(groups)
+                if len(indices)
+            )
+            return {labels[label_id]: self._take(groups[label_id]) for _, label_id in firsts}
+
+        buckets: Dict[int, List[int]] = {}
+        for i, label_id in enumerate(ids):
+            buckets.setdefault(label_id, []).append(i)
+        return {labels[label_id]: self._take(indices) for label_id, indices in buckets.items()}
+
+    def group_by_project(self) -> Dict[str, "CommitTable"]:
+        """按项目分组
+
+        Returns:
+            {项目名称: 子表}，按项目首次出现的顺序排列，组内保持原顺序
+        """
+        return self._group_by(self.project_ids, self.projects)
+
+    def group_by_type(self) -> Dict[str, "CommitTable"]:
+        """按提交类型分组
+
+        Returns:
+            {提交类型: 子表}，按类型首次出现的顺序排列，组内保持原顺序
+        """
+        return self._group_by(self.type_codes, self.types)
+
+
+# 常规提交格式: type(scope): description
+CONVENTIONAL_PATTERN = r"^(\w+)(?:\(([^)]+)\))?\s*:\s*(.+)$"
+
+
+class CommitClassifier:
+    """提交信息分类器
+
+    将所有琐碎规则预编译为一个组合正则（单次扫描即可判断是否琐碎），
+    并预编译常规提交解析正则，适合批量分类大量提交。
+    同一标题（cherry-pick、release 分支、fork 仓库）只解析一次，
+    结果保存在按 LRU 淘汰的备忘表中。
+    """
+
+    def __init__(
+        self,
+        trivial_patterns: Optional[List[str]] = None,
+        type_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache_size: int = 4096,
+    ) -> None:
+        """
+        Args:
+            trivial_patterns: 琐碎提交规则，默认为 TRIVIAL_PATTERNS
+            type_config: 提交类型配置，默认为 COMMIT_TYPE_CONFIG
+            cache_size: 备忘表最大条目数，0 表示不缓存
+        """
+        if trivial_patterns is None:
+            trivial_patterns = TRIVIAL_PATTERNS
+        if type_config is None:
+            type_config = COMMIT_TYPE_CONFIG
+
+        # 与逐条 re.match 等价：组合后的分支同样只在开头匹配
+        self._trivial_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in trivial_patterns),
+            re.IGNORECASE,
+        )
+        self._conventional_re = re.compile(CONVENTIONAL_PATTERN)
+        self._type_config = type_config
+        self._default_config = type_config["other"]
+
+        # 规则指纹：规则变化后，持久化的备忘表随之失效
+        rules = json.dumps([trivial_patterns, type_config], sort_keys=True)
+        self.fingerprint = hashlib.sha1(rules.encode("utf-8")).hexdigest()
+
+        self._cache_size = cache_size
+        self._memo: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _parse(self, message: str) -> Dict[str, Any]:
+        is_trivial = self._trivial_re.match(message.lower().strip()) is not None
+
+        match = self._conventional_re.match(message)
+        if match:
+            commit_type = match.group(1).lower()
+            scope = match.group(2)
+            description = match.group(3)
+        else:
+            commit_type = "other"
+            scope = None
+            description = message
+
+        type_config = self._type_config.get(commit_type, self._default_config)
+        return {
+            "type": commit_type,
+            "scope": scope,
+            "description": description,
+            "is_trivial": is_trivial,
+            "is_highlight": type_config["is_highlight"],
+            "is_challenge": type_config["is_challenge"],
+            "priority": type_config["priority"],
+        }
+
+    def classify(self, message: str) -> Dict[str, Any]:
+        """解析单条提交信息
+
+        Args:
+            message: 提交信息
+
+        Returns:
+            解析结果，结构同 parse_commit_message
+        """
+        if self._cache_size <= 0:
+            return self._parse(message)
+
+        with self._memo_lock:
+            cached = self._memo.get(message)
+            if cached is not None:
+                self._memo.move_to_end(message)
+                self.hits += 1
+                return dict(cached)
+
+        result = self._parse(message)
+        self._remember(message, result)
+        with self._memo_lock:
+            self.misses += 1
+        return dict(result)
+
+    def classify_many(self, messages: Iterable[str]) -> List[Dict[str, Any]]:
+        """批量解析提交信息
+
+        Args:
+            messages: 提交信息列表
+
+        Returns:
+            解析结果列表，顺序与输入一致
+        """
+        classify = self.classify
+        return [classify(message) for message in messages]
+
+    def _remember(self, message: str, result: Dict[str, Any]) -> None:
+        with self._memo_lock:
+            self._memo[message] = result
+            self._memo.move_to_end(message)
+            while len(self._memo) > self._cache_size:
+                self._memo.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, int]:
+        """获取备忘表统计
+
+        Returns:
+            包含 hits、misses、size、max_size 的字典
+        """
+        with self._memo_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._memo),
+                "max_size": self._cache_size,
+            }
+
+    def export_memo(self, messages: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """导出指定标题的备忘条目（用于持久化）
+
+        Args:
+            messages: 提交信息列表
+
+        Returns:
+            {提交信息: 解析结果}，仅包含备忘表中存在的条目
+        """
+        with self._memo_lock:
+            return {
+                message: dict(self._memo[message])
+                for message in messages
+                if message in self._memo
+            }
+
+    def import_memo(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """导入持久化的备忘条目（不计入命中/未命中统计）
+
+        Args:
+            entries: export_memo 导出的条目
+        """
+        if self._cache_size <= 0:
+            return
+        for message, result in entries.items():
+            self._remember(message, dict(result))
+
+
+_default_classifier = CommitClassifier()
+
+
+def get_default_classifier() -> CommitClassifier:
+    """获取 parse_commit_message 使用的默认分类器（可读取备忘表命中统计）"""
+    return _default_classifier
+
+
 def parse_commit_message(message: str) -> Dict[str, Any]:
     """解析提交信息
 
@@ -242,47 +1247,69 @@ def parse_commit_message(message: str) -> Dict[str, Any]:
         - is_challenge: 是否为难点（fix 类型）
         - priority: 优先级（用于排序）
     """
-    result = {
-        "type": "other",
-        "scope": None,
-        "description": message,
-        "is_trivial": False,
-        "is_highlight": False,
-        "is_challenge": False,
-        "priority": 7,
-    }
-
-    # 检查是否为琐碎提交
-    message_lower = message.lower().strip()
-    for pattern in TRIVIAL_PATTERNS:
-        if re.match(pattern, message_lower, re.IGNORECASE):
-            result["is_trivial"] = True
-            break
+    return _default_classifier.classify(message)
 
-    # 解析常规提交格式: type(scope): description
-    conventional_pattern = r"^(\w+)(?:\(([^)]+)\))?\s*:\s*(.+)$"
-    match = re.match(conventional_pattern, message)
 
-    if match:
-        commit_type = match.group(1).lower()
-        result["type"] = commit_type
-        result["scope"] = match.group(2)
-        result["description"] = match.group(3)
-    else:
-        result["description"] = message
-        commit_type = "other"
+def get_git_dir(path: Path) -> Optional[Path]:
+    """获取工作目录对应的 Git 目录
+
+    普通仓库的 .git 是目录；worktree 和子模块的 .git 是文件，
+    内容为 "gitdir: <路径>"，这里读取其指向的目录。
+
+    Args:
+        path: 工作目录路径
+
+    Returns:
+        Git 目录路径，不是 Git 仓库时返回 None
+    """
+    dot_git = path / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if not dot_git.is_file():
+        return None
+
+    try:
+        content = dot_git.read_text(encoding="utf-8")
+    except OSError:
+        return None
 
-    # 从配置中获取类型属性
-    type_config = COMMIT_TYPE_CONFIG.get(commit_type, COMMIT_TYPE_CONFIG["other"])
-    result["is_highlight"] = type_config["is_highlight"]
-    result["is_challenge"] = type_config["is_challenge"]
-    result["priority"] = type_config["priority"]
+    for line in content.splitlines():
+        if line.startswith("gitdir:"):
+            git_dir = Path(line[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = path / git_dir
+            return git_dir if git_dir.is_dir() else None
+    return None
 
-    return result
+
+def resolve_common_git_dir(path: Path) -> Optional[Path]:
+    """获取仓库的公共 Git 目录（同一仓库的多个 worktree 共享该目录）
+
+    Args:
+        path: 工作目录路径
+
+    Returns:
+        公共 Git 目录的绝对路径，不是 Git 仓库时返回 None
+    """
+    git_dir = get_git_dir(path)
+    if git_dir is None:
+        return None
+
+    # worktree 的 Git 目录通过 commondir 文件指向主仓库的 Git 目录
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        try:
+            value = commondir.read_text(encoding="utf-8").strip()
+        except OSError:
+            value = ""
+        if value:
+            common = Path(value)
+            git_dir = common if common.is_absolute() else git_dir / common
+    return git_dir.resolve()
 
 
 def is_git_repo(path: Path) -> bool:
-    """检查路径是否为 Git 仓库
+    """检查路径是否为 Git 仓库（包括 .git 为文件的 worktree 和子模块）
 
     Args:
         path: 路径
@@ -290,8 +1317,102 @@ def is_git_repo(path: Path) -> bool:
     Returns:
         是否为 Git 仓库
     """
-    git_dir = path / ".git"
-    return git_dir.exists() and git_dir.is_dir()
+    return get_git_dir(path) is not None
+
+
+def dedupe_repo_paths(paths: List[Path]) -> List[Path]:
+    """按公共 Git 目录去重仓库路径
+
+    同一仓库的多个 worktree 共享对象库和引用，git log --all 从任一 worktree
+    都能遍历全部历史，因此只保留首次出现的路径。
+
+    Args:
+        paths: 仓库路径列表
+
+    Returns:
+        去重后的路径列表（保持原有顺序）
+    """
+    seen: Set[Path] = set()
+    unique = []
+    for path in paths:
+        common_dir = resolve_common_git_dir(path)
+        if common_dir is None or common_dir in seen:
+            continue
+        seen.add(common_dir)
+        unique.append(path)
+    return unique
+
+
+def list_submodules(repo_path: Path) -> List[Path]:
+    """列出仓库中已检出的子模块
+
+    Args:
+        repo_path: 仓库路径
+
+    Returns:
+        子模块工作目录列表（未初始化的子模块不包含在内）
+    """
+    if not (repo_path / ".gitmodules").is_file():
+        return []
+
+    try:
+        result = subprocess.run(
+            [
+                "git", "config", "-z", "--file", ".gitmodules",
+                "--get-regexp", r"^submodule\..*\.path$",
+            ],
+            cwd=repo_path,
+            capture_output=True,
+        )
+    except OSError:
+        return []
+    if result.returncode != 0:
+        return []
+
+    submodules = []
+    for item in result.stdout.decode("utf-8", errors="replace").split("\0"):
+        _, _, sub_path = item.partition("\n")
+        if sub_path and is_git_repo(repo_path / sub_path):
+            submodules.append(repo_path / sub_path)
+    return submodules
+
+
+def expand_submodules(paths: List[Path], max_workers: int = 1) -> List[Path]:
+    """递归展开仓库中的子模块
+
+    按层并发读取各仓库的 .gitmodules，每个仓库之后紧跟其子模块（深度优先顺序）。
+
+    Args:
+        paths: 仓库路径列表
+        max_workers: 并发读取的最大线程数
+
+    Returns:
+        包含所有子模块的仓库路径列表
+    """
+    children: Dict[Path, List[Path]] = {}
+    frontier = list(paths)
+    while frontier:
+        results = _map_repos(list_submodules, frontier, max_workers)
+        next_frontier = []
+        for path, submodules in zip(frontier, results):
+            children[path] = submodules
+            next_frontier.extend(sub for sub in submodules if sub not in children)
+        frontier = next_frontier
+
+    expanded: List[Path] = []
+    visited: Set[Path] = set()
+
+    def visit(path: Path) -> None:
+        if path in visited:
+            return
+        visited.add(path)
+        expanded.append(path)
+        for submodule in children.get(path, []):
+            visit(submodule)
+
+    for path in paths:
+        visit(path)
+    return expanded
 
 
 def get_repo_name(repo_path: Path) -> str:
@@ -332,30 +1453,389 @@ def scan_repos(
     return repos
 
 
-def merge_commits_from_repos(
-    commits_by_repo: Dict[str, List[Dict[str, Any]]]
-) -> List[Dict[str, Any]]:
-    """合并多仓库提交记录
+def _commit_sort_key(commit: Dict[str, Any]) -> int:
+    """提交排序键：作者时间戳，缺失时退回按中国时区解析 date 字段"""
+    timestamp = commit.get("timestamp")
+    if timestamp:
+        return timestamp
+    try:
+        day = date.fromisoformat(commit.get("date", ""))
+    except (TypeError, ValueError):
+        return 0
+    return int(datetime.combine(day, time(), CHINA_TZ).timestamp())
+
+
+def _sorted_stream(
+    repo_name: str,
+    commits: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """补全 project 字段，并确保单个仓库的提交按时间倒序"""
+    previous = None
+    in_order = True
+    for commit in commits:
+        # 确保每个提交都有 project 字段
+        if "project" not in commit:
+            commit["project"] = repo_name
+        key = _commit_sort_key(commit)
+        if previous is not None and key > previous:
+            in_order = False
+        previous = key
+
+    # git log --author-date-order 在 rebase 后的历史中可能局部乱序，此时单独排序该仓库
+    if in_order:
+        return commits
+    return sorted(commits, key=_commit_sort_key, reverse=True)
+
+
+def iter_merged_commits(
+    commits_by_repo: Dict[str, List[Dict[str, Any]]]
+) -> Iterator[Dict[str, Any]]:
+    """按作者时间倒序惰性合并多仓库提交记录
+
+    各仓库的提交本身已按时间倒序排列，这里用 heapq.merge 做多路归并，
+    无需对全部提交整体排序。
+
+    Args:
+        commits_by_repo: 按仓库分组的提交记录
+
+    Yields:
+        按时间从新到旧排列的提交记录
+    """
+    streams = [
+        _sorted_stream(repo_name, commits)
+        for repo_name, commits in commits_by_repo.items()
+    ]
+    return heapq.merge(*streams, key=_commit_sort_key, reverse=True)
+
+
+def merge_commits_from_repos(
+    commits_by_repo: Dict[str, List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """合并多仓库提交记录
 
     Args:
         commits_by_repo: 按仓库分组的提交记录
 
     Returns:
-        合并后的提交记录列表
+        合并后的提交记录列表（按作者时间从新到旧）
     """
-    merged = []
+    return list(iter_merged_commits(commits_by_repo))
+
+
+def get_latest_commit_timestamp(repo_path: Path) -> Optional[int]:
+    """获取所有引用（含 HEAD）中最新的提交时间
+
+    git log -1 --all 只需读取各引用指向的提交即可输出最新的一条，不会遍历历史。
+
+    Args:
+        repo_path: 仓库路径
+
+    Returns:
+        最新提交的提交时间戳，获取失败或仓库为空时返回 None
+    """
+    try:
+        result = subprocess.run(
+            ["git", "log", "-1", "--all", "--format=%ct"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return int(result.stdout.strip())
+        return None
+    except Exception:
+        return None
+
+
+def is_repo_active_since(repo_path: Path, start_date: date) -> bool:
+    """判断仓库在 start_date 之后是否可能有提交
+
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+
+    Returns:
+        最新引用早于 start_date 时返回 False，无法判断时返回 True
+    """
+    latest = get_latest_commit_timestamp(repo_path)
+    if latest is None:
+        return True
+    return latest >= day_start_timestamp(start_date)
+
+
+def _read_repo_commits(
+    path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str],
+    use_cache: bool = False,
+    cache_base_dir: Optional[Path] = None,
+    shard_months: int = 0,
+    with_stats: bool = False,
+    layout: Optional[Dict[str, Any]] = None,
+    shard_workers: int = 1,
+) -> Optional[Callable[[Optional[Set[str]]], Tuple[str, List[Dict[str, Any]]]]]:
+    """读取单个仓库的提交字段（供串行/并发两种模式复用，可在线程池中执行）
+
+    只执行 git（或同步提交缓存）并解析字段，不分类、不构建记录；
+    返回的构建函数接收共享的 hash 集合，由调用方按仓库顺序依次调用。
+
+    layout 为仓库布局配置（可选），{"projects": {路径前缀: 项目名称}, "pathspecs": [...]}；
+    shard_workers 为本仓库分片读取时可用的并发数（由调用方从总并发预算中分配）
+
+    Returns:
+        构建函数 seen -> (仓库名称, 提交记录列表)，非 Git 仓库时返回 None
+    """
+    if not is_git_repo(path):
+        return None
+
+    # 如果没有指定作者，自动获取
+    current_author = author
+    if current_author is None:
+        current_author = resolve_author_pattern(path)
+
+    layout = layout or {}
+    path_projects = layout.get("projects") or None
+    pathspecs = layout.get("pathspecs") or None
+    repo_name = get_repo_name(path)
+
+    if use_cache and not (with_stats or path_projects or pathspecs):
+        # 延迟导入：commit_cache 依赖本模块的解析函数
+        from src.commit_cache import build_cached_commits, read_cached_commit_fields
+
+        cached = read_cached_commit_fields(
+            path, start_date, end_date, current_author, cache_base_dir
+        )
+        if cached is None:
+            return lambda seen: (repo_name, [])
+        cache, cached_fields = cached
+        return lambda seen: (
+            repo_name, build_cached_commits(path, cache, cached_fields, cache_base_dir, seen)
+        )
+
+    fields = get_commit_fields(
+        path, start_date, end_date, current_author, shard_months, shard_workers,
+        with_stats=with_stats, path_projects=path_projects, pathspecs=pathspecs,
+    )
+    return lambda seen: (repo_name, list(build_commits_from_fields(fields, seen)))
+
+
+def dedupe_commits_by_hash(
+    commits_by_repo: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """按提交 hash 跨仓库去重
+
+    共享对象的多个仓库（fork 与上游、同一远端的多个克隆）会产出相同的提交，
+    这里按仓库顺序单次遍历，只保留首次出现的提交（归属于首个仓库）。
+
+    Args:
+        commits_by_repo: 按仓库分组的提交记录
+
+    Returns:
+        去重后的提交记录，去重后为空的仓库会被移除
+    """
+    seen: Set[str] = set()
+    deduped: Dict[str, List[Dict[str, Any]]] = {}
 
     for repo_name, commits in commits_by_repo.items():
+        unique = []
         for commit in commits:
-            # 确保每个提交都有 project 字段
-            if "project" not in commit:
-                commit["project"] = repo_name
-            merged.append(commit)
+            commit_hash = commit.get("hash")
+            if commit_hash in seen:
+                continue
+            if commit_hash:
+                seen.add(commit_hash)
+            unique.append(commit)
+        if unique:
+            deduped[repo_name] = unique
+
+    return deduped
+
+
+def get_patch_ids(repo_path: Path, hashes: List[str]) -> Dict[str, str]:
+    """批量计算提交的 patch-id
+
+    将所有 hash 一次性写入 git diff-tree --stdin，输出经管道直接交给
+    git patch-id --stable 流式计算，每个仓库只需一批子进程。
+    rebase、cherry-pick 产生的提交改动相同，patch-id 也相同。
+
+    Args:
+        repo_path: 仓库路径
+        hashes: 提交 hash 列表
+
+    Returns:
+        {提交 hash: patch-id}，合并提交、空提交没有 patch-id，不包含在内；
+        git 调用失败时返回空字典
+    """
+    if not hashes:
+        return {}
+
+    try:
+        diff_tree = subprocess.Popen(
+            ["git", "diff-tree", "--stdin", "--root", "-p"],
+            cwd=repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return {}
+
+    try:
+        patch_id = subprocess.Popen(
+            ["git", "patch-id", "--stable"],
+            cwd=repo_path,
+            stdin=diff_tree.stdout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        diff_tree.kill()
+        diff_tree.stdin.close()
+        diff_tree.stdout.close()
+        diff_tree.wait()
+        return {}
+    # 由 patch-id 进程独占读取端，diff-tree 才能在其退出时收到 SIGPIPE
+    diff_tree.stdout.close()
+
+    def feed() -> None:
+        # 单独线程写入 stdin，避免输出管道写满时相互阻塞
+        try:
+            diff_tree.stdin.write("".join(f"{h}\n" for h in hashes).encode("ascii"))
+        except OSError:
+            pass
+        finally:
+            diff_tree.stdin.close()
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+
+    patch_ids: Dict[str, str] = {}
+    for line in patch_id.stdout:
+        parts = line.split()
+        if len(parts) == 2:
+            patch_ids[parts[1].decode("ascii")] = parts[0].decode("ascii")
+
+    patch_id.stdout.close()
+    writer.join()
+    diff_tree.wait()
+    patch_id.wait()
+    return patch_ids
+
+
+def dedupe_commits_by_patch_id(
+    commits_by_repo: Dict[str, List[Dict[str, Any]]],
+    patch_ids: Dict[str, str],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """按 patch-id 折叠 rebase/cherry-pick 产生的重复提交
+
+    与 dedupe_commits_by_hash 相同，按仓库顺序单次遍历，只保留首次出现的提交。
+
+    Args:
+        commits_by_repo: 按仓库分组的提交记录
+        patch_ids: {提交 hash: patch-id}（见 get_patch_ids），没有 patch-id 的提交总是保留
+
+    Returns:
+        去重后的提交记录，去重后为空的仓库会被移除
+    """
+    seen: Set[str] = set()
+    deduped: Dict[str, List[Dict[str, Any]]] = {}
+
+    for repo_name, commits in commits_by_repo.items():
+        unique = []
+        for commit in commits:
+            patch_id = patch_ids.get(commit.get("hash"))
+            if patch_id is not None:
+                if patch_id in seen:
+                    continue
+                seen.add(patch_id)
+            unique.append(commit)
+        if unique:
+            deduped[repo_name] = unique
+
+    return deduped
+
+
+def _collapse_patch_duplicates(
+    commits_by_repo: Dict[str, List[Dict[str, Any]]],
+    paths: List[Path],
+    max_workers: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """为各仓库批量计算 patch-id 并折叠重复提交"""
+    repo_paths = [path for path in paths if get_repo_name(path) in commits_by_repo]
+
+    results = _map_repos(
+        lambda path: get_patch_ids(
+            path, [c["hash"] for c in commits_by_repo[get_repo_name(path)]]
+        ),
+        repo_paths,
+        max_workers,
+    )
+
+    patch_ids: Dict[str, str] = {}
+    for result in results:
+        patch_ids.update(result)
+    return dedupe_commits_by_patch_id(commits_by_repo, patch_ids)
+
+
+def _assemble_commits_by_repo(
+    results: Iterable[Optional[Tuple[str, List[Dict[str, Any]]]]],
+    dedupe: bool,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """按输入顺序组装各仓库的采集结果"""
+    commits_by_repo: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        if result is None:
+            continue
+        repo_name, commits = result
+        if commits:
+            commits_by_repo[repo_name] = commits
+
+    if dedupe:
+        commits_by_repo = dedupe_commits_by_hash(commits_by_repo)
+    return commits_by_repo
+
+
+def _map_repos(
+    func: Callable[[Path], Any],
+    paths: List[Path],
+    max_workers: int,
+) -> List[Any]:
+    """对每个仓库执行 func，max_workers > 1 时使用线程池并发执行
 
-    # 按日期排序
-    merged.sort(key=lambda x: x.get("date", ""), reverse=True)
+    Returns:
+        结果列表，顺序与 paths 一致
+    """
+    if max_workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            # executor.map 按输入顺序返回结果，保证输出顺序确定
+            return list(executor.map(func, paths))
+    return [func(path) for path in paths]
+
+
+def _default_max_workers() -> int:
+    """调用方未指定并发数时，使用 config.json 中的 max_workers"""
+    # 延迟导入：config_manager 依赖本模块
+    from src.config_manager import get_max_workers, load_config
+
+    return get_max_workers(load_config())
 
-    return merged
+
+def _filter_active_repos(
+    paths: List[Path],
+    start_date: date,
+    max_workers: int,
+) -> Tuple[List[Path], int]:
+    """过滤掉 start_date 之后没有任何提交的仓库
+
+    Returns:
+        (活跃仓库列表, 被跳过的仓库数)
+    """
+    active = _map_repos(
+        lambda path: is_repo_active_since(path, start_date), paths, max_workers
+    )
+    kept = [path for path, is_active in zip(paths, active) if is_active]
+    return kept, len(paths) - len(kept)
 
 
 def get_all_commits_from_repos(
@@ -363,39 +1843,494 @@ def get_all_commits_from_repos(
     start_date: date,
     end_date: date,
     author: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = False,
+    cache_base_dir: Optional[Path] = None,
+    index_path: Optional[Path] = None,
+    dedupe: bool = True,
+    skip_idle: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+    shard_months: int = 0,
+    dedupe_patches: bool = False,
+    with_stats: bool = False,
+    repo_layouts: Optional[Dict[Path, Dict[str, Any]]] = None,
+    include_submodules: bool = False,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """从多个仓库获取提交记录
 
+    max_workers > 1 时使用线程池并发采集（git 子进程不受 GIL 限制），
+    总耗时取决于最慢的仓库而非所有仓库之和；结果仍按 repo_paths 顺序组装，
+    与串行模式完全一致。同一仓库的多个 worktree 只采集一次（见 dedupe_repo_paths）。
+
     Args:
         repo_paths: 仓库路径列表
         start_date: 开始日期
         end_date: 结束日期
         author: 作者名（可选，None 表示自动获取）
+        max_workers: 并发采集的最大线程数，1 表示串行；
+            None 表示使用 config.json 中的 max_workers（见 config_manager.get_max_workers）
+        use_cache: 是否使用增量提交缓存（见 commit_cache 模块）
+        cache_base_dir: 缓存基础目录，默认为 ~/.weekly-reports
+        index_path: SQLite 提交索引路径（可选），指定时直接查询索引而不调用
+            git log，索引需先通过 workflow.sync_commit_index（或 commit_index.sync_index）
+            刷新；尚未同步进索引的仓库回退为 git 采集
+        dedupe: 是否按提交 hash 跨仓库去重（首次出现的仓库保留该提交）
+        skip_idle: 是否先检查各仓库最新引用的提交时间，跳过 start_date
+            之后没有任何提交的仓库（不再执行完整的 git log 遍历）
+        stats: 运行统计（可选），传入字典时写入 repos（有效仓库数）
+            和 skipped_idle（被跳过的空闲仓库数）
+        shard_months: 大于 0 时每个仓库按该月数切分时间窗口并发读取（见 get_commits），
+            分片并发数从 max_workers 中分配，git 进程总数不超过 max_workers
+        dedupe_patches: 是否按 patch-id 折叠 rebase、cherry-pick 到多个分支的同一改动
+            （每个仓库额外执行一批 git diff-tree | git patch-id）
+        with_stats: 是否在 git log 中附带 --numstat 采集文件改动统计
+            （提交缓存和索引不保存改动统计，开启时忽略 use_cache 与 index_path）
+        repo_layouts: 各仓库的布局配置（可选，通常为 config_manager.get_repo_layouts
+            的结果），{仓库路径: {"projects": {路径前缀: 项目名称}, "pathspecs": [...]}}；
+            配置了 projects 的仓库按改动文件将提交归属到子项目，
+            配置了 pathspecs 的仓库只遍历对应子目录（这些仓库不使用缓存，
+            指定 repo_layouts 时也不使用索引）
+        include_submodules: 是否递归采集已检出的子模块（并发读取 .gitmodules）
 
     Returns:
         按仓库分组的提交记录
     """
-    commits_by_repo: Dict[str, List[Dict[str, Any]]] = {}
+    paths = [Path(p) if isinstance(p, str) else p for p in repo_paths]
+    paths = [p for p in paths if is_git_repo(p)]
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    if include_submodules:
+        paths = expand_submodules(paths, max_workers)
+    paths = dedupe_repo_paths(paths)
+    skipped_idle = 0
+
+    use_index = index_path is not None and not with_stats and not repo_layouts
+    if skip_idle and not use_index:
+        paths, skipped_idle = _filter_active_repos(paths, start_date, max_workers)
+
+    if stats is not None:
+        stats["repos"] = len(paths) + skipped_idle
+        stats["skipped_idle"] = skipped_idle
+
+    if use_index:
+        commits_by_repo = _collect_with_index(
+            paths, start_date, end_date, author, max_workers, use_cache,
+            cache_base_dir, index_path, set() if dedupe else None, shard_months,
+        )
+    else:
+        commits_by_repo = _collect_all_repos(
+            paths, start_date, end_date, author, max_workers, use_cache,
+            cache_base_dir, set() if dedupe else None, shard_months, with_stats,
+            repo_layouts,
+        )
 
-    for path in repo_paths:
-        if isinstance(path, str):
-            path = Path(path)
+    if dedupe_patches:
+        commits_by_repo = _collapse_patch_duplicates(commits_by_repo, paths, max_workers)
+    return commits_by_repo
 
-        if not is_git_repo(path):
-            continue
 
-        # 如果没有指定作者，自动获取
-        current_author = author
-        if current_author is None:
-            current_author = build_author_pattern(
-                user_name=get_git_user(path),
-                user_email=get_git_user_email(path),
-            )
+def _shard_workers(max_workers: int, repo_count: int) -> int:
+    """按同时采集的仓库数平分 git 进程预算，得到每个仓库分片读取的并发数"""
+    return max(1, max_workers // max(1, min(max_workers, repo_count)))
+
+
+def _collect_with_index(
+    paths: List[Path],
+    start_date: date,
+    end_date: date,
+    author: Optional[str],
+    max_workers: int,
+    use_cache: bool,
+    cache_base_dir: Optional[Path],
+    index_path: Path,
+    seen: Optional[Set[str]],
+    shard_months: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """从 SQLite 索引查询提交记录，尚未同步进索引的仓库回退为 git（或提交缓存）采集
 
+    按仓库顺序共享 hash 集合：全部仓库都已索引时重复的行不会构建记录；
+    存在未索引仓库时两类结果按仓库顺序合并去重，首次出现的仓库保留该提交。
+    """
+    # 延迟导入：commit_index 依赖本模块
+    from src.commit_index import get_unindexed_repos, query_commits
+
+    unindexed = get_unindexed_repos(paths, index_path)
+    if not unindexed:
+        return query_commits(paths, start_date, end_date, author, index_path, seen)
+
+    indexed = query_commits(
+        [path for path in paths if path not in unindexed],
+        start_date, end_date, author, index_path,
+    )
+    shard_workers = _shard_workers(max_workers, len(unindexed))
+    builders = dict(zip(unindexed, _map_repos(
+        lambda path: _read_repo_commits(
+            path, start_date, end_date, author, use_cache, cache_base_dir,
+            shard_months, shard_workers=shard_workers,
+        ),
+        unindexed,
+        max_workers,
+    )))
+
+    results = []
+    for path in paths:
+        if path in builders:
+            build = builders[path]
+            if build is not None:
+                results.append(build(seen))
+            continue
         repo_name = get_repo_name(path)
-        commits = get_commits(path, start_date, end_date, current_author)
+        commits = indexed.get(repo_name, [])
+        if seen is not None:
+            commits = [commit for commit in commits if commit["hash"] not in seen]
+            seen.update(commit["hash"] for commit in commits)
+        results.append((repo_name, commits))
+    return _assemble_commits_by_repo(results, False)
 
-        if commits:
-            commits_by_repo[repo_name] = commits
 
-    return commits_by_repo
+def _collect_all_repos(
+    paths: List[Path],
+    start_date: date,
+    end_date: date,
+    author: Optional[str],
+    max_workers: int,
+    use_cache: bool,
+    cache_base_dir: Optional[Path],
+    seen: Optional[Set[str]],
+    shard_months: int,
+    with_stats: bool,
+    repo_layouts: Optional[Dict[Path, Dict[str, Any]]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """通过 git（或提交缓存）采集各仓库的提交记录
+
+    并发模式下各线程只读取并解析提交字段，记录统一在主线程按仓库顺序构建，
+    与串行模式共享同一个 hash 集合：重复提交归属于先出现的仓库，
+    结果不依赖调度顺序，且重复提交不会构建记录。
+
+    max_workers 是整次采集的 git 进程预算：并发模式下按同时采集的仓库数平分给
+    各仓库的分片读取，串行模式下全部用于当前仓库的分片读取。
+    """
+    layouts = repo_layouts or {}
+    shard_workers = _shard_workers(max_workers, len(paths))
+
+    builders = _map_repos(
+        lambda path: _read_repo_commits(
+            path, start_date, end_date, author, use_cache, cache_base_dir,
+            shard_months, with_stats, layouts.get(path), shard_workers,
+        ),
+        paths,
+        max_workers,
+    )
+    results = [build(seen) for build in builders if build is not None]
+    return _assemble_commits_by_repo(results, False)
+
+
+# ==================== 团队模式相关函数 ====================
+
+
+def build_member_lookup(members: Dict[str, List[str]]) -> Dict[str, str]:
+    """构建成员身份查找表
+
+    Args:
+        members: {成员名称: [作者名或邮箱, ...]}，成员名称本身也视为一个身份
+
+    Returns:
+        {小写身份: 成员名称}，同一身份出现多次时以先出现的成员为准
+    """
+    lookup: Dict[str, str] = {}
+    for member, identities in members.items():
+        for identity in [member, *identities]:
+            key = identity.strip().lower()
+            if key:
+                lookup.setdefault(key, member)
+    return lookup
+
+
+def iter_team_commit_fields(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+) -> Iterator[Tuple[str, CommitFields]]:
+    """逐条产出所有作者的提交字段及作者邮箱（不按作者过滤，仓库只遍历一次）
+
+    Yields:
+        (作者邮箱, 提交字段)，提交字段见 iter_commit_fields
+    """
+    cmd = _build_log_command(start_date, end_date, pretty_format=TEAM_LOG_PRETTY_FORMAT)
+    project = get_repo_name(repo_path)
+
+    for commit_hash, message, author, author_time, email in _stream_log_records(
+        cmd, repo_path, TEAM_LOG_FIELD_COUNT
+    ):
+        yield email, (commit_hash, message, author, author_time, project, None)
+
+
+def iter_team_commits(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    seen: Optional[Set[str]] = None,
+) -> Iterator[Tuple[str, Commit]]:
+    """逐条产出所有作者的提交记录及作者邮箱（不按作者过滤，仓库只遍历一次）
+
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+        end_date: 结束日期
+        seen: 已采集的提交 hash 集合（可选，见 iter_commits）
+
+    Yields:
+        (作者邮箱, 提交记录)
+    """
+    for email, fields in iter_team_commit_fields(repo_path, start_date, end_date):
+        for commit in build_commits_from_fields([fields], seen):
+            yield email, commit
+
+
+def _read_repo_team_commits(
+    path: Path,
+    start_date: date,
+    end_date: date,
+    lookup: Optional[Dict[str, str]],
+) -> Tuple[str, List[Tuple[str, CommitFields]]]:
+    """单次遍历仓库并解析出各成员的提交字段（可在线程池中执行，不构建记录）
+
+    Returns:
+        (仓库名称, [(成员, 提交字段), ...])，顺序与 git log 输出一致
+    """
+    records: List[Tuple[str, CommitFields]] = []
+    try:
+        for email, fields in iter_team_commit_fields(path, start_date, end_date):
+            if lookup is None:
+                member = email.lower()
+            else:
+                member = lookup.get(email.lower()) or lookup.get(fields[2].lower())
+                if member is None:
+                    continue
+            records.append((member, fields))
+    except Exception:
+        records = []
+    return get_repo_name(path), records
+
+
+def _bucket_team_commits(
+    records: List[Tuple[str, CommitFields]],
+    seen: Optional[Set[str]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """按成员分桶构建提交记录（命中 seen 的提交不构建）
+
+    Returns:
+        {成员: 提交记录列表}
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {}
+    for member, fields in records:
+        for commit in build_commits_from_fields([fields], seen):
+            buckets.setdefault(member, []).append(commit)
+    return buckets
+
+
+def get_team_commits_from_repos(
+    repo_paths: List[Path],
+    start_date: date,
+    end_date: date,
+    members: Optional[Dict[str, List[str]]] = None,
+    max_workers: Optional[int] = None,
+    dedupe: bool = True,
+    skip_idle: bool = False,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """团队模式：每个仓库只执行一次不带 --author 的 git log，按作者身份分桶
+
+    与逐个成员调用 get_all_commits_from_repos 相比，仓库遍历次数不随成员数增长。
+
+    Args:
+        repo_paths: 仓库路径列表
+        start_date: 开始日期
+        end_date: 结束日期
+        members: {成员名称: [作者名或邮箱, ...]}（不区分大小写），
+            不在其中的作者会被忽略；None 表示按作者邮箱分桶、保留所有作者
+        max_workers: 并发采集的最大线程数，1 表示串行；
+            None 表示使用 config.json 中的 max_workers
+        dedupe: 是否按提交 hash 跨仓库去重
+        skip_idle: 是否跳过 start_date 之后没有任何提交的仓库
+
+    Returns:
+        {成员: 按仓库分组的提交记录}，每个成员的值与 get_all_commits_from_repos
+        的返回结构一致；指定 members 时按其顺序排列，没有提交的成员不包含在内
+    """
+    paths = [Path(p) if isinstance(p, str) else p for p in repo_paths]
+    paths = dedupe_repo_paths([p for p in paths if is_git_repo(p)])
+    if max_workers is None:
+        max_workers = _default_max_workers()
+    if skip_idle:
+        paths, _ = _filter_active_repos(paths, start_date, max_workers)
+
+    lookup = build_member_lookup(members) if members is not None else None
+
+    # 各线程只解析字段，记录在主线程按仓库顺序构建并共享 hash 集合
+    results = _map_repos(
+        lambda path: _read_repo_team_commits(path, start_date, end_date, lookup),
+        paths,
+        max_workers,
+    )
+    seen: Optional[Set[str]] = set() if dedupe else None
+
+    team: Dict[str, Dict[str, List[Dict[str, Any]]]] = (
+        {member: {} for member in members} if members is not None else {}
+    )
+    for repo_name, records in results:
+        for member, commits in _bucket_team_commits(records, seen).items():
+            team.setdefault(member, {})[repo_name] = commits
+    return {member: repos for member, repos in team.items() if repos}
+
+
+# ==================== 异步采集相关函数 ====================
+
+
+async def _exec_git_async(args: List[str], cwd: Path) -> Optional[bytes]:
+    """异步执行 git 命令
+
+    协程被取消时会终止子进程，避免遗留 git 进程。
+
+    Returns:
+        标准输出原始字节，命令失败时返回 None
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    try:
+        stdout, _ = await process.communicate()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    if process.returncode != 0:
+        return None
+    return stdout
+
+
+async def _run_git_async(
+    args: List[str],
+    cwd: Path,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Optional[bytes]:
+    """在并发信号量的限制下异步执行 git 命令"""
+    if semaphore is None:
+        return await _exec_git_async(args, cwd)
+    async with semaphore:
+        return await _exec_git_async(args, cwd)
+
+
+async def _resolve_author_pattern_async(
+    repo_path: Path,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Optional[str]:
+    """resolve_author_pattern 的异步版本（缓存未命中时异步执行 git config）"""
+    resolver = get_identity_resolver()
+    identity = resolver.get_cached(repo_path)
+    if identity is None:
+        output = await _run_git_async(
+            IDENTITY_CONFIG_COMMAND,
+            repo_path,
+            semaphore,
+        )
+        identity = resolver.update(repo_path, output)
+    return build_author_pattern(identity.name, identity.email, identity.aliases)
+
+
+async def get_commits_async(
+    repo_path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[Dict[str, Any]]:
+    """get_commits 的异步版本
+
+    Args:
+        repo_path: 仓库路径
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者名（可选）
+        semaphore: 全局并发信号量（可选），限制同时运行的 git 进程数
+
+    Returns:
+        提交记录列表（与 get_commits 结构一致）
+    """
+    cmd = _build_log_command(start_date, end_date, author)
+
+    try:
+        output = await _run_git_async(cmd, repo_path, semaphore)
+        if not output or not output.strip():
+            return []
+        return _parse_log_output(output, repo_path)
+    except Exception:
+        return []
+
+
+async def _collect_repo_commits_async(
+    path: Path,
+    start_date: date,
+    end_date: date,
+    author: Optional[str],
+    semaphore: asyncio.Semaphore,
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    if not is_git_repo(path):
+        return None
+
+    current_author = author
+    if current_author is None:
+        current_author = await _resolve_author_pattern_async(path, semaphore)
+
+    commits = await get_commits_async(
+        path, start_date, end_date, current_author, semaphore
+    )
+    return get_repo_name(path), commits
+
+
+async def get_all_commits_from_repos_async(
+    repo_paths: List[Path],
+    start_date: date,
+    end_date: date,
+    author: Optional[str] = None,
+    max_concurrency: int = 8,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    dedupe: bool = True,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """get_all_commits_from_repos 的异步版本
+
+    所有仓库的 git 调用在同一个事件循环中并发执行，由信号量统一限流；
+    外部传入 semaphore 时可在多次调用（如多个用户）之间共享同一个并发上限。
+    任务被取消时，所有尚未完成的 git 子进程都会被终止。
+
+    Args:
+        repo_paths: 仓库路径列表
+        start_date: 开始日期
+        end_date: 结束日期
+        author: 作者名（可选，None 表示自动获取）
+        max_concurrency: 未传入 semaphore 时同时运行的 git 进程上限
+        semaphore: 全局并发信号量（可选）
+        dedupe: 是否按提交 hash 跨仓库去重
+
+    Returns:
+        按仓库分组的提交记录（顺序与 repo_paths 一致）
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    paths = [Path(p) if isinstance(p, str) else p for p in repo_paths]
+    paths = dedupe_repo_paths([p for p in paths if is_git_repo(p)])
+    results = await asyncio.gather(*(
+        _collect_repo_commits_async(path, start_date, end_date, author, semaphore)
+        for path in paths
+    ))
+
+    return _assemble_commits_by_repo(results, dedupe)
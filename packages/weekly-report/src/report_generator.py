@@ -1,57 +1,164 @@
 """周报生成器模块
 
 根据 Git 提交记录生成结构化周报。
+
+write_* 系列函数将报告逐行写入任意文本输出（文件、sys.stdout、
+socket.makefile("w") 等），不在内存中拼接整份报告；
+generate_* / format_* 系列函数返回字符串，基于前者实现。
 """
 
+import io
+import itertools
 import re
-from typing import Any, Dict, List, Optional
-
-from src.git_analyzer import group_commits_by_project
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+from src.cjk_segmenter import get_segmenter
+from src.git_analyzer import CommitTable, group_commits_by_project
+from src.text_similarity import cluster_similar_texts
+
+# 文本处理正则（模块加载时预编译一次）
+_CONVENTIONAL_PREFIX_RE = re.compile(r"^(\w+)(\([^)]+\))?\s*:\s*")
+_SCOPE_RE = re.compile(r"^\w+\(([^)]+)\)")
+_CHINESE_WORD_RE = re.compile(r"[\u4e00-\u9fff]+")
+_ENGLISH_WORD_RE = re.compile(r"[a-zA-Z]{3,}")
+
+_STOP_WORDS = frozenset({
+    "the", "and", "for", "with", "this", "that", "from", "into",
+    # 分词后几乎每条提交都会出现的通用动词/名词，不作为关键词
+    "实现", "新增", "添加", "增加", "支持", "修复", "修正", "解决", "优化", "完善",
+    "调整", "修改", "更新", "删除", "移除", "处理", "问题", "功能", "相关", "逻辑",
+})
+
+# 报告中使用的摘要长度：普通 / 难点 / 重点工作，以及跨项目功能的子条目与标题
+SUMMARY_LENGTHS = (25, 35, 40)
+
+# merge_related_commits 的合并方式
+MERGE_MODES = ("keywords", "minhash")
+# minhash 模式下判定为相似提交的 Jaccard 相似度阈值（基于字符 bigram）
+MINHASH_THRESHOLD = 0.5
+
+# 跨项目功能关联：scope 相同，或至少共享该数量的关键词，才视为同一功能
+FEATURE_MIN_SHARED_TOKENS = 2
+# 出现在超过该数量条目中的词区分度太低，不用于关联（同时限制倒排表内两两比较的次数）
+MAX_FEATURE_POSTINGS = 12
+# 仅在跨项目关联时忽略的通用英文动词：同一项目内的合并仍把它们当作关键词，
+# 避免 "add login page" 与 "update login page" 被合并为一条
+_FEATURE_STOP_WORDS = frozenset({"add", "update", "fix", "support", "remove", "improve"})
+
+# 改动规模阈值（仅在提交带有 stats 改动统计时生效）
+# 改动行数（新增 + 删除）达到该值的功能/修复，单次提交也视为重点/难点
+LARGE_CHANGE_LINES = 300
+# 涉及文件数达到该值的修复视为难点
+LARGE_CHANGE_FILES = 8
+# 改动行数低于该值时，多次提交不足以说明是重点/难点（如反复微调）
+SMALL_CHANGE_LINES = 20
 
 
 def generate_report(
-    commits: List[Dict[str, Any]],
+    commits: Iterable[Dict[str, Any]],
     supplements: Optional[List[str]] = None,
+    merge_mode: str = "keywords",
+    link_features: bool = False,
 ) -> str:
     """生成周报
 
     Args:
-        commits: 提交记录列表
+        commits: 提交记录列表、迭代器（如 git_analyzer.iter_commits 的结果）
+            或 CommitTable
         supplements: 补充内容列表
+        merge_mode: 相关提交的合并方式（见 merge_related_commits）
+        link_features: 是否将多个项目中的同一功能合并为一个“跨项目功能”条目
+            （见 link_cross_project_features）
 
     Returns:
         Markdown 格式的周报内容
     """
-    if not commits and not supplements:
-        return ""
+    buffer = io.StringIO()
+    write_report(buffer, commits, supplements, merge_mode, link_features)
+    return buffer.getvalue()
+
+
+def _write_section(sink: TextIO, lines: Iterable[str], started: bool) -> bool:
+    """逐行写入一个部分，与之前已写入的部分以空行分隔
+
+    Returns:
+        写入本部分后输出是否已有内容
+    """
+    for index, line in enumerate(lines):
+        if index:
+            sink.write("\n")
+        elif started:
+            sink.write("\n\n")
+        sink.write(line)
+        started = True
+    return started
+
+
+def write_report(
+    sink: TextIO,
+    commits: Iterable[Dict[str, Any]],
+    supplements: Optional[List[str]] = None,
+    merge_mode: str = "keywords",
+    link_features: bool = False,
+) -> bool:
+    """生成周报并逐部分写入文本输出（内容与 generate_report 的返回值一致）
 
-    # 过滤琐碎提交
-    filtered_commits = filter_trivial_commits(commits)
+    Args:
+        sink: 文本输出，只需支持 write(str)
+        commits: 提交记录列表、迭代器或 CommitTable
+        supplements: 补充内容列表
+        merge_mode: 相关提交的合并方式（见 merge_related_commits）
+        link_features: 是否关联跨项目功能（见 generate_report）
 
-    # 按项目分组
-    grouped = group_commits_by_project(filtered_commits)
+    Returns:
+        是否写入了任何内容
+    """
+    # 过滤琐碎提交并按项目分组（惰性消费，琐碎提交不会被保留），
+    # 同时对每条提交做一次文本预处理，后续各阶段直接复用
+    grouped: Dict[str, Any]
+    if isinstance(commits, CommitTable):
+        # 列式路径：过滤、分组都按列完成，子表一直保留到合并阶段
+        grouped = commits.filter_trivial().group_by_project()
+        for table in grouped.values():
+            for commit in table:
+                normalize_commit(commit)
+    else:
+        grouped = group_commits_by_project(
+            prepare_commits(c for c in commits if not c.get("is_trivial", False))
+        )
+
+    if not grouped and not supplements:
+        return False
+
+    started = False
+
+    # 合并各项目内的相关提交
+    merged_by_project = {
+        project: merge_related_commits(project_commits, merge_mode)
+        for project, project_commits in sorted(grouped.items())
+    }
 
-    # 生成周报内容
-    sections = []
+    if link_features:
+        features, merged_by_project = link_cross_project_features(merged_by_project)
+        if features:
+            started = _write_section(sink, iter_feature_section(features), started)
 
-    # 按项目生成各部分
-    for project, project_commits in sorted(grouped.items()):
-        # 合并相关提交
-        merged = merge_related_commits(project_commits)
-        section = format_project_section(project, merged)
-        sections.append(section)
+    # 按项目逐个写入各部分
+    for project, merged in merged_by_project.items():
+        if not merged:
+            continue
+        started = _write_section(sink, iter_project_section(project, merged), started)
 
     # 添加"其他"部分（补充内容）
     if supplements:
-        other_section = format_other_section(supplements)
-        sections.append(other_section)
+        started = _write_section(sink, iter_other_section(supplements), started)
 
-    return "\n\n".join(sections)
+    return started
 
 
 def filter_trivial_commits(
-    commits: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+    commits: Union[List[Dict[str, Any]], CommitTable]
+) -> Union[List[Dict[str, Any]], CommitTable]:
     """过滤琐碎提交
 
     过滤规则：
@@ -61,16 +168,19 @@ def filter_trivial_commits(
     - WIP 提交
 
     Args:
-        commits: 提交记录列表
+        commits: 提交记录列表或 CommitTable
 
     Returns:
-        过滤后的提交列表
+        过滤后的提交列表（输入为 CommitTable 时返回按列过滤后的子表）
     """
+    if isinstance(commits, CommitTable):
+        return commits.filter_trivial()
     return [c for c in commits if not c.get("is_trivial", False)]
 
 
 def merge_related_commits(
-    commits: List[Dict[str, Any]]
+    commits: Union[List[Dict[str, Any]], CommitTable],
+    mode: str = "keywords",
 ) -> List[Dict[str, Any]]:
     """合并相关提交
 
@@ -80,44 +190,50 @@ def merge_related_commits(
     3. 按类型优先级排序输出
 
     Args:
-        commits: 提交记录列表
+        commits: 提交记录列表或 CommitTable（按优先级列排序、按类型列分组）
+        mode: 合并方式
+            - keywords：前 3 个关键词完全相同的提交合并
+            - minhash：按字符 shingle 的 MinHash/LSH 聚类，相似度达到
+              MINHASH_THRESHOLD 的近似重复提交合并（不依赖分词，适合大量提交）
 
     Returns:
         合并后的提交列表
     """
+    if mode not in MERGE_MODES:
+        raise ValueError(f"不支持的合并方式: {mode}")
     if not commits:
         return []
     if len(commits) <= 1:
-        single = commits[0].copy()
+        single = next(iter(commits)).copy()
         single.setdefault("details", [])
         single.setdefault("commit_count", 1)
         return [single]
 
     # 第一步：按类型分组
     type_groups: Dict[str, List[Dict[str, Any]]] = {}
-    for commit in commits:
-        commit_type = commit.get("type", "other")
-        if commit_type not in type_groups:
-            type_groups[commit_type] = []
-        type_groups[commit_type].append(commit)
+    if isinstance(commits, CommitTable):
+        # 先按优先级列稳定排序，类型组按优先级从高到低产出，
+        # 第三步的排序只需处理合并后的少量条目，且输入已基本有序
+        for commit_type, table in commits.sort_by_priority().group_by_type().items():
+            type_groups[commit_type] = table.to_list()
+    else:
+        for commit in commits:
+            commit_type = commit.get("type", "other")
+            if commit_type not in type_groups:
+                type_groups[commit_type] = []
+            type_groups[commit_type].append(commit)
 
     # 第二步：在每个类型组内按关键词合并
     merged: List[Dict[str, Any]] = []
 
     for commit_type, type_commits in type_groups.items():
-        # 按关键词分组
-        keyword_groups: Dict[str, List[Dict[str, Any]]] = {}
-
-        for commit in type_commits:
-            keywords = extract_keywords(commit["message"])
-            str_key = str(sorted(keywords)) if keywords else commit["message"]
-
-            if str_key not in keyword_groups:
-                keyword_groups[str_key] = []
-            keyword_groups[str_key].append(commit)
+        if mode == "minhash":
+            groups = _cluster_similar_commits(type_commits)
+        else:
+            groups = _group_by_keywords(type_commits)
 
         # 合并同组提交
-        for group_commits in keyword_groups.values():
+        for group_commits in groups:
             main_commit = group_commits[0].copy()
             # 优先选择 feat 类型作为主条目
             for c in group_commits:
@@ -127,7 +243,7 @@ def merge_related_commits(
 
             details = []
             for c in group_commits:
-                details.append(clean_commit_message(c.get("message", "")))
+                details.append(normalize_commit(c)["clean"])
 
             # 去重并保持顺序
             seen = set()
@@ -141,6 +257,9 @@ def merge_related_commits(
 
             main_commit["details"] = uniq_details if len(uniq_details) > 1 else []
             main_commit["commit_count"] = len(group_commits)
+            stats = _sum_commit_stats(group_commits)
+            if stats is not None:
+                main_commit["stats"] = stats
             merged.append(main_commit)
 
     # 第三步：按优先级排序（优先级数字越小越靠前）
@@ -149,6 +268,42 @@ def merge_related_commits(
     return merged
 
 
+def _group_by_keywords(commits: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """按关键词分组（前 3 个关键词排序后完全相同）"""
+    keyword_groups: Dict[str, List[Dict[str, Any]]] = {}
+
+    for commit in commits:
+        keywords = normalize_commit(commit)["keywords"]
+        str_key = str(sorted(keywords)) if keywords else commit["message"]
+
+        if str_key not in keyword_groups:
+            keyword_groups[str_key] = []
+        keyword_groups[str_key].append(commit)
+
+    return list(keyword_groups.values())
+
+
+def _cluster_similar_commits(commits: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """按 MinHash/LSH 将近似重复的提交聚类"""
+    texts = [normalize_commit(commit)["clean"] for commit in commits]
+    clusters = cluster_similar_texts(texts, threshold=MINHASH_THRESHOLD)
+    return [[commits[index] for index in cluster] for cluster in clusters]
+
+
+def _sum_commit_stats(commits: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """汇总一组提交的改动统计，均无统计时返回 None"""
+    total: Optional[Dict[str, int]] = None
+    for commit in commits:
+        stats = commit.get("stats")
+        if not stats:
+            continue
+        if total is None:
+            total = {"files": 0, "insertions": 0, "deletions": 0}
+        for key in total:
+            total[key] += stats.get(key, 0)
+    return total
+
+
 def extract_keywords(message: str) -> List[str]:
     """从提交信息中提取关键词
 
@@ -159,24 +314,81 @@ def extract_keywords(message: str) -> List[str]:
         关键词列表
     """
     # 去除前缀
-    cleaned = re.sub(r"^(\w+)(\([^)]+\))?\s*:\s*", "", message)
+    return _keywords_from_text(_CONVENTIONAL_PREFIX_RE.sub("", message, count=1))
+
 
-    # 提取中文词语和英文单词
-    chinese_words = re.findall(r"[\u4e00-\u9fff]+", cleaned)
-    english_words = re.findall(r"[a-zA-Z]{3,}", cleaned)
+def _keywords_from_text(cleaned: str) -> List[str]:
+    """从已去除前缀的文本中提取关键词"""
+    # 提取中文词语（连续汉字按词典分词）和英文单词
+    segmenter = get_segmenter()
+    chinese_words = [
+        word for run in _CHINESE_WORD_RE.findall(cleaned) for word in segmenter.segment(run)
+    ]
+    english_words = _ENGLISH_WORD_RE.findall(cleaned)
 
     keywords = chinese_words + [w.lower() for w in english_words]
 
     # 过滤常见无意义词
-    stop_words = {"the", "and", "for", "with", "this", "that", "from", "into"}
-    keywords = [k for k in keywords if k.lower() not in stop_words]
+    keywords = [k for k in keywords if k.lower() not in _STOP_WORDS]
 
     return keywords[:3]  # 只保留前3个关键词
 
 
 def clean_commit_message(message: str) -> str:
     """清理提交信息为可读描述（去除 conventional 前缀）"""
-    return re.sub(r"^(\w+)(\([^)]+\))?\s*:\s*", "", message).strip()
+    return _CONVENTIONAL_PREFIX_RE.sub("", message, count=1).strip()
+
+
+def normalize_commit(commit: Dict[str, Any]) -> Dict[str, Any]:
+    """提交信息的一次性文本预处理
+
+    去除 conventional 前缀、提取关键词与 scope、生成各长度的摘要，
+    结果缓存在记录的 normalized 键中；合并、摘要、跨项目关联等阶段直接复用，
+    不再对同一提交信息重复执行正则。提交信息被修改后会重新计算。
+
+    Args:
+        commit: 提交记录（会被写入 normalized 键）
+
+    Returns:
+        {"message": 原始信息, "clean": 去除前缀的描述, "keywords": 关键词列表,
+         "scope": conventional scope（小写，可能为 None）,
+         "summaries": {摘要长度: 摘要}（长度见 SUMMARY_LENGTHS）}
+    """
+    message = commit.get("message", "")
+    cached = commit.get("normalized")
+    if cached is not None and cached["message"] == message:
+        return cached
+
+    prefix = _CONVENTIONAL_PREFIX_RE.match(message)
+    raw = message[prefix.end():] if prefix else message
+    clean = raw.strip()
+    scope = _SCOPE_RE.match(message)
+
+    normalized = {
+        "message": message,
+        "clean": clean,
+        "keywords": _keywords_from_text(raw),
+        "scope": scope.group(1).strip().lower() if scope else None,
+        "summaries": {length: _truncate_summary(clean, length) for length in SUMMARY_LENGTHS},
+    }
+    commit["normalized"] = normalized
+    return normalized
+
+
+def prepare_commits(commits: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """文本预处理阶段：逐条执行 normalize_commit 后原样产出"""
+    for commit in commits:
+        normalize_commit(commit)
+        yield commit
+
+
+def _commit_summary(commit: Dict[str, Any], max_length: int) -> str:
+    """获取提交摘要，优先使用预处理阶段缓存的结果"""
+    normalized = normalize_commit(commit)
+    summary = normalized["summaries"].get(max_length)
+    if summary is None:
+        summary = _truncate_summary(normalized["clean"], max_length)
+    return summary
 
 
 def analyze_work_significance(commit: Dict[str, Any]) -> Dict[str, bool]:
@@ -186,6 +398,11 @@ def analyze_work_significance(commit: Dict[str, Any]) -> Dict[str, bool]:
     - 重点：feat 类型 + 多次迭代（>=2次提交）或显式标记 is_highlight
     - 难点：fix 类型 + 多次尝试（>=2次提交）或显式标记 is_challenge
 
+    提交带有 stats 改动统计时（git_analyzer 的 with_stats 模式），按实际改动规模修正：
+    - 改动行数 >= LARGE_CHANGE_LINES 的 feat/refactor 视为重点、fix 视为难点
+      （即使只有一次提交），涉及文件数 >= LARGE_CHANGE_FILES 的 fix 视为难点
+    - 改动行数 < SMALL_CHANGE_LINES 时，多次提交不再提升为重点/难点
+
     Args:
         commit: 提交记录（合并后的，含 commit_count）
 
@@ -195,16 +412,28 @@ def analyze_work_significance(commit: Dict[str, Any]) -> Dict[str, bool]:
     commit_count = commit.get("commit_count", 1)
     commit_type = commit.get("type", "other")
 
+    stats = commit.get("stats")
+    iterated = commit_count >= 2
+    large_change = False
+    wide_change = False
+    if stats:
+        lines = stats.get("insertions", 0) + stats.get("deletions", 0)
+        iterated = iterated and lines >= SMALL_CHANGE_LINES
+        large_change = lines >= LARGE_CHANGE_LINES
+        wide_change = stats.get("files", 0) >= LARGE_CHANGE_FILES
+
     # 判断是否为重点
     is_highlight = commit.get("is_highlight", False)
-    if commit_type == "feat" and commit_count >= 2:
+    if commit_type == "feat" and (iterated or large_change):
+        is_highlight = True
+    if commit_type == "refactor" and large_change:
         is_highlight = True
     if commit_type == "perf":
         is_highlight = True
 
     # 判断是否为难点
     is_challenge = commit.get("is_challenge", False)
-    if commit_type == "fix" and commit_count >= 2:
+    if commit_type == "fix" and (iterated or large_change or wide_change):
         is_challenge = True
 
     return {
@@ -217,7 +446,23 @@ def format_project_section(
     project: str,
     commits: List[Dict[str, Any]],
 ) -> str:
-    """格式化项目部分
+    """格式化项目部分（规则见 iter_project_section）
+
+    Args:
+        project: 项目名称
+        commits: 提交记录列表
+
+    Returns:
+        格式化的 Markdown 内容
+    """
+    return "\n".join(iter_project_section(project, commits))
+
+
+def iter_project_section(
+    project: str,
+    commits: List[Dict[str, Any]],
+) -> Iterator[str]:
+    """逐行生成项目部分
 
     采用无标签风格，直接描述工作内容。
     重点/难点通过以下方式体现：
@@ -229,10 +474,10 @@ def format_project_section(
         project: 项目名称
         commits: 提交记录列表
 
-    Returns:
-        格式化的 Markdown 内容
+    Yields:
+        Markdown 行（不含换行符）
     """
-    lines = [project]
+    yield project
 
     for commit in commits:
         # 分析重点/难点
@@ -250,9 +495,9 @@ def format_project_section(
             max_len = 25
 
         # 生成摘要（无标签）
-        summary = summarize_commit(commit["message"], max_length=max_len)
+        summary = _commit_summary(commit, max_len)
 
-        lines.append(f"  - {summary}")
+        yield f"  - {summary}"
 
         # 添加子条目细节
         # 重点/难点保留细节，普通工作不展开
@@ -260,10 +505,140 @@ def format_project_section(
         if significance["is_highlight"] or significance["is_challenge"]:
             # 重点/难点：保留 2-3 条细节
             for detail in details[:3]:
-                lines.append(f"    - {detail}")
+                yield f"    - {detail}"
         # 普通工作：不展开子条目
 
-    return "\n".join(lines)
+
+# 倒排索引中 conventional scope 的前缀，与关键词区分
+_SCOPE_TOKEN_PREFIX = "scope:"
+
+
+def _feature_tokens(commit: Dict[str, Any]) -> Set[str]:
+    """用于跨项目关联的词：提交关键词（去掉 _FEATURE_STOP_WORDS）与 conventional scope
+    （带 _SCOPE_TOKEN_PREFIX 前缀）"""
+    normalized = normalize_commit(commit)
+    tokens = {keyword.lower() for keyword in normalized["keywords"]} - _FEATURE_STOP_WORDS
+    if normalized["scope"]:
+        tokens.add(_SCOPE_TOKEN_PREFIX + normalized["scope"])
+    return tokens
+
+
+def link_cross_project_features(
+    merged_by_project: Dict[str, List[Dict[str, Any]]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """关联多个项目中属于同一功能的条目
+
+    为所有项目的条目建立“关键词 -> 条目”倒排索引，只在倒排表内统计不同项目
+    条目之间共享的词：conventional scope 相同，或共享至少 FEATURE_MIN_SHARED_TOKENS
+    个关键词（已过滤停用词）的条目通过并查集连通，仅共享一个常见词（如“用户”）
+    不会关联。出现在超过 MAX_FEATURE_POSTINGS 个条目中的词不参与关联，
+    因此倒排表内两两比较的次数与条目数成线性关系。
+    连通后涉及两个及以上项目的条目组成一个跨项目功能。
+
+    Args:
+        merged_by_project: 按项目分组、已合并的条目（merge_related_commits 的结果）
+
+    Returns:
+        (跨项目功能列表, 移除已关联条目后的各项目条目)；
+        每个功能为 {"title": 摘要, "projects": [项目...], "entries": [(项目, 条目)...],
+        "priority": 主条目优先级}
+    """
+    entries: List[Tuple[str, Dict[str, Any]]] = [
+        (project, commit)
+        for project, commits in merged_by_project.items()
+        for commit in commits
+    ]
+
+    index: Dict[str, List[int]] = {}
+    for entry_id, (_, commit) in enumerate(entries):
+        for token in _feature_tokens(commit):
+            index.setdefault(token, []).append(entry_id)
+
+    parent = list(range(len(entries)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int) -> None:
+        root, other = find(a), find(b)
+        if root != other:
+            parent[max(root, other)] = min(root, other)
+
+    # (条目, 条目) -> 共享的关键词数（倒排表内条目按编号递增，a < b）
+    shared: Dict[Tuple[int, int], int] = {}
+    for token, postings in index.items():
+        if len(postings) < 2 or len(postings) > MAX_FEATURE_POSTINGS:
+            continue
+        is_scope = token.startswith(_SCOPE_TOKEN_PREFIX)
+        for position, a in enumerate(postings):
+            for b in postings[position + 1:]:
+                # 只关联跨项目的条目，同一项目内的归并由 merge_related_commits 负责
+                if entries[a][0] == entries[b][0]:
+                    continue
+                if is_scope:
+                    union(a, b)
+                    continue
+                count = shared.get((a, b), 0) + 1
+                shared[(a, b)] = count
+                if count == FEATURE_MIN_SHARED_TOKENS:
+                    union(a, b)
+
+    components: Dict[int, List[int]] = {}
+    for entry_id in range(len(entries)):
+        components.setdefault(find(entry_id), []).append(entry_id)
+
+    features: List[Dict[str, Any]] = []
+    linked: Set[int] = set()
+    for members in components.values():
+        projects = list(dict.fromkeys(entries[i][0] for i in members))
+        if len(projects) < 2:
+            continue
+        linked.update(members)
+        main = min(
+            (entries[i][1] for i in members),
+            key=lambda c: (c.get("priority", 7), c.get("message", "")),
+        )
+        features.append({
+            "title": _commit_summary(main, 40),
+            "projects": projects,
+            "entries": [entries[i] for i in members],
+            "priority": main.get("priority", 7),
+        })
+
+    features.sort(key=lambda f: (f["priority"], f["title"]))
+
+    remaining: Dict[str, List[Dict[str, Any]]] = {project: [] for project in merged_by_project}
+    for entry_id, (project, commit) in enumerate(entries):
+        if entry_id not in linked:
+            remaining[project].append(commit)
+
+    return features, remaining
+
+
+def format_feature_section(features: List[Dict[str, Any]]) -> str:
+    """格式化“跨项目功能”部分
+
+    Args:
+        features: link_cross_project_features 返回的功能列表
+
+    Returns:
+        格式化的 Markdown 内容
+    """
+    return "\n".join(iter_feature_section(features))
+
+
+def iter_feature_section(features: List[Dict[str, Any]]) -> Iterator[str]:
+    """逐行生成“跨项目功能”部分"""
+    yield "跨项目功能"
+
+    for feature in features:
+        yield f"  - {feature['title']}（{'、'.join(feature['projects'])}）"
+        for project, commit in feature["entries"]:
+            summary = _commit_summary(commit, 25)
+            yield f"    - {project}：{summary}"
 
 
 def format_other_section(supplements: List[str]) -> str:
@@ -275,12 +650,15 @@ def format_other_section(supplements: List[str]) -> str:
     Returns:
         格式化的 Markdown 内容
     """
-    lines = ["其他"]
+    return "\n".join(iter_other_section(supplements))
 
-    for item in supplements:
-        lines.append(f"  - {item}")
 
-    return "\n".join(lines)
+def iter_other_section(supplements: List[str]) -> Iterator[str]:
+    """逐行生成"其他"部分"""
+    yield "其他"
+
+    for item in supplements:
+        yield f"  - {item}"
 
 
 def summarize_commit(
@@ -301,8 +679,11 @@ def summarize_commit(
     Returns:
         摘要文本（无标签）
     """
-    cleaned = clean_commit_message(message)
+    return _truncate_summary(clean_commit_message(message), max_length)
+
 
+def _truncate_summary(cleaned: str, max_length: int) -> str:
+    """在自然断点处截断已清理的描述（见 summarize_commit）"""
     # 截断过长的文本（智能截断）
     if len(cleaned) > max_length:
         # 在最大长度范围内寻找自然断点
@@ -339,6 +720,8 @@ def generate_full_report(
     commits_by_project: Dict[str, List[Dict[str, Any]]],
     supplements: Optional[List[str]] = None,
     date_range: Optional[str] = None,
+    merge_mode: str = "keywords",
+    link_features: bool = False,
 ) -> str:
     """生成完整周报
 
@@ -346,21 +729,70 @@ def generate_full_report(
         commits_by_project: 按项目分组的提交记录
         supplements: 补充内容列表
         date_range: 日期范围描述
+        merge_mode: 相关提交的合并方式（见 merge_related_commits）
+        link_features: 是否关联跨项目功能（见 generate_report）
 
     Returns:
         完整的 Markdown 周报
     """
-    # 合并所有提交
-    all_commits = []
-    for commits in commits_by_project.values():
-        all_commits.extend(commits)
+    buffer = io.StringIO()
+    write_full_report(buffer, commits_by_project, supplements, date_range, merge_mode, link_features)
+    return buffer.getvalue()
 
-    # 生成报告内容
-    content = generate_report(all_commits, supplements)
 
+def write_full_report(
+    sink: TextIO,
+    commits_by_project: Dict[str, List[Dict[str, Any]]],
+    supplements: Optional[List[str]] = None,
+    date_range: Optional[str] = None,
+    merge_mode: str = "keywords",
+    link_features: bool = False,
+) -> bool:
+    """生成完整周报并写入文本输出（内容与 generate_full_report 的返回值一致）
+
+    可直接作为 storage.save_report / save_period_report 的渲染函数，例如
+    ``functools.partial(write_full_report, commits_by_project=..., date_range=...)``。
+
+    Args:
+        sink: 文本输出，只需支持 write(str)
+        commits_by_project: 按项目分组的提交记录
+        supplements: 补充内容列表
+        date_range: 日期范围描述
+        merge_mode: 相关提交的合并方式（见 merge_related_commits）
+        link_features: 是否关联跨项目功能（见 generate_report）
+
+    Returns:
+        是否写入了任何内容
+    """
     # 添加标题（如果有日期范围）
     if date_range:
-        header = f"# 周报 ({date_range})\n\n"
-        content = header + content
+        sink.write(f"# 周报 ({date_range})\n\n")
+
+    # 各项目的提交依次流入报告生成，不再拼接为一个列表
+    all_commits = itertools.chain.from_iterable(commits_by_project.values())
+    written = write_report(sink, all_commits, supplements, merge_mode, link_features)
+    return written or bool(date_range)
+
 
-    return content
+def generate_team_reports(
+    commits_by_member: Dict[str, Dict[str, List[Dict[str, Any]]]],
+    date_range: Optional[str] = None,
+) -> Dict[str, str]:
+    """为团队成员分别生成周报
+
+    Args:
+        commits_by_member: {成员: 按项目分组的提交记录}
+            （通常为 git_analyzer.get_team_commits_from_repos 的结果）
+        date_range: 日期范围描述
+
+    Returns:
+        {成员: 完整的 Markdown 周报}，没有有效提交的成员不包含在内
+    """
+    reports: Dict[str, str] = {}
+    for member, commits_by_project in commits_by_member.items():
+        buffer = io.StringIO()
+        title = f"# {member} 周报 ({date_range})" if date_range else f"# {member} 周报"
+        buffer.write(f"{title}\n\n")
+        if write_full_report(buffer, commits_by_project):
+            reports[member] = buffer.getvalue()
+    return reports
@@ -1,14 +1,23 @@
 """存储管理模块
 
 管理周报的存储和检索。
+
+保存时报告内容可以是字符串，也可以是将报告写入文本输出的渲染函数
+（如 report_generator.write_full_report），后者直接流式写入临时文件，
+不需要先在内存中生成整份报告。
 """
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+
+# 报告内容：字符串，或接收文本输出并写入报告的渲染函数
+ReportContent = Union[str, Callable[[TextIO], Any]]
 
 
 @dataclass
@@ -17,7 +26,12 @@ class ReportEntry:
     details: List[str]
 
 
-def _parse_report_markdown(content: str) -> tuple[list[str], dict[str, list[ReportEntry]]]:
+def _parse_report_markdown(
+    content: Union[str, Iterable[str]],
+) -> tuple[list[str], dict[str, list[ReportEntry]]]:
+    # content 可以是完整文本，也可以是逐行迭代的文件对象
+    lines = content.splitlines() if isinstance(content, str) else content
+
     preamble: list[str] = []
     sections: dict[str, list[ReportEntry]] = {}
 
@@ -25,7 +39,7 @@ def _parse_report_markdown(content: str) -> tuple[list[str], dict[str, list[Repo
     current_entry: Optional[ReportEntry] = None
     started_sections = False
 
-    for raw_line in content.splitlines():
+    for raw_line in lines:
         line = raw_line.rstrip("\n")
         if not line.strip():
             if not started_sections:
@@ -110,28 +124,52 @@ def _merge_sections(
     return merged
 
 
-def _render_report_markdown(
+def _iter_report_lines(
     preamble: list[str],
     sections: dict[str, list[ReportEntry]],
-) -> str:
-    lines: list[str] = []
-    if preamble:
-        lines.extend(preamble)
-        if lines and lines[-1].strip():
-            lines.append("")
+) -> Iterable[str]:
+    yield from preamble
+    if preamble and preamble[-1].strip():
+        yield ""
 
     for section, entries in sections.items():
-        lines.append(section)
+        yield section
         for entry in entries:
-            lines.append(f"  - {entry.summary}")
+            yield f"  - {entry.summary}"
             for detail in entry.details:
-                lines.append(f"    - {detail}")
-        lines.append("")
+                yield f"    - {detail}"
+        yield ""
 
-    while lines and not lines[-1].strip():
-        lines.pop()
 
-    return "\n".join(lines) + "\n"
+def _write_report_markdown(
+    sink: TextIO,
+    preamble: list[str],
+    sections: dict[str, list[ReportEntry]],
+) -> None:
+    # 空行暂存，后面还有内容时才写出，保证结尾没有多余空行
+    pending: list[str] = []
+    written = False
+    for line in _iter_report_lines(preamble, sections):
+        if not line.strip():
+            pending.append(line)
+            continue
+        for blank in pending:
+            sink.write(f"{blank}\n")
+        pending = []
+        sink.write(f"{line}\n")
+        written = True
+
+    if not written:
+        sink.write("\n")
+
+
+def _render_report_markdown(
+    preamble: list[str],
+    sections: dict[str, list[ReportEntry]],
+) -> str:
+    buffer = io.StringIO()
+    _write_report_markdown(buffer, preamble, sections)
+    return buffer.getvalue()
 
 
 def merge_report_content(existing: str, new: str) -> str:
@@ -143,6 +181,64 @@ def merge_report_content(existing: str, new: str) -> str:
     return _render_report_markdown(preamble, merged_sections)
 
 
+class _TailTrackingWriter:
+    """记录最后写入字符的文本输出包装（用于判断结尾是否已有换行）"""
+
+    def __init__(self, sink: TextIO) -> None:
+        self._sink = sink
+        self.last = ""
+
+    def write(self, text: str) -> int:
+        if text:
+            self.last = text[-1]
+        return self._sink.write(text)
+
+
+def _write_report_file(path: Path, content: ReportContent) -> None:
+    """写入报告文件，文件已存在时与新内容合并
+
+    新内容先写入同目录的临时文件（渲染函数直接流式写入），
+    合并结果也写回该临时文件，最后整体替换目标文件，中断时不会留下半份报告。
+
+    Args:
+        path: 报告文件路径
+        content: 报告内容或渲染函数
+    """
+    # 确保目录存在
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with open(tmp_path, "w+", encoding="utf-8") as f:
+            writer = _TailTrackingWriter(f)
+            if isinstance(content, str):
+                writer.write(content)
+            else:
+                content(writer)
+
+            # 同一周期多次生成时进行内容合并（逐行解析，不整体读入）
+            if path.exists():
+                f.seek(0)
+                new_preamble, new_sections = _parse_report_markdown(f)
+                with open(path, "r", encoding="utf-8") as existing:
+                    existing_preamble, existing_sections = _parse_report_markdown(existing)
+
+                f.seek(0)
+                f.truncate()
+                _write_report_markdown(
+                    f,
+                    existing_preamble or new_preamble,
+                    _merge_sections(existing_sections, new_sections),
+                )
+            elif writer.last != "\n":
+                f.write("\n")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    tmp_path.replace(path)
+
+
 def get_storage_dir(base_dir: Optional[Path] = None) -> Path:
     """获取存储目录
 
@@ -178,7 +274,7 @@ def get_report_path(
 
 
 def save_report(
-    content: str,
+    content: ReportContent,
     year: int,
     week: int,
     base_dir: Optional[Path] = None,
@@ -186,7 +282,7 @@ def save_report(
     """保存周报
 
     Args:
-        content: 周报内容
+        content: 周报内容，或将周报写入文本输出的渲染函数
         year: 年份
         week: 周数
         base_dir: 存储基础目录
@@ -196,16 +292,8 @@ def save_report(
     """
     path = get_report_path(year, week, base_dir)
 
-    # 确保目录存在
-    path.parent.mkdir(parents=True, exist_ok=True)
-
     # 同一周多次生成时进行内容合并
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        merged = merge_report_content(existing, content)
-        path.write_text(merged, encoding="utf-8")
-    else:
-        path.write_text(content if content.endswith("\n") else content + "\n", encoding="utf-8")
+    _write_report_file(path, content)
 
     return path
 
@@ -366,15 +454,18 @@ def get_period_report_path(
 
 
 def save_period_report(
-    content: str,
+    content: ReportContent,
     start_date: date,
     end_date: date,
     base_dir: Optional[Path] = None,
 ) -> Path:
     """保存时间段报告
 
+    长报告可传入渲染函数直接流式写入，例如
+    ``functools.partial(write_full_report, commits_by_project=..., date_range=...)``。
+
     Args:
-        content: 报告内容
+        content: 报告内容，或将报告写入文本输出的渲染函数
         start_date: 开始日期
         end_date: 结束日期
         base_dir: 存储基础目录
@@ -384,16 +475,8 @@ def save_period_report(
     """
     path = get_period_report_path(start_date, end_date, base_dir)
 
-    # 确保目录存在
-    path.parent.mkdir(parents=True, exist_ok=True)
-
     # 同一时间段多次生成时进行内容合并
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        merged = merge_report_content(existing, content)
-        path.write_text(merged, encoding="utf-8")
-    else:
-        path.write_text(content if content.endswith("\n") else content + "\n", encoding="utf-8")
+    _write_report_file(path, content)
 
     return path
 
@@ -0,0 +1,141 @@
+"""文本近似去重模块
+
+基于字符 shingle 的 MinHash 签名与 LSH（局部敏感哈希）分桶，
+在近似线性时间内找出相似的提交信息，不依赖分词，中英文均适用。
+"""
+
+import random
+import re
+import zlib
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+# 梅森素数，作为哈希置换的模数
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def char_shingles(text: str, size: int = 2) -> Set[int]:
+    """提取字符 shingle（连续 size 个字符）并哈希为整数
+
+    按字符而非单词切分，中文等不以空格分词的文本同样适用。
+
+    Args:
+        text: 文本
+        size: shingle 长度
+
+    Returns:
+        shingle 哈希集合，文本短于 size 时整体作为一个 shingle
+    """
+    normalized = _WHITESPACE.sub(" ", text.strip().lower())
+    if len(normalized) <= size:
+        return {zlib.crc32(normalized.encode("utf-8"))} if normalized else set()
+    return {
+        zlib.crc32(normalized[i:i + size].encode("utf-8"))
+        for i in range(len(normalized) - size + 1)
+    }
+
+
+class MinHasher:
+    """MinHash 签名生成器
+
+    使用 num_perm 个形如 (a * x + b) mod p 的哈希置换，签名中相同位置取值
+    相等的比例即为两个 shingle 集合 Jaccard 相似度的无偏估计。
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        """
+        Args:
+            num_perm: 签名长度（哈希置换个数）
+            seed: 随机种子，固定种子保证结果可复现
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms: List[Tuple[int, int]] = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Set[int]) -> Tuple[int, ...]:
+        """计算 shingle 集合的 MinHash 签名
+
+        Args:
+            shingles: shingle 哈希集合
+
+        Returns:
+            长度为 num_perm 的签名，空集合返回全为最大值的签名
+        """
+        if not shingles:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * x + b) % _MERSENNE_PRIME for x in shingles) & _MAX_HASH
+            for a, b in self._perms
+        )
+
+
+def estimate_similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """由两个 MinHash 签名估计 Jaccard 相似度"""
+    if not left:
+        return 0.0
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+def cluster_similar_texts(
+    texts: Sequence[str],
+    threshold: float = 0.5,
+    num_perm: int = 64,
+    bands: int = 16,
+    shingle_size: int = 2,
+) -> List[List[int]]:
+    """将相似文本聚类
+
+    每个签名切分为 bands 段，任一段完全相同的文本落入同一个桶成为候选；
+    候选只与桶内第一个文本比较估计相似度，达到阈值即用并查集合并，
+    总体耗时与文本数量近似线性，不做两两比较。
+
+    Args:
+        texts: 文本列表
+        threshold: 判定为相似的 Jaccard 相似度阈值
+        num_perm: MinHash 签名长度，需能被 bands 整除
+        bands: LSH 分段数（段数越多，越容易把相似度较低的文本列为候选）
+        shingle_size: 字符 shingle 长度
+
+    Returns:
+        聚类结果，每个类为文本下标列表；类按首个成员的下标排序，类内保持输入顺序
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm 必须能被 bands 整除")
+
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(char_shingles(text, shingle_size)) for text in texts]
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = num_perm // bands
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], int] = {}
+        start = band * rows
+        for index, signature in enumerate(signatures):
+            key = signature[start:start + rows]
+            first = buckets.setdefault(key, index)
+            if first == index:
+                continue
+            root, other = find(first), find(index)
+            if root != other and estimate_similarity(
+                signatures[first], signature
+            ) >= threshold:
+                # 保持下标较小的成员为根，使聚类顺序与输入一致
+                parent[max(root, other)] = min(root, other)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(texts)):
+        clusters.setdefault(find(index), []).append(index)
+    return list(clusters.values())
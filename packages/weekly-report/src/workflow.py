@@ -0,0 +1,156 @@
+"""周报生成流程
+
+按 config.json 的配置采集提交并生成报告：配置项经 config_manager 映射为
+git_analyzer / report_generator 的参数，调用方无需逐项传入。
+"""
+
+import io
+from datetime import date
+from typing import Any, Dict, List, Optional, TextIO
+
+from src.commit_index import get_index_path, sync_index
+from src.config_manager import (
+    get_collection_options,
+    get_default_author,
+    get_repo_paths,
+    get_report_options,
+    get_team_members,
+    load_config,
+)
+from src.git_analyzer import (
+    dedupe_repo_paths,
+    expand_submodules,
+    get_all_commits_from_repos,
+    get_team_commits_from_repos,
+    is_git_repo,
+)
+from src.report_generator import write_full_report
+
+
+def collect_commits(
+    start_date: date,
+    end_date: date,
+    config: Optional[Dict[str, Any]] = None,
+    author: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """按配置采集所有仓库的提交记录
+
+    Args:
+        start_date: 开始日期
+        end_date: 结束日期
+        config: 配置字典，默认读取 ~/.weekly-reports/config.json
+        author: 作者匹配模式（可选，默认使用配置中的 default_author）
+
+    Returns:
+        按仓库（或 monorepo 子项目）分组的提交记录
+    """
+    if config is None:
+        config = load_config()
+    if author is None:
+        author = get_default_author(config)
+
+    return get_all_commits_from_repos(
+        get_repo_paths(config),
+        start_date,
+        end_date,
+        author,
+        **get_collection_options(config),
+    )
+
+
+def sync_commit_index(config: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """按配置刷新 SQLite 提交索引（开启 use_index 时在采集前调用）
+
+    同步的仓库范围与 collect_commits 一致（含 include_submodules 展开的子模块），
+    未同步的仓库在采集时会回退为 git log。
+
+    Args:
+        config: 配置字典，默认读取 ~/.weekly-reports/config.json
+
+    Returns:
+        {仓库名称: 新增提交数}
+    """
+    if config is None:
+        config = load_config()
+    options = get_collection_options(config)
+
+    paths = [path for path in get_repo_paths(config) if is_git_repo(path)]
+    if options["include_submodules"]:
+        paths = expand_submodules(paths, options["max_workers"])
+    return sync_index(dedupe_repo_paths(paths), get_index_path())
+
+
+def collect_team_commits(
+    start_date: date,
+    end_date: date,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """团队模式：按配置中的 team_members 采集各成员的提交记录
+
+    结果可直接传给 report_generator.generate_team_reports。
+
+    Args:
+        start_date: 开始日期
+        end_date: 结束日期
+        config: 配置字典，默认读取 ~/.weekly-reports/config.json
+
+    Returns:
+        {成员: 按仓库分组的提交记录}；未配置 team_members 时按作者邮箱分桶
+    """
+    if config is None:
+        config = load_config()
+    options = get_collection_options(config)
+
+    return get_team_commits_from_repos(
+        get_repo_paths(config),
+        start_date,
+        end_date,
+        members=get_team_members(config) or None,
+        max_workers=options["max_workers"],
+        skip_idle=options["skip_idle"],
+    )
+
+
+def write_configured_report(
+    sink: TextIO,
+    commits_by_project: Dict[str, List[Dict[str, Any]]],
+    config: Optional[Dict[str, Any]] = None,
+    supplements: Optional[List[str]] = None,
+    date_range: Optional[str] = None,
+) -> bool:
+    """按配置的合并方式生成完整周报并写入文本输出
+
+    可作为 storage.save_period_report 的渲染函数（配合 functools.partial）。
+
+    Args:
+        sink: 文本输出
+        commits_by_project: 按项目分组的提交记录（通常为 collect_commits 的结果）
+        config: 配置字典，默认读取 ~/.weekly-reports/config.json
+        supplements: 补充内容列表
+        date_range: 日期范围描述
+
+    Returns:
+        是否写入了任何内容
+    """
+    if config is None:
+        config = load_config()
+
+    return write_full_report(
+        sink, commits_by_project, supplements, date_range, **get_report_options(config)
+    )
+
+
+def generate_configured_report(
+    commits_by_project: Dict[str, List[Dict[str, Any]]],
+    config: Optional[Dict[str, Any]] = None,
+    supplements: Optional[List[str]] = None,
+    date_range: Optional[str] = None,
+) -> str:
+    """按配置生成完整周报（见 write_configured_report）
+
+    Returns:
+        完整的 Markdown 周报
+    """
+    buffer = io.StringIO()
+    write_configured_report(buffer, commits_by_project, config, supplements, date_range)
+    return buffer.getvalue()
@@ -9,6 +9,36 @@ src_path = Path(__file__).parent.parent
 sys.path.insert(0, str(src_path))
 
 
+@pytest.fixture(autouse=True)
+def identity_resolver(tmp_path, monkeypatch):
+    """身份解析缓存写入临时目录，避免测试读写 ~/.weekly-reports"""
+    from src import author_identity
+
+    resolver = author_identity.AuthorIdentityResolver(tmp_path / "identity.json")
+    monkeypatch.setattr(author_identity, "_default_resolver", resolver)
+    return resolver
+
+
+@pytest.fixture(autouse=True)
+def config_path(tmp_path, monkeypatch):
+    """配置文件指向临时目录，避免测试读取 ~/.weekly-reports/config.json"""
+    from src import config_manager
+
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(config_manager, "get_config_path", lambda base_dir=None: path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def cjk_segmenter(tmp_path, monkeypatch):
+    """分词词典的编译结果写入临时目录，避免测试读写 ~/.weekly-reports"""
+    from src import cjk_segmenter
+
+    segmenter = cjk_segmenter.CJKSegmenter(cache_path=tmp_path / "cjk_dict.bin")
+    monkeypatch.setattr(cjk_segmenter, "_default_segmenter", segmenter)
+    return segmenter
+
+
 @pytest.fixture
 def sample_commits():
     """示例提交记录（无标签风格）"""
@@ -134,3 +164,71 @@ def single_commit():
         "priority": 1,
         "project": "project-backend",
     }
+
+
+def _run_git(repo: Path, *args: str, env: dict = None) -> str:
+    import os
+    import subprocess
+
+    full_env = {**os.environ, **(env or {})}
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        env=full_env,
+        check=True,
+    )
+    return result.stdout
+
+
+def _commit(repo: Path, message: str, when: str, filename: str = "file.txt") -> str:
+    path = repo / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    previous = path.read_text(encoding="utf-8") if path.exists() else ""
+    path.write_text(previous + message + "\n", encoding="utf-8")
+    _run_git(repo, "add", filename)
+    _run_git(
+        repo,
+        "commit",
+        "-q",
+        "-m",
+        message,
+        env={"GIT_AUTHOR_DATE": when, "GIT_COMMITTER_DATE": when},
+    )
+    return _run_git(repo, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture
+def git_commit():
+    """在已有仓库中追加提交，返回提交 hash
+
+    用法：git_commit(repo, "feat: 新功能", "2026-01-10T10:00:00+08:00")
+    """
+    return _commit
+
+
+@pytest.fixture
+def git_cmd():
+    """在仓库中执行 git 命令，返回标准输出"""
+    return _run_git
+
+
+@pytest.fixture
+def make_git_repo(tmp_path):
+    """创建带提交记录的临时 Git 仓库
+
+    用法：make_git_repo("repo-a", [("feat: 新功能", "2026-01-10T10:00:00+08:00"), ...])
+    """
+
+    def _make(name, commits, author="test", email="test@example.com"):
+        repo = tmp_path / name
+        repo.mkdir()
+        _run_git(repo, "init", "-q", "-b", "main")
+        _run_git(repo, "config", "user.name", author)
+        _run_git(repo, "config", "user.email", email)
+        for message, when in commits:
+            _commit(repo, message, when)
+        return repo
+
+    return _make
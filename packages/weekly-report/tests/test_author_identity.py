@@ -0,0 +1,154 @@
+"""author_identity 模块测试"""
+
+import os
+from datetime import date
+from pathlib import Path
+
+from src import author_identity
+from src.author_identity import (
+    AuthorIdentityResolver,
+    get_identity_resolver,
+    parse_config_origins,
+    parse_mailmap,
+    resolve_mailmap_aliases,
+)
+from src.git_analyzer import get_all_commits_from_repos
+
+
+MAILMAP = """
+# 注释行
+张三 <zhangsan@example.com> <san.zhang@old-corp.com>
+<zhangsan@example.com> San Zhang <zs@laptop.local>
+Li Si <lisi@example.com>
+"""
+
+
+class TestParseMailmap:
+    """parse_mailmap 函数测试"""
+
+    def test_parse_all_forms(self):
+        """测试解析各种映射写法并忽略注释"""
+        entries = parse_mailmap(MAILMAP)
+
+        assert [(e.proper_name, e.proper_email, e.commit_name, e.commit_email) for e in entries] == [
+            ("张三", "zhangsan@example.com", None, "san.zhang@old-corp.com"),
+            (None, "zhangsan@example.com", "San Zhang", "zs@laptop.local"),
+            ("Li Si", None, None, "lisi@example.com"),
+        ]
+
+    def test_aliases_for_canonical_identity(self):
+        """测试收集映射到本人规范邮箱的旧邮箱和作者名"""
+        aliases = resolve_mailmap_aliases("张三", "zhangsan@example.com", parse_mailmap(MAILMAP))
+
+        assert aliases == ("san.zhang@old-corp.com", "zs@laptop.local", "San Zhang")
+
+    def test_aliases_from_old_identity(self):
+        """测试配置中仍是旧邮箱时，也能找到规范身份及其他别名"""
+        aliases = resolve_mailmap_aliases("张三", "SAN.ZHANG@old-corp.com", parse_mailmap(MAILMAP))
+
+        assert "zhangsan@example.com" in aliases
+        assert "zs@laptop.local" in aliases
+
+
+class TestAuthorIdentityResolver:
+    """AuthorIdentityResolver 测试"""
+
+    def test_cached_until_config_changes(self, make_git_repo, git_cmd, tmp_path):
+        """测试配置文件未变化时复用缓存，修改后重新解析"""
+        repo = make_git_repo("repo", [], author="张三", email="zhangsan@example.com")
+        cache_path = tmp_path / "cache" / "identity.json"
+
+        identity = AuthorIdentityResolver(cache_path).resolve(repo)
+        assert (identity.name, identity.email) == ("张三", "zhangsan@example.com")
+
+        # 新实例从磁盘加载缓存，无需执行 git config
+        assert AuthorIdentityResolver(cache_path).get_cached(repo) == identity
+
+        git_cmd(repo, "config", "user.email", "zs@example.com")
+        config = repo / ".git" / "config"
+        stat = config.stat()
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        resolver = AuthorIdentityResolver(cache_path)
+        assert resolver.get_cached(repo) is None
+        assert resolver.resolve(repo).email == "zs@example.com"
+
+    def test_mailmap_change_invalidates_cache(self, make_git_repo, tmp_path):
+        """测试新增 .mailmap 后缓存失效并带上别名"""
+        repo = make_git_repo("repo", [], author="张三", email="zhangsan@example.com")
+        resolver = AuthorIdentityResolver(tmp_path / "identity.json")
+        assert resolver.resolve(repo).aliases == ()
+
+        (repo / ".mailmap").write_text(MAILMAP, encoding="utf-8")
+
+        assert resolver.get_cached(repo) is None
+        assert "san.zhang@old-corp.com" in resolver.resolve(repo).aliases
+
+
+    def test_included_config_change_invalidates_cache(self, make_git_repo, git_cmd, tmp_path):
+        """测试通过 include.path 引入的配置文件修改后缓存失效"""
+        repo = make_git_repo("repo", [], author="张三", email="zhangsan@example.com")
+        included = tmp_path / "identity.gitconfig"
+        included.write_text("[user]\n\tname = 李四\n", encoding="utf-8")
+        git_cmd(repo, "config", "--unset", "user.name")
+        git_cmd(repo, "config", "include.path", str(included))
+
+        cache_path = tmp_path / "cache" / "identity.json"
+        assert AuthorIdentityResolver(cache_path).resolve(repo).name == "李四"
+
+        included.write_text("[user]\n\tname = 王五\n", encoding="utf-8")
+        stat = included.stat()
+        os.utime(included, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        resolver = AuthorIdentityResolver(cache_path)
+        assert resolver.get_cached(repo) is None
+        assert resolver.resolve(repo).name == "王五"
+
+    def test_parse_config_origins(self, tmp_path):
+        """测试提取配置项来源文件与 include 目标（相对路径以引入文件所在目录为基准）"""
+        output = (
+            b"file:.git/config\0include.path\n../shared.gitconfig\0"
+            b"file:/etc/gitconfig\0includeif.gitdir:~/work/.path\n/etc/work.gitconfig\0"
+            b"command line:\0user.name\nX\0"
+        )
+        assert parse_config_origins(output, tmp_path) == [
+            tmp_path / ".git" / "config",
+            tmp_path / ".git" / ".." / "shared.gitconfig",
+            Path("/etc/gitconfig"),
+            Path("/etc/work.gitconfig"),
+        ]
+
+    def test_default_resolver_created_once(self, monkeypatch):
+        """测试并发获取默认解析器时只创建一个实例"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.setattr(author_identity, "_default_resolver", None)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            resolvers = list(executor.map(lambda _: get_identity_resolver(), range(32)))
+        assert len({id(resolver) for resolver in resolvers}) == 1
+
+
+class TestAutoAuthor:
+    """未指定作者时按身份自动过滤"""
+
+    def test_name_or_email_and_mailmap_alias(self, make_git_repo, git_cmd, git_commit):
+        """测试 (name|email) 模式生效，且 .mailmap 中的旧邮箱提交不会遗漏"""
+        repo = make_git_repo(
+            "repo",
+            [("feat: 本人功能", "2026-01-10T10:00:00+08:00")],
+            author="张三",
+            email="zhangsan@example.com",
+        )
+        git_cmd(repo, "config", "user.name", "San Zhang")
+        git_cmd(repo, "config", "user.email", "zs@laptop.local")
+        git_commit(repo, "fix: 旧邮箱提交", "2026-01-09T10:00:00+08:00")
+        git_cmd(repo, "config", "user.name", "王五")
+        git_cmd(repo, "config", "user.email", "wangwu@example.com")
+        git_commit(repo, "feat: 他人功能", "2026-01-08T10:00:00+08:00")
+        git_cmd(repo, "config", "user.name", "张三")
+        git_cmd(repo, "config", "user.email", "zhangsan@example.com")
+        (repo / ".mailmap").write_text(MAILMAP, encoding="utf-8")
+
+        result = get_all_commits_from_repos([repo], date(2026, 1, 5), date(2026, 1, 11))
+
+        assert sorted(c["message"] for c in result["repo"]) == ["feat: 本人功能", "fix: 旧邮箱提交"]
@@ -0,0 +1,103 @@
+"""cjk_segmenter 模块测试"""
+
+import marshal
+
+from src.cjk_segmenter import (
+    DICT_FORMAT_VERSION,
+    CJKSegmenter,
+    build_trie,
+    load_dictionary,
+    read_dictionary_words,
+)
+
+
+def make_segmenter(tmp_path, words):
+    source = tmp_path / "dict.txt"
+    source.write_text("# 测试词典\n" + "\n".join(words) + "\n", encoding="utf-8")
+    return CJKSegmenter(dict_path=source, cache_path=tmp_path / "dict.bin")
+
+
+class TestDictionary:
+    """词典读取与编译测试"""
+
+    def test_read_words(self, tmp_path):
+        """测试忽略注释、空行和单字词"""
+        source = tmp_path / "dict.txt"
+        source.write_text("# 注释\n用户 登录  # 行尾注释\n\n的\n接口\n", encoding="utf-8")
+        assert read_dictionary_words(source) == ["用户", "登录", "接口"]
+
+    def test_build_trie(self):
+        """测试字典树结构"""
+        trie = build_trie(["用户", "用户名"])
+        assert "" in trie["用"]["户"]
+        assert "" in trie["用"]["户"]["名"]
+        assert "" not in trie["用"]
+
+    def test_compiled_cache_reused(self, tmp_path):
+        """测试源文件未变化时直接加载编译结果"""
+        source = tmp_path / "dict.txt"
+        source.write_text("用户 登录\n", encoding="utf-8")
+        cache_path = tmp_path / "dict.bin"
+
+        trie = load_dictionary(source, cache_path)
+        assert cache_path.exists()
+
+        # 篡改编译结果中的字典树：签名一致时应原样加载
+        version, signature, _ = marshal.loads(cache_path.read_bytes())
+        cache_path.write_bytes(marshal.dumps((version, signature, {"缓": {"存": {"": True}}})))
+        assert load_dictionary(source, cache_path) == {"缓": {"存": {"": True}}}
+
+        # 源文件变化后重新编译
+        source.write_text("用户 登录 接口\n", encoding="utf-8")
+        reloaded = load_dictionary(source, cache_path)
+        assert reloaded != trie
+        assert "" in reloaded["接"]["口"]
+
+    def test_corrupted_cache_recompiled(self, tmp_path):
+        """测试损坏或版本不符的编译结果被重新生成"""
+        source = tmp_path / "dict.txt"
+        source.write_text("用户\n", encoding="utf-8")
+        cache_path = tmp_path / "dict.bin"
+
+        cache_path.write_bytes(b"not marshal")
+        assert load_dictionary(source, cache_path) == build_trie(["用户"])
+
+        cache_path.write_bytes(marshal.dumps((DICT_FORMAT_VERSION + 1, None, {})))
+        assert load_dictionary(source, cache_path) == build_trie(["用户"])
+
+    def test_dictionary_loaded_lazily(self, tmp_path):
+        """测试首次分词时才加载词典"""
+        segmenter = make_segmenter(tmp_path, ["用户"])
+        assert not (tmp_path / "dict.bin").exists()
+        segmenter.segment("用户")
+        assert (tmp_path / "dict.bin").exists()
+
+
+class TestSegment:
+    """segment 方法测试"""
+
+    def test_maximum_matching(self, tmp_path):
+        """测试正向最大匹配优先取最长的词"""
+        segmenter = make_segmenter(tmp_path, ["用户", "用户名", "登录"])
+        assert segmenter.segment("用户名登录") == ["用户名", "登录"]
+        assert segmenter.segment("用户登录") == ["用户", "登录"]
+
+    def test_bigram_fallback(self, tmp_path):
+        """测试未收录片段按二元组切分"""
+        segmenter = make_segmenter(tmp_path, ["接口"])
+        assert segmenter.segment("甲乙丙丁接口") == ["甲乙", "丙丁", "接口"]
+        assert segmenter.segment("甲乙丙丁戊") == ["甲乙", "丙丁戊"]
+        assert segmenter.segment("甲乙丙") == ["甲乙丙"]
+
+    def test_separators_and_single_chars(self, tmp_path):
+        """测试虚词断开未收录片段，单个汉字被丢弃"""
+        segmenter = make_segmenter(tmp_path, ["接口", "联调"])
+        assert segmenter.segment("接口和联调") == ["接口", "联调"]
+        assert segmenter.segment("甲乙的丙丁") == ["甲乙", "丙丁"]
+        assert segmenter.segment("甲接口") == ["接口"]
+
+    def test_builtin_dictionary(self, tmp_path):
+        """测试内置词典切分常见提交描述"""
+        segmenter = CJKSegmenter(cache_path=tmp_path / "dict.bin")
+        assert segmenter.segment("用户登录系统开发") == ["用户", "登录", "系统", "开发"]
+        assert segmenter.segment("接口对接和联调") == ["接口", "对接", "联调"]
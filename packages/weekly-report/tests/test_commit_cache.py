@@ -0,0 +1,150 @@
+"""commit_cache 模块测试"""
+
+from datetime import date
+
+from src.commit_cache import (
+    get_cache_path,
+    get_cached_commits,
+    load_repo_cache,
+)
+from src.git_analyzer import get_all_commits_from_repos, get_commits
+
+
+START = date(2026, 1, 5)
+END = date(2026, 1, 11)
+
+
+class TestGetCachedCommits:
+    """get_cached_commits 函数测试"""
+
+    def test_matches_get_commits(self, make_git_repo, tmp_path):
+        """测试缓存结果与直接读取 git log 一致"""
+        repo = make_git_repo("repo", [
+            ("feat: 窗口前的提交", "2026-01-01T10:00:00+08:00"),
+            ("feat: 功能一", "2026-01-06T10:00:00+08:00"),
+            ("fix: 问题一", "2026-01-08T10:00:00+08:00"),
+        ])
+        base_dir = tmp_path / "reports"
+
+        result = get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        assert result == get_commits(repo, START, END)
+        assert get_cache_path(repo, base_dir).exists()
+
+    def test_incremental_sync(self, make_git_repo, git_commit, tmp_path):
+        """测试新增提交被增量同步"""
+        repo = make_git_repo("repo", [("feat: 功能一", "2026-01-06T10:00:00+08:00")])
+        base_dir = tmp_path / "reports"
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        head = git_commit(repo, "feat: 功能二", "2026-01-07T10:00:00+08:00")
+        result = get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        assert [c["message"] for c in result] == ["feat: 功能二", "feat: 功能一"]
+        assert head in load_repo_cache(repo, base_dir)["tips"]
+
+    def test_rewritten_commits_removed(self, make_git_repo, git_cmd, tmp_path):
+        """测试改写历史后不可达的提交被移除"""
+        repo = make_git_repo("repo", [
+            ("feat: 功能一", "2026-01-06T10:00:00+08:00"),
+            ("feat: 待改写", "2026-01-07T10:00:00+08:00"),
+        ])
+        base_dir = tmp_path / "reports"
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        git_cmd(
+            repo, "commit", "-q", "--amend", "-m", "feat: 已改写",
+            env={"GIT_COMMITTER_DATE": "2026-01-07T11:00:00+08:00"},
+        )
+        result = get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        assert sorted(c["message"] for c in result) == ["feat: 功能一", "feat: 已改写"]
+
+    def test_earlier_window_rebuilds(self, make_git_repo, tmp_path):
+        """测试请求更早的时间范围时重新遍历历史"""
+        repo = make_git_repo("repo", [
+            ("feat: 上周功能", "2025-12-30T10:00:00+08:00"),
+            ("feat: 本周功能", "2026-01-06T10:00:00+08:00"),
+        ])
+        base_dir = tmp_path / "reports"
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        result = get_cached_commits(repo, date(2025, 12, 29), END, base_dir=base_dir)
+
+        assert len(result) == 2
+
+    def test_author_filter(self, make_git_repo, tmp_path):
+        """测试按作者过滤"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-06T10:00:00+08:00")])
+        base_dir = tmp_path / "reports"
+
+        assert len(get_cached_commits(repo, START, END, "(test|x@y)", base_dir)) == 1
+        assert get_cached_commits(repo, START, END, "someone-else", base_dir) == []
+
+    def test_first_sync_includes_start_day_morning(self, make_git_repo, tmp_path):
+        """测试首次同步包含起始日凌晨的提交（git 会把裸日期解析为当天的当前时刻）"""
+        repo = make_git_repo("repo", [
+            ("feat: 起始日凌晨", "2026-01-05T00:00:01"),
+            ("fix: 结束日深夜", "2026-01-11T23:30:00"),
+            ("docs: 次日凌晨", "2026-01-12T01:00:00"),
+        ])
+        base_dir = tmp_path / "reports"
+
+        result = get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        assert sorted(c["message"] for c in result) == ["feat: 起始日凌晨", "fix: 结束日深夜"]
+        assert result == get_commits(repo, START, END)
+
+    def test_seen_hashes_skipped(self, make_git_repo, tmp_path):
+        """测试共享 hash 集合时跳过已采集的提交"""
+        repo = make_git_repo("repo", [
+            ("feat: 功能", "2026-01-06T10:00:00+08:00"),
+            ("fix: 修复", "2026-01-07T10:00:00+08:00"),
+        ])
+        base_dir = tmp_path / "reports"
+        first = get_cached_commits(repo, START, END, base_dir=base_dir)
+
+        seen = {first[0]["hash"]}
+        result = get_cached_commits(repo, START, END, base_dir=base_dir, seen=seen)
+
+        assert [c["hash"] for c in result] == [first[1]["hash"]]
+        assert seen == {c["hash"] for c in first}
+
+    def test_memo_persisted(self, make_git_repo, tmp_path):
+        """测试分类备忘表随缓存持久化"""
+        repo = make_git_repo("repo", [("feat: 持久化的标题", "2026-01-06T10:00:00+08:00")])
+        base_dir = tmp_path / "reports"
+
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+        memo = load_repo_cache(repo, base_dir)["memo"]
+
+        assert memo["entries"]["feat: 持久化的标题"]["type"] == "feat"
+
+    def test_memo_pruned_to_cached_subjects(self, make_git_repo, git_commit, tmp_path):
+        """测试保存时备忘表只保留缓存中仍存在的提交标题"""
+        from src.commit_cache import save_repo_cache
+
+        repo = make_git_repo("repo", [("feat: 第一个标题", "2026-01-06T10:00:00+08:00")])
+        base_dir = tmp_path / "reports"
+
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+        cache = load_repo_cache(repo, base_dir)
+        cache["memo"]["entries"]["fix: 早已不存在的标题"] = {"type": "fix"}
+        save_repo_cache(repo, cache, base_dir)
+
+        git_commit(repo, "fix: 第二个标题", "2026-01-07T10:00:00+08:00", "second.txt")
+        get_cached_commits(repo, START, END, base_dir=base_dir)
+        entries = load_repo_cache(repo, base_dir)["memo"]["entries"]
+
+        assert set(entries) == {"feat: 第一个标题", "fix: 第二个标题"}
+
+    def test_use_cache_in_multi_repo(self, make_git_repo, tmp_path):
+        """测试多仓库采集启用缓存"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-06T10:00:00+08:00")])
+
+        result = get_all_commits_from_repos(
+            [repo], START, END, author="test",
+            use_cache=True, cache_base_dir=tmp_path / "reports",
+        )
+
+        assert result == get_all_commits_from_repos([repo], START, END, author="test")
@@ -0,0 +1,143 @@
+"""commit_index 模块测试"""
+
+from datetime import date
+
+from src import git_analyzer
+from src.commit_index import query_commits, sync_index
+from src.git_analyzer import TRIVIAL_PATTERNS, CommitClassifier, get_all_commits_from_repos
+
+
+START = date(2026, 1, 5)
+END = date(2026, 1, 11)
+
+
+class TestCommitIndex:
+    """sync_index / query_commits 函数测试"""
+
+    def test_query_matches_git(self, make_git_repo, tmp_path):
+        """测试索引查询结果与直接读取 git log 一致"""
+        repos = [
+            make_git_repo("repo-a", [
+                ("feat: 功能一", "2026-01-06T10:00:00+08:00"),
+                ("fix typo", "2026-01-07T10:00:00+08:00"),
+            ]),
+            make_git_repo("repo-b", [
+                ("docs: 窗口外", "2025-12-01T10:00:00+08:00"),
+                ("perf: 优化", "2026-01-09T10:00:00+08:00"),
+            ]),
+        ]
+        db_path = tmp_path / "index.sqlite3"
+
+        stats = sync_index(repos, db_path)
+        result = get_all_commits_from_repos(
+            repos, START, END, author="test", index_path=db_path
+        )
+
+        assert stats == {"repo-a": 2, "repo-b": 2}
+        assert result == get_all_commits_from_repos(repos, START, END, author="test")
+
+    def test_day_boundaries_match_git_and_cache(self, make_git_repo, tmp_path):
+        """测试 git、提交缓存和索引三条路径对日期边界的处理一致"""
+        repo = make_git_repo("repo", [
+            ("docs: 起始日前一刻", "2026-01-04T23:59:59"),
+            ("feat: 起始日凌晨", "2026-01-05T00:00:00"),
+            ("fix: 结束日深夜", "2026-01-11T23:59:59"),
+            ("docs: 次日零点", "2026-01-12T00:00:00"),
+        ])
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([repo], db_path)
+
+        via_git = get_all_commits_from_repos([repo], START, END, author="test")
+        via_cache = get_all_commits_from_repos(
+            [repo], START, END, author="test", use_cache=True, cache_base_dir=tmp_path
+        )
+        via_index = get_all_commits_from_repos(
+            [repo], START, END, author="test", index_path=db_path
+        )
+
+        assert [c["message"] for c in via_git["repo"]] == ["fix: 结束日深夜", "feat: 起始日凌晨"]
+        assert via_cache == via_git
+        assert via_index == via_git
+
+    def test_incremental_sync(self, make_git_repo, git_commit, tmp_path):
+        """测试再次同步只写入新增提交"""
+        repo = make_git_repo("repo", [("feat: 功能一", "2026-01-06T10:00:00+08:00")])
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([repo], db_path)
+
+        assert sync_index([repo], db_path) == {"repo": 0}
+
+        git_commit(repo, "feat: 功能二", "2026-01-07T10:00:00+08:00")
+        assert sync_index([repo], db_path) == {"repo": 1}
+        assert len(query_commits([repo], START, END, db_path=db_path)["repo"]) == 2
+
+    def test_author_filter(self, make_git_repo, tmp_path):
+        """测试按作者模式过滤"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-06T10:00:00+08:00")])
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([repo], db_path)
+
+        assert query_commits([repo], START, END, "(test|x@y)", db_path)
+        assert query_commits([repo], START, END, "someone-else", db_path) == {}
+
+    def test_auto_identity_matches_literal_values(self, make_git_repo, git_cmd, git_commit, tmp_path):
+        """测试自动解析的身份按作者名/邮箱字面值精确匹配（含 .mailmap 别名），不做子串匹配"""
+        repo = make_git_repo("repo", [("feat: 本人功能", "2026-01-06T10:00:00+08:00")])
+        (repo / ".mailmap").write_text("test <test@example.com> <old@example.com>\n", encoding="utf-8")
+        git_cmd(repo, "config", "user.email", "old@example.com")
+        git_commit(repo, "fix: 旧邮箱修复", "2026-01-07T10:00:00+08:00")
+        git_cmd(repo, "config", "user.name", "testing")
+        git_cmd(repo, "config", "user.email", "testing@example.com")
+        git_commit(repo, "docs: 他人文档", "2026-01-08T10:00:00+08:00")
+        git_cmd(repo, "config", "user.name", "test")
+        git_cmd(repo, "config", "user.email", "test@example.com")
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([repo], db_path)
+
+        result = query_commits([repo], START, END, db_path=db_path)
+
+        assert [c["message"] for c in result["repo"]] == ["fix: 旧邮箱修复", "feat: 本人功能"]
+
+    def test_unindexed_repo_falls_back_to_git(self, make_git_repo, git_cmd, tmp_path):
+        """测试未同步进索引的仓库回退为 git 采集，并按仓库顺序去重"""
+        upstream = make_git_repo("upstream", [("feat: 上游功能", "2026-01-06T10:00:00+08:00")])
+        git_cmd(tmp_path, "clone", "-q", str(upstream), "fork")
+        other = make_git_repo("other", [("fix: 新仓库修复", "2026-01-07T10:00:00+08:00")])
+        repos = [tmp_path / "fork", upstream, other]
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([upstream], db_path)
+
+        result = get_all_commits_from_repos(
+            repos, START, END, author="test", index_path=db_path
+        )
+
+        assert result == get_all_commits_from_repos(repos, START, END, author="test")
+        assert list(result) == ["fork", "other"]
+
+    def test_seen_hashes_skipped(self, make_git_repo, tmp_path):
+        """测试共享 hash 集合时跳过已采集的行，全部重复的仓库不出现在结果中"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-06T10:00:00+08:00")])
+        db_path = tmp_path / "index.db"
+        sync_index([repo], db_path)
+        commit_hash = query_commits([repo], START, END, db_path=db_path)["repo"][0]["hash"]
+
+        assert query_commits([repo], START, END, db_path=db_path, seen={commit_hash}) == {}
+
+        seen = set()
+        assert len(query_commits([repo], START, END, db_path=db_path, seen=seen)["repo"]) == 1
+        assert seen == {commit_hash}
+
+    def test_reclassify_when_rules_change(self, make_git_repo, tmp_path, monkeypatch):
+        """测试分类规则变化后，已索引提交按新规则重新分类"""
+        repo = make_git_repo("repo", [("feat: 临时调试入口", "2026-01-06T10:00:00+08:00")])
+        db_path = tmp_path / "index.sqlite3"
+        sync_index([repo], db_path)
+
+        commit = query_commits([repo], START, END, db_path=db_path)["repo"][0]
+        assert (commit["type"], commit["is_trivial"]) == ("feat", False)
+
+        classifier = CommitClassifier(trivial_patterns=TRIVIAL_PATTERNS + [r"^feat: 临时"])
+        monkeypatch.setattr(git_analyzer, "_default_classifier", classifier)
+
+        commit = query_commits([repo], START, END, db_path=db_path)["repo"][0]
+        assert commit["is_trivial"] is True
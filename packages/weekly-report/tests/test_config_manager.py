@@ -0,0 +1,154 @@
+"""config_manager 模块测试"""
+
+import json
+from datetime import date
+
+from src import git_analyzer
+from src.commit_index import get_index_path
+from src.config_manager import (
+    DEFAULT_CONFIG,
+    get_collection_options,
+    get_default_author,
+    get_max_workers,
+    get_repo_layouts,
+    get_report_options,
+    get_team_members,
+    load_config,
+)
+
+
+class TestGetMaxWorkers:
+    """get_max_workers 函数测试"""
+
+    def test_default(self):
+        """测试未配置时使用默认值"""
+        assert get_max_workers({}) == DEFAULT_CONFIG["max_workers"]
+
+    def test_configured_value(self):
+        """测试读取配置值（支持数字字符串）"""
+        assert get_max_workers({"max_workers": 3}) == 3
+        assert get_max_workers({"max_workers": "2"}) == 2
+
+    def test_invalid_value_falls_back_to_default(self):
+        """测试非法值回退为默认值"""
+        assert get_max_workers({"max_workers": "many"}) == DEFAULT_CONFIG["max_workers"]
+        assert get_max_workers({"max_workers": None}) == DEFAULT_CONFIG["max_workers"]
+        assert get_max_workers({"max_workers": [4]}) == DEFAULT_CONFIG["max_workers"]
+
+    def test_values_below_one_clamped(self):
+        """测试小于 1 的值按 1（串行）处理"""
+        assert get_max_workers({"max_workers": 0}) == 1
+        assert get_max_workers({"max_workers": -5}) == 1
+
+    def test_collection_uses_configured_workers(self, config_path, monkeypatch, tmp_path):
+        """测试调用方未指定并发数时，采集使用 config.json 中的 max_workers"""
+        config_path.write_text(json.dumps({"max_workers": 3}), encoding="utf-8")
+        assert load_config()["max_workers"] == 3
+
+        used = []
+
+        def fake_collect(paths, start, end, author, max_workers, *args):
+            used.append(max_workers)
+            return {}
+
+        monkeypatch.setattr(git_analyzer, "_collect_all_repos", fake_collect)
+        monkeypatch.setattr(git_analyzer, "is_git_repo", lambda path: True)
+
+        git_analyzer.get_all_commits_from_repos([tmp_path], date(2026, 1, 5), date(2026, 1, 11))
+        git_analyzer.get_all_commits_from_repos(
+            [tmp_path], date(2026, 1, 5), date(2026, 1, 11), max_workers=1
+        )
+
+        assert used == [3, 1]
+
+
+class TestConfigOptions:
+    """配置到采集/报告参数的映射测试"""
+
+    def test_default_options(self):
+        """测试默认配置映射为各函数的默认行为"""
+        assert get_collection_options(DEFAULT_CONFIG) == {
+            "max_workers": DEFAULT_CONFIG["max_workers"],
+            "use_cache": False,
+            "index_path": None,
+            "skip_idle": False,
+            "dedupe_patches": False,
+            "with_stats": False,
+            "include_submodules": False,
+            "repo_layouts": None,
+        }
+        assert get_report_options(DEFAULT_CONFIG) == {"merge_mode": "keywords", "link_features": False}
+        assert get_default_author(DEFAULT_CONFIG) is None
+
+    def test_enabled_options(self):
+        """测试开启各配置项"""
+        config = {
+            **DEFAULT_CONFIG,
+            "max_workers": 2,
+            "use_cache": True,
+            "use_index": True,
+            "skip_idle_repos": True,
+            "dedupe_patches": True,
+            "with_stats": True,
+            "include_submodules": True,
+            "merge_mode": "minhash",
+            "link_features": True,
+            "default_author": "张三",
+        }
+
+        assert get_collection_options(config) == {
+            "max_workers": 2,
+            "use_cache": True,
+            "index_path": get_index_path(),
+            "skip_idle": True,
+            "dedupe_patches": True,
+            "with_stats": True,
+            "include_submodules": True,
+            "repo_layouts": None,
+        }
+        assert get_report_options(config) == {"merge_mode": "minhash", "link_features": True}
+        assert get_default_author(config) == "张三"
+
+    def test_invalid_merge_mode_falls_back(self):
+        """测试不支持的合并方式回退为默认值"""
+        assert get_report_options({"merge_mode": "fuzzy"})["merge_mode"] == "keywords"
+
+
+class TestGetTeamMembers:
+    """get_team_members 函数测试"""
+
+    def test_string_identity_becomes_list(self):
+        """测试单个字符串视为只有一个身份，列表原样保留"""
+        config = {"team_members": {
+            "张三": "zhangsan@example.com",
+            "李四": ["lisi@example.com", "Li Si"],
+        }}
+        assert get_team_members(config) == {
+            "张三": ["zhangsan@example.com"],
+            "李四": ["lisi@example.com", "Li Si"],
+        }
+
+    def test_missing_members(self):
+        """测试未配置或为 null 时返回空字典"""
+        assert get_team_members({}) == {}
+        assert get_team_members({"team_members": None}) == {}
+
+
+class TestGetRepoLayouts:
+    """get_repo_layouts 函数测试"""
+
+    def test_only_repos_with_layout(self, tmp_path):
+        """测试只返回配置了 projects/pathspecs 的仓库，键与 get_repo_paths 一致"""
+        config = {"repos": [
+            {"name": "plain", "path": str(tmp_path / "plain")},
+            {"name": "mono", "path": str(tmp_path / "mono"),
+             "projects": {"packages/web": "web"}},
+            {"name": "docs", "path": str(tmp_path / "docs"), "pathspecs": ["docs"]},
+            {"name": "empty", "path": str(tmp_path / "empty"), "projects": {}, "pathspecs": []},
+        ]}
+
+        assert get_repo_layouts(config) == {
+            tmp_path / "mono": {"projects": {"packages/web": "web"}, "pathspecs": []},
+            tmp_path / "docs": {"projects": {}, "pathspecs": ["docs"]},
+        }
+        assert get_collection_options(config)["repo_layouts"] == get_repo_layouts(config)
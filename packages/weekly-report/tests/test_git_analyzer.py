@@ -1,8 +1,29 @@
 """git_analyzer 模块测试"""
 
+import asyncio
+from datetime import date
+
 import pytest
 from src.git_analyzer import (
+    Commit,
+    CommitClassifier,
+    CommitTable,
+    PathPrefixTrie,
+    build_commit_record,
+    group_commits_by_project,
     parse_commit_message,
+    get_all_commits_from_repos,
+    get_all_commits_from_repos_async,
+    get_team_commits_from_repos,
+    get_commits,
+    get_patch_ids,
+    is_git_repo,
+    resolve_common_git_dir,
+    iter_commits,
+    iter_merged_commits,
+    merge_commits_from_repos,
+    parse_log_records,
+    parse_numstat,
     COMMIT_TYPE_CONFIG,
     TRIVIAL_PATTERNS,
 )
@@ -93,6 +114,175 @@ class TestParseCommitMessage:
         assert result["is_trivial"] is True
 
 
+class TestCommitClassifier:
+    """CommitClassifier 测试"""
+
+    def test_classify_many_matches_parse(self):
+        """测试批量分类与逐条解析结果一致"""
+        messages = [
+            "feat(auth): 用户登录系统开发",
+            "fix typo in README",
+            "Merge pull request #12 from x/y",
+            "chore(deps): bump lodash",
+            "remove unused imports",
+            "更新用户界面",
+            "Feat: 大写类型",
+        ]
+
+        result = CommitClassifier().classify_many(messages)
+
+        assert result == [parse_commit_message(m) for m in messages]
+
+    def test_memo_counts_duplicates(self):
+        """测试重复标题只解析一次"""
+        classifier = CommitClassifier()
+
+        result = classifier.classify_many(["feat: 功能", "feat: 功能", "fix: 问题"])
+        result[0]["type"] = "mutated"
+
+        assert classifier.cache_info()["hits"] == 1
+        assert classifier.cache_info()["misses"] == 2
+        # 返回副本，修改结果不影响备忘表
+        assert classifier.classify("feat: 功能")["type"] == "feat"
+
+    def test_memo_lru_bound(self):
+        """测试备忘表按 LRU 淘汰"""
+        classifier = CommitClassifier(cache_size=2)
+        classifier.classify_many(["a", "b", "a", "c"])
+
+        assert classifier.cache_info()["size"] == 2
+        assert classifier.export_memo(["a", "b", "c"]).keys() == {"a", "c"}
+
+    def test_custom_patterns(self):
+        """测试自定义琐碎规则"""
+        classifier = CommitClassifier(trivial_patterns=[r"^release\s"])
+
+        assert classifier.classify("release v1.2.0")["is_trivial"] is True
+        assert classifier.classify("fix typo")["is_trivial"] is False
+
+
+class TestCommitRecord:
+    """Commit 记录类型测试"""
+
+    def test_dict_compatible(self):
+        """测试字典接口与原字典记录一致"""
+        commit = build_commit_record("abc", "feat(auth): 登录", "test", 1767664800, "repo")
+
+        assert commit["type"] == "feat"
+        assert commit.get("project") == "repo"
+        assert commit.get("details", []) == []
+        assert "hash" in commit and "details" not in commit
+        assert dict(commit) == {
+            "hash": "abc",
+            "message": "feat(auth): 登录",
+            "author": "test",
+            "date": "2026-01-06",
+            "type": "feat",
+            "is_trivial": False,
+            "is_highlight": True,
+            "is_challenge": False,
+            "priority": 1,
+            "project": "repo",
+            "timestamp": 1767664800,
+        }
+
+    def test_date_uses_china_timezone(self):
+        """测试日期按中国时区换算（UTC 前一天 20:00 属于次日）"""
+        commit = build_commit_record("abc", "fix: 问题", "test", "1767729600", "repo")
+
+        assert commit["date"] == "2026-01-07"
+        assert commit["timestamp"] == 1767729600
+
+    def test_extra_keys_and_copy(self):
+        """测试附加键与浅拷贝"""
+        commit = build_commit_record("abc", "fix: 问题", "test", 1767664800, "repo")
+        clone = commit.copy()
+        clone["details"] = ["细节"]
+        clone.setdefault("commit_count", 1)
+
+        assert isinstance(clone, Commit)
+        assert clone["details"] == ["细节"] and clone["commit_count"] == 1
+        assert "details" not in commit
+        assert len(clone) == len(commit) + 2
+
+    def test_no_instance_dict(self):
+        """测试使用 __slots__ 存储"""
+        commit = build_commit_record("abc", "fix: 问题", "test", 1767664800, "repo")
+
+        assert not hasattr(commit, "__dict__")
+
+
+class TestCommitTable:
+    """CommitTable 列式表测试"""
+
+    def test_filter_and_group(self, sample_commits, trivial_commits, single_commit):
+        """测试按列过滤琐碎提交与分组结果与逐条处理一致"""
+        commits = trivial_commits + sample_commits + [single_commit]
+        table = CommitTable.from_commits(commits)
+
+        grouped = group_commits_by_project(table.filter_trivial())
+
+        expected = group_commits_by_project(c for c in commits if not c["is_trivial"])
+        assert grouped == expected
+        assert list(grouped) == ["project-frontend", "project-backend"]
+
+    def test_sort_by_priority_is_stable(self, sample_commits):
+        """测试按优先级稳定排序"""
+        table = CommitTable.from_commits(reversed(sample_commits))
+
+        result = table.sort_by_priority().to_list()
+
+        expected = sorted(reversed(sample_commits), key=lambda c: c["priority"])
+        assert result == expected
+
+    def test_filter_date_range(self, sample_commits):
+        """测试按日期范围过滤（包含首尾）"""
+        table = CommitTable.from_commits(sample_commits)
+
+        result = table.filter_date_range(date(2026, 1, 8), date(2026, 1, 10))
+
+        assert sorted(c["hash"] for c in result) == ["abc123", "def456", "def457", "ghi789"]
+
+    def test_empty_table(self):
+        """测试空表"""
+        table = CommitTable.from_commits([])
+
+        assert len(table.filter_trivial()) == 0
+        assert table.group_by_project() == {}
+
+
+class TestMergeCommits:
+    """多仓库提交合并测试"""
+
+    def test_merge_by_timestamp(self):
+        """测试按作者时间戳多路归并，同日提交也按时间先后排列"""
+        commits_by_repo = {
+            "repo-a": [
+                build_commit_record("a2", "feat: 晚上", "test", 1767700800, "repo-a"),
+                build_commit_record("a1", "feat: 上午", "test", 1767664800, "repo-a"),
+            ],
+            "repo-b": [
+                build_commit_record("b1", "fix: 中午", "test", 1767675600, "repo-b"),
+            ],
+        }
+
+        merged = merge_commits_from_repos(commits_by_repo)
+
+        assert [c["hash"] for c in merged] == ["a2", "b1", "a1"]
+
+    def test_merge_plain_dicts(self):
+        """测试无时间戳的字典记录按日期合并，并补全 project 字段"""
+        commits_by_repo = {
+            "repo-a": [{"hash": "1", "date": "2026-01-05"}, {"hash": "2", "date": "2026-01-07"}],
+            "repo-b": [{"hash": "3", "date": "2026-01-06"}],
+        }
+
+        merged = list(iter_merged_commits(commits_by_repo))
+
+        assert [c["hash"] for c in merged] == ["2", "3", "1"]
+        assert merged[0]["project"] == "repo-a"
+
+
 class TestCommitTypeConfig:
     """COMMIT_TYPE_CONFIG 配置测试（无标签风格）"""
 
@@ -122,3 +312,492 @@ class TestCommitTypeConfig:
         """测试优先级值有效"""
         for type_name, config in COMMIT_TYPE_CONFIG.items():
             assert 1 <= config["priority"] <= 10, f"{type_name} 优先级无效"
+
+
+class TestGetAllCommitsFromRepos:
+    """get_all_commits_from_repos 函数测试"""
+
+    def test_parallel_matches_serial(self, make_git_repo, tmp_path):
+        """测试并发采集与串行采集结果一致且顺序确定"""
+        repos = [
+            make_git_repo(f"repo-{i}", [(f"feat: 功能{i}", "2026-01-10T10:00:00+08:00")])
+            for i in range(4)
+        ]
+        # 非 Git 目录应被跳过
+        (tmp_path / "not-a-repo").mkdir()
+        paths = [tmp_path / "not-a-repo"] + repos
+
+        serial = get_all_commits_from_repos(
+            paths, date(2026, 1, 5), date(2026, 1, 11), author="test"
+        )
+        parallel = get_all_commits_from_repos(
+            paths, date(2026, 1, 5), date(2026, 1, 11), author="test", max_workers=3
+        )
+
+        assert list(parallel.keys()) == ["repo-0", "repo-1", "repo-2", "repo-3"]
+        assert parallel == serial
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_dedupe_shared_commits(self, make_git_repo, git_cmd, git_commit, tmp_path, max_workers):
+        """测试共享对象的仓库按 hash 去重，归属首个仓库"""
+        upstream = make_git_repo("upstream", [("feat: 上游功能", "2026-01-06T10:00:00+08:00")])
+        git_cmd(tmp_path, "clone", "-q", str(upstream), "fork")
+        fork = tmp_path / "fork"
+        git_cmd(fork, "config", "user.name", "test")
+        git_cmd(fork, "config", "user.email", "test@example.com")
+        git_commit(fork, "feat: fork 功能", "2026-01-07T10:00:00+08:00")
+
+        result = get_all_commits_from_repos(
+            [upstream, fork], date(2026, 1, 5), date(2026, 1, 11),
+            author="test", max_workers=max_workers,
+        )
+        raw = get_all_commits_from_repos(
+            [upstream, fork], date(2026, 1, 5), date(2026, 1, 11),
+            author="test", dedupe=False,
+        )
+
+        assert [c["message"] for c in result["upstream"]] == ["feat: 上游功能"]
+        assert [c["message"] for c in result["fork"]] == ["feat: fork 功能"]
+        assert len(raw["fork"]) == 2
+
+    @pytest.mark.parametrize("use_cache", [False, True])
+    def test_parallel_builds_each_hash_once(
+        self, make_git_repo, git_cmd, tmp_path, monkeypatch, use_cache
+    ):
+        """测试并发采集时重复提交不构建记录，归属仍为首个仓库"""
+        from src import git_analyzer
+
+        upstream = make_git_repo("upstream", [("feat: 上游功能", "2026-01-06T10:00:00+08:00")])
+        clones = []
+        for name in ("clone-a", "clone-b"):
+            git_cmd(tmp_path, "clone", "-q", str(upstream), name)
+            clones.append(tmp_path / name)
+
+        built = []
+        original = git_analyzer.build_commit_record
+
+        def counting(commit_hash, *args):
+            built.append(commit_hash)
+            return original(commit_hash, *args)
+
+        monkeypatch.setattr(git_analyzer, "build_commit_record", counting)
+        result = get_all_commits_from_repos(
+            clones + [upstream], date(2026, 1, 5), date(2026, 1, 11), author="test",
+            max_workers=4, use_cache=use_cache, cache_base_dir=tmp_path / "cache",
+        )
+
+        assert list(result) == ["clone-a"]
+        assert len(built) == 1
+
+    def test_skip_idle_repos(self, make_git_repo):
+        """测试跳过空闲仓库并记录统计"""
+        active = make_git_repo("active", [("feat: 本周", "2026-01-06T10:00:00+08:00")])
+        idle = make_git_repo("idle", [("feat: 很久以前", "2025-06-01T10:00:00+08:00")])
+        stats = {}
+
+        result = get_all_commits_from_repos(
+            [active, idle], date(2026, 1, 5), date(2026, 1, 11),
+            author="test", skip_idle=True, stats=stats,
+        )
+
+        assert list(result) == ["active"]
+        assert stats == {"repos": 2, "skipped_idle": 1}
+
+    def test_end_date_inclusive(self, make_git_repo):
+        """测试结束日当天的提交被包含"""
+        repo = make_git_repo("repo", [("feat: 周日提交", "2026-01-11T23:00:00+08:00")])
+
+        result = get_all_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), author="test"
+        )
+
+        assert [c["message"] for c in result["repo"]] == ["feat: 周日提交"]
+
+
+class TestNumstat:
+    """--numstat 改动统计测试"""
+
+    def test_stats_in_single_pass(self, make_git_repo, git_commit):
+        """测试附带改动统计时提交记录与普通模式一致，并带有 stats"""
+        repo = make_git_repo("repo", [("feat: 初始化", "2026-01-06T10:00:00+08:00")])
+        git_commit(repo, "feat: 新增页面", "2026-01-07T10:00:00+08:00", "page.txt")
+        (repo / "bin.dat").write_bytes(b"\x00\x01")
+        git_commit(repo, "fix: 修复页面", "2026-01-08T10:00:00+08:00", "bin.dat")
+
+        plain = get_commits(repo, date(2026, 1, 5), date(2026, 1, 11), author="test")
+        with_stats = get_commits(
+            repo, date(2026, 1, 5), date(2026, 1, 11), author="test", with_stats=True
+        )
+
+        assert [c["hash"] for c in with_stats] == [c["hash"] for c in plain]
+        assert [c["stats"] for c in with_stats] == [
+            {"files": 1, "insertions": 0, "deletions": 0},  # 二进制文件
+            {"files": 1, "insertions": 1, "deletions": 0},
+            {"files": 1, "insertions": 1, "deletions": 0},
+        ]
+
+    def test_parse_numstat(self):
+        """测试二进制文件计入文件数但不计行数"""
+        stats = parse_numstat("\n3\t1\tsrc/a.py\n-\t-\tlogo.png\n")
+
+        assert stats == {"files": 2, "insertions": 3, "deletions": 1}
+
+
+class TestMonorepoAttribution:
+    """monorepo 子项目归属测试"""
+
+    def test_trie_longest_prefix(self):
+        """测试按路径分段的最长前缀匹配"""
+        trie = PathPrefixTrie({"": "mono", "packages/web": "web", "packages/web/admin": "admin"})
+
+        assert trie.lookup("packages/web/src/app.ts") == "web"
+        assert trie.lookup("packages/web/admin/index.ts") == "admin"
+        assert trie.lookup("packages/webapp/index.ts") == "mono"
+        assert trie.attribute(["packages/web/a", "packages/web/b", "README.md"], "repo") == "web"
+        assert PathPrefixTrie({"packages/api": "api"}).attribute(["docs/a.md"], "repo") == "repo"
+
+    def _make_monorepo(self, make_git_repo, git_commit):
+        repo = make_git_repo("mono", [])
+        git_commit(repo, "feat: 页面开发", "2026-01-06T10:00:00+08:00", "packages/web/app.ts")
+        git_commit(repo, "fix: 接口修复", "2026-01-07T10:00:00+08:00", "packages/api/server.py")
+        git_commit(repo, "docs: 文档更新", "2026-01-08T10:00:00+08:00", "docs/guide.md")
+        return repo
+
+    @pytest.mark.parametrize("with_stats", [False, True])
+    def test_attribute_commits(self, make_git_repo, git_commit, with_stats):
+        """测试按改动文件归属子项目，未命中前缀的提交归属仓库本身"""
+        repo = self._make_monorepo(make_git_repo, git_commit)
+        layouts = {repo: {"projects": {"packages/web": "web", "packages/api": "api"}}}
+
+        result = get_all_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), author="test",
+            with_stats=with_stats, repo_layouts=layouts,
+        )
+
+        assert [(c["message"], c["project"]) for c in result["mono"]] == [
+            ("docs: 文档更新", "mono"),
+            ("fix: 接口修复", "api"),
+            ("feat: 页面开发", "web"),
+        ]
+        assert list(group_commits_by_project(result["mono"])) == ["mono", "api", "web"]
+
+    def test_pathspecs_limit_history(self, make_git_repo, git_commit):
+        """测试 pathspecs 只遍历指定子目录"""
+        repo = self._make_monorepo(make_git_repo, git_commit)
+        layouts = {repo: {"pathspecs": ["packages"]}}
+
+        result = get_all_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), author="test", repo_layouts=layouts,
+        )
+
+        assert [c["message"] for c in result["mono"]] == ["fix: 接口修复", "feat: 页面开发"]
+
+
+class TestWorktreesAndSubmodules:
+    """worktree 与子模块发现测试"""
+
+    def test_worktrees_walked_once(self, make_git_repo, git_cmd, tmp_path):
+        """测试 .git 为文件的 worktree 被识别，且与主仓库只采集一次"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-10T10:00:00+08:00")])
+        worktree = tmp_path / "repo-wt"
+        git_cmd(repo, "worktree", "add", "-q", "-b", "wt", str(worktree))
+
+        assert (worktree / ".git").is_file()
+        assert is_git_repo(worktree)
+        assert resolve_common_git_dir(worktree) == resolve_common_git_dir(repo)
+
+        result = get_all_commits_from_repos(
+            [worktree, repo], date(2026, 1, 5), date(2026, 1, 11), author="test", dedupe=False
+        )
+
+        assert list(result) == ["repo-wt"]
+        assert [c["message"] for c in result["repo-wt"]] == ["feat: 功能"]
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_recurse_submodules(self, make_git_repo, git_cmd, tmp_path, max_workers):
+        """测试递归采集已检出的子模块"""
+        lib = make_git_repo("lib", [("feat: 公共库", "2026-01-09T10:00:00+08:00")])
+        app = make_git_repo("app", [("feat: 应用", "2026-01-10T10:00:00+08:00")])
+        git_cmd(app, "-c", "protocol.file.allow=always", "submodule", "add", "-q", str(lib), "vendor/lib")
+
+        assert (app / "vendor" / "lib" / ".git").is_file()
+
+        plain = get_all_commits_from_repos(
+            [app], date(2026, 1, 5), date(2026, 1, 11), author="test", max_workers=max_workers
+        )
+        result = get_all_commits_from_repos(
+            [app], date(2026, 1, 5), date(2026, 1, 11), author="test",
+            max_workers=max_workers, include_submodules=True, dedupe=False,
+        )
+
+        assert list(plain) == ["app"]
+        assert list(result) == ["app", "lib"]
+        assert [c["message"] for c in result["lib"]] == ["feat: 公共库"]
+
+
+class TestPatchIdDedupe:
+    """patch-id 去重测试"""
+
+    def _make_cherry_picked_repo(self, make_git_repo, git_cmd, git_commit):
+        repo = make_git_repo("repo", [("chore: 初始化", "2026-01-05T10:00:00+08:00")])
+        git_cmd(repo, "checkout", "-q", "-b", "feature")
+        picked = git_commit(repo, "feat: 登录功能", "2026-01-06T10:00:00+08:00", "login.txt")
+        git_cmd(repo, "checkout", "-q", "main")
+        git_commit(repo, "fix: 其他修复", "2026-01-07T10:00:00+08:00")
+        git_cmd(
+            repo, "cherry-pick", picked,
+            env={"GIT_COMMITTER_DATE": "2026-01-08T10:00:00+08:00"},
+        )
+        return repo, picked
+
+    def test_patch_ids_match_for_cherry_pick(self, make_git_repo, git_cmd, git_commit):
+        """测试 cherry-pick 前后的提交 patch-id 相同"""
+        repo, picked = self._make_cherry_picked_repo(make_git_repo, git_cmd, git_commit)
+        head, previous = git_cmd(repo, "rev-parse", "HEAD", "HEAD~1").split()
+
+        patch_ids = get_patch_ids(repo, [picked, head, previous])
+
+        assert head != picked
+        assert patch_ids[head] == patch_ids[picked]
+        assert len(set(patch_ids.values())) == 2
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_collapse_duplicates(self, make_git_repo, git_cmd, git_commit, max_workers):
+        """测试开启 dedupe_patches 后重复改动只保留一条"""
+        repo, _ = self._make_cherry_picked_repo(make_git_repo, git_cmd, git_commit)
+
+        plain = get_all_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), author="test"
+        )
+        deduped = get_all_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), author="test",
+            max_workers=max_workers, dedupe_patches=True,
+        )
+
+        messages = [c["message"] for c in deduped["repo"]]
+        assert [c["message"] for c in plain["repo"]].count("feat: 登录功能") == 2
+        assert messages.count("feat: 登录功能") == 1
+        assert len(messages) == len(plain["repo"]) - 1
+
+
+class TestTeamCommits:
+    """团队模式测试"""
+
+    def _make_team_repo(self, make_git_repo, git_cmd, git_commit, name):
+        repo = make_git_repo(name, [("feat: 张三的功能", "2026-01-10T10:00:00+08:00")],
+                             author="张三", email="zhangsan@example.com")
+        git_cmd(repo, "config", "user.name", "Li Si")
+        git_cmd(repo, "config", "user.email", "lisi@example.com")
+        git_commit(repo, "fix: 李四的修复", "2026-01-09T10:00:00+08:00")
+        git_cmd(repo, "config", "user.name", "王五")
+        git_cmd(repo, "config", "user.email", "wangwu@example.com")
+        git_commit(repo, "feat: 王五的功能", "2026-01-08T10:00:00+08:00")
+        return repo
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_matches_per_author_collection(
+        self, make_git_repo, git_cmd, git_commit, max_workers
+    ):
+        """测试单次遍历的分桶结果与逐个成员按作者采集一致"""
+        repos = [
+            self._make_team_repo(make_git_repo, git_cmd, git_commit, f"repo-{i}")
+            for i in range(2)
+        ]
+        members = {"张三": ["zhangsan@example.com"], "李四": ["LISI@example.com", "Li Si"]}
+
+        team = get_team_commits_from_repos(
+            repos, date(2026, 1, 5), date(2026, 1, 11), members, max_workers=max_workers
+        )
+
+        assert list(team) == ["张三", "李四"]
+        for member, author in [("张三", "zhangsan@example.com"), ("李四", "lisi@example.com")]:
+            expected = get_all_commits_from_repos(
+                repos, date(2026, 1, 5), date(2026, 1, 11), author=author
+            )
+            assert team[member] == expected
+
+    def test_bucket_by_email_without_members(self, make_git_repo, git_cmd, git_commit):
+        """测试未指定成员时按作者邮箱分桶"""
+        repo = self._make_team_repo(make_git_repo, git_cmd, git_commit, "repo")
+
+        team = get_team_commits_from_repos([repo], date(2026, 1, 5), date(2026, 1, 11))
+
+        assert sorted(team) == [
+            "lisi@example.com", "wangwu@example.com", "zhangsan@example.com",
+        ]
+        assert [c["message"] for c in team["wangwu@example.com"]["repo"]] == ["feat: 王五的功能"]
+
+    def test_bucket_uses_mailmap(self, make_git_repo, git_cmd, git_commit):
+        """测试按 .mailmap 映射后的身份分桶，旧邮箱的提交归入同一成员"""
+        repo = make_git_repo("repo", [("feat: 新邮箱的功能", "2026-01-10T10:00:00+08:00")],
+                             author="alice", email="a@x")
+        (repo / ".mailmap").write_text("alice <a@x> <old@x>\n", encoding="utf-8")
+        git_cmd(repo, "config", "user.email", "old@x")
+        git_commit(repo, "fix: 旧邮箱的修复", "2026-01-09T10:00:00+08:00")
+
+        team = get_team_commits_from_repos(
+            [repo], date(2026, 1, 5), date(2026, 1, 11), {"Alice": ["a@x"]}
+        )
+
+        assert sorted(c["message"] for c in team["Alice"]["repo"]) == [
+            "feat: 新邮箱的功能", "fix: 旧邮箱的修复",
+        ]
+
+
+class TestGetAllCommitsFromReposAsync:
+    """get_all_commits_from_repos_async 函数测试"""
+
+    def test_async_matches_sync(self, make_git_repo):
+        """测试异步采集结果与同步版本一致"""
+        repos = [
+            make_git_repo(f"repo-{i}", [(f"fix: 问题{i}", "2026-01-08T10:00:00+08:00")])
+            for i in range(3)
+        ]
+
+        expected = get_all_commits_from_repos(
+            repos, date(2026, 1, 5), date(2026, 1, 11), author="test"
+        )
+        result = asyncio.run(get_all_commits_from_repos_async(
+            repos, date(2026, 1, 5), date(2026, 1, 11), author="test", max_concurrency=2
+        ))
+
+        assert result == expected
+        assert list(result.keys()) == ["repo-0", "repo-1", "repo-2"]
+
+    def test_cancellation(self, make_git_repo):
+        """测试任务可被取消"""
+        repo = make_git_repo("repo", [("feat: 功能", "2026-01-08T10:00:00+08:00")])
+
+        async def run():
+            task = asyncio.ensure_future(get_all_commits_from_repos_async(
+                [repo], date(2026, 1, 5), date(2026, 1, 11), author="test"
+            ))
+            await asyncio.sleep(0)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+
+
+class TestIterCommits:
+    """iter_commits 函数测试"""
+
+    def test_matches_get_commits(self, make_git_repo):
+        """测试流式产出结果与 get_commits 一致"""
+        repo = make_git_repo("repo", [
+            ("feat: 功能一", "2026-01-06T10:00:00+08:00"),
+            ("fix typo", "2026-01-07T10:00:00+08:00"),
+        ])
+
+        streamed = iter_commits(repo, date(2026, 1, 5), date(2026, 1, 11))
+
+        assert not isinstance(streamed, list)
+        assert list(streamed) == get_commits(repo, date(2026, 1, 5), date(2026, 1, 11))
+
+    def test_early_close(self, make_git_repo):
+        """测试提前结束迭代时正常清理"""
+        repo = make_git_repo("repo", [
+            ("feat: 功能一", "2026-01-06T10:00:00+08:00"),
+            ("feat: 功能二", "2026-01-07T10:00:00+08:00"),
+        ])
+
+        stream = iter_commits(repo, date(2026, 1, 5), date(2026, 1, 11))
+        first = next(stream)
+        stream.close()
+
+        assert first["message"] == "feat: 功能二"
+
+    def test_missing_repo(self, tmp_path):
+        """测试仓库不存在时不产出记录"""
+        assert list(iter_commits(tmp_path / "missing", date(2026, 1, 5), date(2026, 1, 11))) == []
+
+
+class TestShardedCommits:
+    """get_commits 时间窗口分片测试"""
+
+    def test_sharded_matches_unsharded(self, make_git_repo):
+        """测试分片结果与不分片一致（含窗口边界与结束日当天）"""
+        pytest.importorskip("dateutil")
+        repo = make_git_repo("repo", [
+            ("feat: 一月", "2026-01-05T10:00:00"),
+            ("feat: 一月最后一刻", "2026-01-31T23:59:00"),
+            ("feat: 二月第一刻", "2026-02-01T00:00:00"),
+            ("fix: 三月", "2026-03-10T10:00:00"),
+            ("feat: 结束日", "2026-03-31T23:00:00"),
+        ])
+        start, end = date(2026, 1, 1), date(2026, 3, 31)
+
+        sharded = get_commits(repo, start, end, shard_months=1)
+
+        assert sharded == get_commits(repo, start, end)
+        assert len(sharded) == 5
+
+    @pytest.mark.parametrize("max_workers, repo_count, expected", [(8, 2, 4), (8, 3, 2), (2, 4, 1), (4, 1, 4), (1, 2, 1)])
+    def test_shard_workers_share_budget(
+        self, make_git_repo, monkeypatch, max_workers, repo_count, expected
+    ):
+        """测试多仓库分片读取时各仓库平分 max_workers，git 进程总数不超过预算"""
+        from src import git_analyzer
+
+        budgets = []
+
+        def fake_sharded(repo_path, start, end, author, shard_months, workers, *args):
+            budgets.append(workers)
+            return []
+
+        monkeypatch.setattr(git_analyzer, "_get_commit_fields_sharded", fake_sharded)
+        repos = [
+            make_git_repo(f"repo-{i}", [("feat: 功能", "2026-01-06T10:00:00")])
+            for i in range(repo_count)
+        ]
+
+        get_all_commits_from_repos(
+            repos, date(2026, 1, 1), date(2026, 3, 31), author="test",
+            max_workers=max_workers, shard_months=1,
+        )
+
+        assert budgets == [expected] * repo_count
+        assert expected * min(max_workers, repo_count) <= max_workers
+
+    def test_split_date_range(self):
+        """测试按月切分的窗口首尾相接"""
+        pytest.importorskip("dateutil")
+        from src.date_utils import split_date_range
+
+        windows = split_date_range(date(2025, 7, 13), date(2026, 1, 13))
+
+        assert windows[0] == (date(2025, 7, 13), date(2025, 8, 12))
+        assert windows[-1] == (date(2026, 1, 13), date(2026, 1, 13))
+        for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+            assert (next_start - prev_end).days == 1
+
+
+class TestParseLogBuffer:
+    """git log 字节记录解析测试"""
+
+    def test_subject_with_pipe(self, make_git_repo):
+        """测试标题含 | 时不被截断"""
+        repo = make_git_repo("repo", [("feat: 支持 a|b 语法", "2026-01-06T10:00:00+08:00")])
+
+        commits = get_commits(repo, date(2026, 1, 5), date(2026, 1, 11))
+
+        assert commits[0]["message"] == "feat: 支持 a|b 语法"
+        assert commits[0]["type"] == "feat"
+
+    def test_incomplete_record_not_consumed(self):
+        """测试不完整的记录保留在缓冲区中"""
+        complete = "abc\x00feat: 功能\x00张三\x002026-01-06\x1e".encode("utf-8")
+        partial = "\ndef\x00fix: 修".encode("utf-8")
+
+        records, consumed = parse_log_records(bytearray(complete + partial), 4)
+
+        assert consumed == len(complete)
+        assert records == [["abc", "feat: 功能", "张三", "2026-01-06"]]
+
+    def test_malformed_record_skipped(self):
+        """测试字段数不足的记录被跳过"""
+        records, consumed = parse_log_records(b"broken\x1e", 4)
+
+        assert records == []
+        assert consumed == len(b"broken\x1e")
@@ -10,6 +10,12 @@ from src.report_generator import (
     format_project_section,
     filter_trivial_commits,
     generate_report,
+    generate_full_report,
+    generate_team_reports,
+    link_cross_project_features,
+    normalize_commit,
+    write_report,
+    write_full_report,
 )
 
 
@@ -19,7 +25,17 @@ class TestExtractKeywords:
     def test_extract_chinese_keywords(self):
         """测试提取中文关键词"""
         keywords = extract_keywords("feat: 用户登录系统开发")
-        assert "用户登录系统开发" in keywords
+        assert keywords == ["用户", "登录", "系统"]
+
+    def test_segmented_keywords_shared(self):
+        """测试连续中文分词后相关提交共享关键词"""
+        assert set(extract_keywords("feat: 用户登录系统开发")) & set(
+            extract_keywords("feat: 用户登录接口")
+        ) == {"用户", "登录"}
+
+    def test_filter_generic_chinese_words(self):
+        """测试过滤通用中文动词"""
+        assert extract_keywords("fix: 修复支付页面白屏问题") == ["支付", "页面", "白屏"]
 
     def test_extract_english_keywords(self):
         """测试提取英文关键词"""
@@ -95,6 +111,49 @@ class TestSummarizeCommit:
         assert "..." in result or len(result) <= 13
 
 
+class TestNormalizeCommit:
+    """normalize_commit 函数测试"""
+
+    def test_fields_match_public_helpers(self):
+        """测试预处理结果与公开函数一致"""
+        message = "feat(auth): 实现用户登录功能，支持手机号和邮箱两种方式登录系统"
+        commit = {"message": message}
+        normalized = normalize_commit(commit)
+        assert normalized["clean"] == clean_commit_message(message)
+        assert normalized["keywords"] == extract_keywords(message)
+        assert normalized["scope"] == "auth"
+        for length, summary in normalized["summaries"].items():
+            assert summary == summarize_commit(message, max_length=length)
+        assert commit["normalized"] is normalized
+
+    def test_cached_until_message_changes(self):
+        """测试结果被缓存，提交信息变化后重新计算"""
+        commit = {"message": "fix: 修复登录问题"}
+        first = normalize_commit(commit)
+        assert normalize_commit(commit) is first
+
+        commit["message"] = "fix(pay): 修复支付问题"
+        second = normalize_commit(commit)
+        assert second is not first
+        assert second["scope"] == "pay"
+        assert second["clean"] == "修复支付问题"
+
+    def test_generate_report_normalizes_once(self, sample_commits, monkeypatch):
+        """测试生成报告时每条提交只处理一次"""
+        import src.report_generator as report_generator
+
+        calls = []
+        original = report_generator._keywords_from_text
+
+        def counting(text):
+            calls.append(text)
+            return original(text)
+
+        monkeypatch.setattr(report_generator, "_keywords_from_text", counting)
+        generate_report(sample_commits, link_features=True)
+        assert len(calls) == len(sample_commits)
+
+
 class TestMergeRelatedCommits:
     """merge_related_commits 函数测试"""
 
@@ -123,6 +182,38 @@ class TestMergeRelatedCommits:
         priorities = [c.get("priority", 7) for c in result]
         assert priorities == sorted(priorities)
 
+    def test_keywords_keep_english_verbs(self):
+        """测试跨项目关联的停用动词不影响项目内合并"""
+        commits = [
+            {"hash": "a1", "message": "feat: add login page", "type": "feat", "priority": 1},
+            {"hash": "a2", "message": "feat: update login page", "type": "feat", "priority": 1},
+        ]
+
+        result = merge_related_commits(commits)
+
+        assert [c["commit_count"] for c in result] == [1, 1]
+
+    def test_minhash_merges_near_duplicates(self):
+        """测试 minhash 模式合并关键词不完全相同的近似提交"""
+        commits = [
+            {"hash": "a1", "message": "fix(order): 修复订单列表分页加载异常", "type": "fix", "priority": 2},
+            {"hash": "a2", "message": "fix(order): 修复订单列表页分页加载异常问题", "type": "fix", "priority": 2},
+            {"hash": "a3", "message": "fix: 修复首页白屏", "type": "fix", "priority": 2},
+        ]
+
+        assert len(merge_related_commits(commits)) == 3
+
+        result = merge_related_commits(commits, mode="minhash")
+
+        assert [c["commit_count"] for c in result] == [2, 1]
+        assert result[0]["hash"] == "a1"
+        assert len(result[0]["details"]) == 2
+
+    def test_invalid_merge_mode(self, sample_commits):
+        """测试不支持的合并方式报错"""
+        with pytest.raises(ValueError):
+            merge_related_commits(sample_commits, mode="unknown")
+
     def test_merge_similar_commits(self):
         """测试合并相似提交"""
         commits = [
@@ -227,6 +318,45 @@ class TestAnalyzeWorkSignificance:
         # 单次 fix 不满足 >=2 的条件，但类型本身是 challenge
         assert result["is_challenge"] is True
 
+    def test_large_change_is_highlight(self):
+        """测试改动规模大的单次重构标记为重点"""
+        commit = {
+            "type": "refactor",
+            "is_highlight": False,
+            "is_challenge": False,
+            "commit_count": 1,
+            "stats": {"files": 3, "insertions": 280, "deletions": 40},
+        }
+        assert analyze_work_significance(commit)["is_highlight"] is True
+
+        commit["stats"] = {"files": 3, "insertions": 20, "deletions": 4}
+        assert analyze_work_significance(commit)["is_highlight"] is False
+
+    def test_small_repeated_fix_not_challenge(self):
+        """测试改动很小的多次修复不因提交次数标记为难点，涉及文件多时标记为难点"""
+        commit = {
+            "type": "fix",
+            "is_highlight": False,
+            "is_challenge": False,
+            "commit_count": 3,
+            "stats": {"files": 1, "insertions": 3, "deletions": 2},
+        }
+        assert analyze_work_significance(commit)["is_challenge"] is False
+
+        commit["stats"] = {"files": 9, "insertions": 3, "deletions": 2}
+        assert analyze_work_significance(commit)["is_challenge"] is True
+
+    def test_merged_stats_are_summed(self, sample_commits):
+        """测试合并提交时累加改动统计"""
+        commits = [dict(sample_commits[2]), dict(sample_commits[2], hash="def458")]
+        commits[0]["stats"] = {"files": 2, "insertions": 10, "deletions": 1}
+        commits[1]["stats"] = {"files": 1, "insertions": 5, "deletions": 5}
+
+        merged = merge_related_commits(commits)
+
+        assert merged[0]["commit_count"] == 2
+        assert merged[0]["stats"] == {"files": 3, "insertions": 15, "deletions": 6}
+
 
 class TestFormatProjectSection:
     """format_project_section 函数测试（无标签风格）"""
@@ -360,3 +490,214 @@ class TestGenerateReport:
         assert "其他" in result
         assert "参与技术分享" in result
         assert "代码评审" in result
+
+    def test_generate_report_from_iterator(self, sample_commits, trivial_commits):
+        """测试生成报告支持惰性迭代器输入"""
+        commits = sample_commits + trivial_commits
+
+        assert generate_report(iter(commits)) == generate_report(commits)
+
+    def test_generate_report_with_commit_records(self, sample_commits):
+        """测试 Commit 记录与字典记录生成相同的报告"""
+        from src.git_analyzer import Commit
+
+        records = [Commit(**commit) for commit in sample_commits]
+
+        assert generate_report(records) == generate_report(sample_commits)
+
+    def test_generate_report_from_commit_table(self, sample_commits, trivial_commits):
+        """测试 CommitTable 输入与列表输入生成相同的报告"""
+        from src.git_analyzer import CommitTable
+
+        commits = trivial_commits + sample_commits
+        table = CommitTable.from_commits(commits)
+
+        assert generate_report(table) == generate_report(commits)
+        assert len(filter_trivial_commits(table)) == len(sample_commits)
+
+    def test_generate_report_commit_table_stays_columnar(self, sample_commits, monkeypatch):
+        """测试 CommitTable 输入按列分组、排序，不退回逐条字典分组"""
+        from src import report_generator
+        from src.git_analyzer import CommitTable
+
+        calls = []
+        for name in ("group_by_project", "group_by_type", "sort_by_priority"):
+            original = getattr(CommitTable, name)
+
+            def spy(self, _original=original, _name=name):
+                calls.append(_name)
+                return _original(self)
+
+            monkeypatch.setattr(CommitTable, name, spy)
+
+        def fail(commits):
+            raise AssertionError("CommitTable 不应转换回字典后再分组")
+
+        monkeypatch.setattr(report_generator, "group_commits_by_project", fail)
+
+        table = CommitTable.from_commits(sample_commits)
+        generate_report(table)
+
+        assert calls.count("group_by_project") == 1
+        assert "sort_by_priority" in calls
+        assert "group_by_type" in calls
+
+    def test_merge_related_commits_from_commit_table(self, sample_commits):
+        """测试 CommitTable 子表与列表输入的合并结果一致"""
+        from src.git_analyzer import CommitTable
+
+        table = CommitTable.from_commits(sample_commits)
+
+        assert merge_related_commits(table) == merge_related_commits(sample_commits)
+
+    def test_generate_report_from_numpy_table(self, sample_commits, trivial_commits):
+        """测试 NumPy 列存储下 CommitTable 报告与列表输入一致"""
+        pytest.importorskip("numpy")
+        from src.git_analyzer import CommitTable
+
+        commits = trivial_commits + sample_commits
+        table = CommitTable.from_commits(commits)
+
+        assert type(table.priorities).__module__ == "numpy"
+        assert generate_report(table) == generate_report(commits)
+
+    def test_generate_report_only_trivial(self, trivial_commits):
+        """测试仅有琐碎提交时返回空报告"""
+        assert generate_report(iter(trivial_commits)) == ""
+
+
+class TestWriteReport:
+    """流式写入函数测试"""
+
+    def test_write_report_matches_generate(self, sample_commits):
+        """测试写入内容与 generate_report 一致"""
+        import io
+
+        sink = io.StringIO()
+        written = write_report(sink, sample_commits, ["代码评审"], link_features=True)
+
+        assert written is True
+        assert sink.getvalue() == generate_report(sample_commits, ["代码评审"], link_features=True)
+
+    def test_write_report_empty(self):
+        """测试没有内容时不写入"""
+        import io
+
+        sink = io.StringIO()
+        assert write_report(sink, []) is False
+        assert sink.getvalue() == ""
+
+    def test_write_full_report_incremental(self, sample_commits):
+        """测试标题与各部分逐次写入输出，而非一次写入整份报告"""
+        writes = []
+
+        class Sink:
+            def write(self, text):
+                writes.append(text)
+                return len(text)
+
+        commits_by_project = {"project-frontend": sample_commits}
+        write_full_report(Sink(), commits_by_project, date_range="2026-01-05 ~ 2026-01-11")
+
+        assert writes[0] == "# 周报 (2026-01-05 ~ 2026-01-11)\n\n"
+        assert len(writes) > 3
+        assert "".join(writes) == generate_full_report(
+            commits_by_project, date_range="2026-01-05 ~ 2026-01-11"
+        )
+
+
+class TestGenerateTeamReports:
+    """generate_team_reports 函数测试"""
+
+    def test_per_member_reports(self, sample_commits, trivial_commits):
+        """测试按成员分别生成报告，跳过只有琐碎提交的成员"""
+        team = {
+            "张三": {"project-frontend": sample_commits},
+            "李四": {"project-frontend": trivial_commits},
+        }
+
+        reports = generate_team_reports(team, date_range="2026-01-05 ~ 2026-01-11")
+
+        assert list(reports) == ["张三"]
+        assert reports["张三"].startswith("# 张三 周报 (2026-01-05 ~ 2026-01-11)\n\n")
+        assert reports["张三"].endswith(generate_full_report(team["张三"]))
+
+
+class TestCrossProjectFeatures:
+    """跨项目功能关联测试"""
+
+    def _commits(self):
+        def commit(hash_, message, project, commit_type="feat", priority=1):
+            return {"hash": hash_, "message": message, "type": commit_type,
+                    "priority": priority, "project": project, "is_trivial": False}
+
+        return [
+            commit("f1", "feat(sso): 单点登录页面", "web"),
+            commit("b1", "feat(sso): 单点登录接口", "server"),
+            commit("s1", "feat(sso): SDK 登录封装", "sdk"),
+            commit("w2", "fix: 修复首页白屏", "web", "fix", 2),
+            commit("b2", "feat: 导出报表", "server"),
+        ]
+
+    def test_link_by_scope_and_keywords(self):
+        """测试共享 scope 的多个项目条目关联为一个功能，其余条目保留在原项目"""
+        merged_by_project = {}
+        for c in self._commits():
+            merged_by_project.setdefault(c["project"], []).append(dict(c, commit_count=1))
+
+        features, remaining = link_cross_project_features(merged_by_project)
+
+        assert len(features) == 1
+        assert features[0]["projects"] == ["web", "server", "sdk"]
+        assert [c["hash"] for _, c in features[0]["entries"]] == ["f1", "b1", "s1"]
+        assert [c["hash"] for c in remaining["web"]] == ["w2"]
+        assert [c["hash"] for c in remaining["server"]] == ["b2"]
+        assert remaining["sdk"] == []
+
+    def test_single_shared_word_not_linked(self):
+        """测试只共享一个常见词的无关条目不会被关联"""
+        merged_by_project = {
+            "web": [{"hash": "w1", "message": "feat: add dark mode toggle", "priority": 1},
+                    {"hash": "w2", "message": "feat: 新增用户头像上传", "priority": 1}],
+            "api": [{"hash": "a1", "message": "fix: add retry for payment webhook", "priority": 2},
+                    {"hash": "a2", "message": "fix: 修复用户导出超时", "priority": 2}],
+        }
+
+        features, remaining = link_cross_project_features(merged_by_project)
+
+        assert features == []
+        assert remaining == merged_by_project
+
+    def test_link_by_two_shared_keywords(self):
+        """测试没有 scope 时共享两个关键词的条目被关联"""
+        merged_by_project = {
+            "web": [{"hash": "w1", "message": "feat: 订单导出页面", "priority": 1}],
+            "api": [{"hash": "a1", "message": "feat: 订单导出接口", "priority": 1}],
+        }
+
+        features, _ = link_cross_project_features(merged_by_project)
+
+        assert [[c["hash"] for _, c in f["entries"]] for f in features] == [["w1", "a1"]]
+
+    def test_common_token_not_linked(self):
+        """测试出现在超过 MAX_FEATURE_POSTINGS 个条目中的词不参与关联"""
+        from src.report_generator import MAX_FEATURE_POSTINGS
+
+        merged_by_project = {
+            f"p{i}": [{"hash": f"h{i}", "message": f"chore(deps): 依赖版本{i}", "priority": 6}]
+            for i in range(MAX_FEATURE_POSTINGS + 1)
+        }
+
+        features, _ = link_cross_project_features(merged_by_project)
+
+        assert features == []
+
+    def test_generate_report_with_features(self):
+        """测试报告中输出跨项目功能，且不再重复出现在项目部分"""
+        result = generate_report(self._commits(), link_features=True)
+
+        assert result.startswith("跨项目功能\n  - SDK 登录封装（sdk、server、web）")
+        assert "    - server：单点登录接口" in result
+        assert result.count("单点登录页面") == 1
+        assert "\nsdk\n" not in result
+        assert generate_report(self._commits()).count("单点登录页面") == 1
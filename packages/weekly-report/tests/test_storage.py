@@ -0,0 +1,64 @@
+"""storage 模块测试"""
+
+import functools
+from datetime import date
+
+import pytest
+
+from src.report_generator import generate_full_report, write_full_report
+from src.storage import get_period_report_path, merge_report_content, save_period_report
+
+
+START = date(2026, 1, 5)
+END = date(2026, 1, 11)
+
+
+class TestSavePeriodReport:
+    """save_period_report 函数测试"""
+
+    def test_save_string(self, tmp_path):
+        """测试保存字符串内容并补全结尾换行"""
+        path = save_period_report("项目A\n  - 完成登录", START, END, base_dir=tmp_path)
+
+        assert path == get_period_report_path(START, END, tmp_path)
+        assert path.read_text(encoding="utf-8") == "项目A\n  - 完成登录\n"
+        assert not path.with_suffix(".tmp").exists()
+
+    def test_stream_renderer(self, tmp_path, sample_commits):
+        """测试渲染函数直接流式写入报告文件"""
+        commits_by_project = {"project-frontend": sample_commits}
+        renderer = functools.partial(
+            write_full_report,
+            commits_by_project=commits_by_project,
+            date_range="2026-01-05 ~ 2026-01-11",
+        )
+
+        path = save_period_report(renderer, START, END, base_dir=tmp_path)
+
+        expected = generate_full_report(commits_by_project, date_range="2026-01-05 ~ 2026-01-11")
+        assert path.read_text(encoding="utf-8") == expected + "\n"
+
+    def test_stream_renderer_merges_existing(self, tmp_path):
+        """测试已有报告时与流式写入的新内容合并"""
+        existing = "# 周报\n\n项目A\n  - 完成登录\n    - 接口联调\n"
+        new = "项目A\n  - 完成登录\n    - 单元测试\n项目B\n  - 新增导出"
+        save_period_report(existing, START, END, base_dir=tmp_path)
+
+        path = save_period_report(lambda sink: sink.write(new), START, END, base_dir=tmp_path)
+
+        assert path.read_text(encoding="utf-8") == merge_report_content(existing, new)
+        assert "    - 单元测试" in path.read_text(encoding="utf-8")
+
+    def test_renderer_failure_keeps_existing(self, tmp_path):
+        """测试渲染中断时保留原报告，不留下临时文件"""
+        path = save_period_report("项目A\n  - 完成登录\n", START, END, base_dir=tmp_path)
+
+        def broken(sink):
+            sink.write("项目B\n")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            save_period_report(broken, START, END, base_dir=tmp_path)
+
+        assert path.read_text(encoding="utf-8") == "项目A\n  - 完成登录\n"
+        assert not path.with_suffix(".tmp").exists()
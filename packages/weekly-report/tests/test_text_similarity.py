@@ -0,0 +1,51 @@
+"""text_similarity 模块测试"""
+
+import pytest
+from src.text_similarity import (
+    MinHasher,
+    char_shingles,
+    cluster_similar_texts,
+    estimate_similarity,
+)
+
+
+class TestMinHash:
+    """MinHash 签名测试"""
+
+    def test_signature_estimates_jaccard(self):
+        """测试签名一致度接近真实 Jaccard 相似度"""
+        left = char_shingles("修复订单列表分页加载异常的问题")
+        right = char_shingles("修复订单列表分页加载异常问题")
+        jaccard = len(left & right) / len(left | right)
+
+        hasher = MinHasher(num_perm=256)
+        estimated = estimate_similarity(hasher.signature(left), hasher.signature(right))
+
+        assert abs(estimated - jaccard) < 0.1
+
+    def test_signature_is_deterministic(self):
+        """测试相同文本在不同实例下签名一致"""
+        shingles = char_shingles("feat: user login")
+
+        assert MinHasher().signature(shingles) == MinHasher().signature(shingles)
+
+
+class TestClusterSimilarTexts:
+    """cluster_similar_texts 函数测试"""
+
+    def test_cluster_cjk_and_latin(self):
+        """测试中英文近似文本聚为一类，无关文本各自成类"""
+        texts = [
+            "修复订单列表分页加载异常",
+            "优化首页渲染性能",
+            "修复订单列表分页加载异常问题",
+            "Fix login redirect loop",
+            "fix login redirect loop again",
+        ]
+
+        assert cluster_similar_texts(texts) == [[0, 2], [1], [3, 4]]
+
+    def test_invalid_bands(self):
+        """测试签名长度不能被分段数整除时报错"""
+        with pytest.raises(ValueError):
+            cluster_similar_texts(["a"], num_perm=10, bands=3)
@@ -0,0 +1,143 @@
+"""workflow 模块测试"""
+
+import json
+from datetime import date
+
+from src import workflow
+from src.workflow import (
+    collect_commits,
+    collect_team_commits,
+    generate_configured_report,
+    sync_commit_index,
+)
+
+
+START = date(2026, 1, 5)
+END = date(2026, 1, 11)
+
+
+class TestCollectCommits:
+    """collect_commits 函数测试"""
+
+    def test_options_from_config_file(self, config_path, monkeypatch, tmp_path):
+        """测试采集参数来自 config.json"""
+        config_path.write_text(json.dumps({
+            "repos": [{"name": "a", "path": str(tmp_path / "a")}],
+            "max_workers": 2,
+            "skip_idle_repos": True,
+            "dedupe_patches": True,
+            "default_author": "张三",
+        }), encoding="utf-8")
+
+        calls = []
+        monkeypatch.setattr(
+            workflow, "get_all_commits_from_repos",
+            lambda *args, **kwargs: calls.append((args, kwargs)) or {},
+        )
+
+        collect_commits(START, END)
+
+        args, kwargs = calls[0]
+        assert args == ([tmp_path / "a"], START, END, "张三")
+        assert kwargs["max_workers"] == 2
+        assert kwargs["skip_idle"] is True
+        assert kwargs["dedupe_patches"] is True
+        assert kwargs["use_cache"] is False
+
+    def test_collect_from_repo(self, make_git_repo):
+        """测试按配置从真实仓库采集"""
+        repo = make_git_repo("repo-a", [("feat: 订单导出", "2026-01-06T10:00:00+08:00")])
+        config = {"repos": [{"name": "repo-a", "path": str(repo)}], "max_workers": 1}
+
+        commits = collect_commits(START, END, config)
+
+        assert [c["message"] for c in commits["repo-a"]] == ["feat: 订单导出"]
+
+
+    def test_monorepo_layout_from_config(self, make_git_repo, git_commit):
+        """测试配置的 projects 将 monorepo 提交归属到子项目"""
+        repo = make_git_repo("mono", [])
+        git_commit(repo, "feat: 页面改版", "2026-01-06T10:00:00+08:00", "packages/web/app.js")
+        git_commit(repo, "feat: 导出接口", "2026-01-07T10:00:00+08:00", "packages/api/main.py")
+        git_commit(repo, "chore: 根目录配置", "2026-01-08T10:00:00+08:00", "README.md")
+
+        config = {
+            "repos": [{"name": "mono", "path": str(repo),
+                       "projects": {"packages/web": "web", "packages/api": "api"}}],
+            "max_workers": 1,
+        }
+        commits = collect_commits(START, END, config)
+
+        projects = {c["message"]: c["project"] for repo_commits in commits.values() for c in repo_commits}
+        assert projects == {"feat: 页面改版": "web", "feat: 导出接口": "api", "chore: 根目录配置": "mono"}
+
+
+class TestSyncCommitIndex:
+    """sync_commit_index 函数测试"""
+
+    def test_sync_then_collect_from_index(self, make_git_repo, git_commit, monkeypatch, tmp_path):
+        """测试按配置同步索引后，开启 use_index 的采集结果与 git log 一致"""
+        db_path = tmp_path / "index.sqlite3"
+        monkeypatch.setattr(workflow, "get_index_path", lambda base_dir=None: db_path)
+        monkeypatch.setattr(
+            "src.config_manager.get_index_path", lambda base_dir=None: db_path
+        )
+        repo = make_git_repo("repo-a", [("feat: 订单导出", "2026-01-06T10:00:00+08:00")])
+        config = {
+            "repos": [{"name": "repo-a", "path": str(repo)}],
+            "max_workers": 1,
+            "default_author": "test",
+        }
+
+        assert sync_commit_index(config) == {"repo-a": 1}
+
+        git_commit(repo, "fix: 导出修复", "2026-01-07T10:00:00+08:00")
+        assert sync_commit_index(config) == {"repo-a": 1}
+        assert collect_commits(START, END, {**config, "use_index": True}) == collect_commits(
+            START, END, config
+        )
+
+
+class TestCollectTeamCommits:
+    """collect_team_commits 函数测试"""
+
+    def test_members_from_config(self, make_git_repo, git_commit, git_cmd):
+        """测试按配置的 team_members 分桶，未配置的作者被忽略"""
+        repo = make_git_repo("repo-a", [("feat: 订单导出", "2026-01-06T10:00:00+08:00")],
+                             author="张三", email="zhangsan@example.com")
+        git_cmd(repo, "config", "user.name", "外包")
+        git_cmd(repo, "config", "user.email", "vendor@example.com")
+        git_commit(repo, "feat: 外部提交", "2026-01-07T10:00:00+08:00")
+
+        config = {
+            "repos": [{"name": "repo-a", "path": str(repo)}],
+            "max_workers": 1,
+            "team_members": {"张三": "zhangsan@example.com"},
+        }
+        team = collect_team_commits(START, END, config)
+
+        assert list(team) == ["张三"]
+        assert [c["message"] for c in team["张三"]["repo-a"]] == ["feat: 订单导出"]
+
+        # 未配置成员时按作者邮箱分桶
+        team = collect_team_commits(START, END, {**config, "team_members": {}})
+        assert sorted(team) == ["vendor@example.com", "zhangsan@example.com"]
+
+
+class TestGenerateConfiguredReport:
+    """generate_configured_report 函数测试"""
+
+    def test_report_options_from_config(self):
+        """测试 link_features 配置生效"""
+        commits_by_project = {
+            "web": [{"hash": "w1", "message": "feat(sso): 单点登录页面", "type": "feat",
+                     "priority": 1, "project": "web"}],
+            "api": [{"hash": "a1", "message": "feat(sso): 单点登录接口", "type": "feat",
+                     "priority": 1, "project": "api"}],
+        }
+
+        linked = generate_configured_report(commits_by_project, {"link_features": True}, date_range="本周")
+        plain = generate_configured_report(commits_by_project, {}, date_range="本周")
+
+        assert linked.startswith("# 周报 (本周)\n\n跨项目功能")
+        assert "跨项目功能" not in plain